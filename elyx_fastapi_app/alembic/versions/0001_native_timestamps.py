@@ -0,0 +1,89 @@
+"""native epoch timestamp columns for date-range reads
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import calendar
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (table, new column, date column, time column, index name)
+TIMESTAMP_COLUMNS = [
+    ("conversations", "occurred_at", "date", "time", "idx_conversation_member_ts"),
+    ("decisions", "occurred_at", "date", None, "idx_decision_member_ts"),
+    ("health_events", "occurred_at", "date", None, "idx_event_member_ts"),
+    ("member_metrics", "week_start_at", "week_start", None, "idx_metrics_member_ts"),
+    ("team_metrics", "occurred_at", "date", None, "idx_team_metrics_member_ts"),
+]
+
+BATCH_SIZE = 5000
+
+
+def _to_epoch(date, time=None):
+    if time:
+        parsed = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+    else:
+        parsed = datetime.strptime(date, "%Y-%m-%d")
+    return calendar.timegm(parsed.timetuple())
+
+
+def _backfill(bind, table, column, date_column, time_column):
+    """Fill the epoch column from the string date/time columns in batches"""
+    key_columns = f"id, {date_column}" + (f", {time_column}" if time_column else "")
+    select = sa.text(
+        f"SELECT {key_columns} FROM {table} WHERE {column} IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+    )
+    update = sa.text(f"UPDATE {table} SET {column} = :epoch WHERE id = :id")
+    # Metrics tables use integer keys, the rest use string ids
+    last_id = 0 if table.endswith("metrics") else ""
+
+    while True:
+        rows = bind.execute(select, {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            try:
+                epoch = _to_epoch(row[1], row[2] if time_column else None)
+            except (TypeError, ValueError):
+                continue
+            params.append({"epoch": epoch, "id": row[0]})
+        if params:
+            bind.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column, date_column, time_column, index_name in TIMESTAMP_COLUMNS:
+        if table not in inspector.get_table_names():
+            continue
+        existing_columns = {c["name"] for c in inspector.get_columns(table)}
+        if column not in existing_columns:
+            op.add_column(table, sa.Column(column, sa.Integer(), nullable=True))
+
+        _backfill(bind, table, column, date_column, time_column)
+
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table)}
+        if index_name not in existing_indexes:
+            op.create_index(index_name, table, ["member_id", column, "id"])
+
+
+def downgrade() -> None:
+    for table, column, _, _, index_name in TIMESTAMP_COLUMNS:
+        op.drop_index(index_name, table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(column)
@@ -0,0 +1,41 @@
+"""created_at indexes for incremental corpus exports
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (table, index name)
+CREATED_AT_INDEXES = [
+    ("conversations", "idx_conversation_created"),
+    ("decisions", "idx_decision_created"),
+    ("health_events", "idx_event_created"),
+    ("member_metrics", "idx_metrics_created"),
+    ("team_metrics", "idx_team_metrics_created"),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table, index_name in CREATED_AT_INDEXES:
+        if table not in inspector.get_table_names():
+            continue
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table)}
+        if index_name not in existing_indexes:
+            op.create_index(index_name, table, ["created_at"])
+
+
+def downgrade() -> None:
+    for table, index_name in CREATED_AT_INDEXES:
+        op.drop_index(index_name, table_name=table)
@@ -0,0 +1,78 @@
+"""member and cohort monthly rollup tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+MEASURE_COLUMNS = [
+    ("doctor_hours", sa.Float, 0.0),
+    ("coach_hours", sa.Float, 0.0),
+    ("nutritionist_hours", sa.Float, 0.0),
+    ("physio_hours", sa.Float, 0.0),
+    ("concierge_hours", sa.Float, 0.0),
+    ("total_interventions", sa.Integer, 0),
+    ("message_count", sa.Integer, 0),
+    ("member_messages", sa.Integer, 0),
+    ("doctor_messages", sa.Integer, 0),
+    ("concierge_messages", sa.Integer, 0),
+    ("nutritionist_messages", sa.Integer, 0),
+    ("coach_messages", sa.Integer, 0),
+    ("physio_messages", sa.Integer, 0),
+    ("data_analyst_messages", sa.Integer, 0),
+    ("strategist_messages", sa.Integer, 0),
+    ("other_messages", sa.Integer, 0),
+    ("adherence_sum", sa.Float, 0.0),
+    ("adherence_weeks", sa.Integer, 0),
+    ("hours_committed", sa.Float, 0.0),
+]
+
+
+def _measures():
+    columns = [sa.Column(name, type_(), nullable=False, server_default=str(default))
+               for name, type_, default in MEASURE_COLUMNS]
+    columns.append(sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()))
+    return columns
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if "member_monthly_rollups" not in tables:
+        op.create_table(
+            "member_monthly_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("member_id", sa.Integer(), sa.ForeignKey("members.id"), nullable=False),
+            sa.Column("cohort", sa.String(7), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=False),
+            *_measures(),
+            sa.UniqueConstraint("member_id", "month", name="uq_member_rollup_month"),
+        )
+        op.create_index("ix_member_monthly_rollups_id", "member_monthly_rollups", ["id"])
+        op.create_index("idx_member_rollup_cohort", "member_monthly_rollups", ["cohort", "month"])
+
+    if "cohort_monthly_rollups" not in tables:
+        op.create_table(
+            "cohort_monthly_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("cohort", sa.String(7), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=False),
+            *_measures(),
+            sa.UniqueConstraint("cohort", "month", name="uq_cohort_rollup_month"),
+        )
+        op.create_index("ix_cohort_monthly_rollups_id", "cohort_monthly_rollups", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("cohort_monthly_rollups")
+    op.drop_table("member_monthly_rollups")
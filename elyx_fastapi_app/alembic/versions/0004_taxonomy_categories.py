@@ -0,0 +1,40 @@
+"""taxonomy categories for message tagging and decision types
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left empty on purpose: the tagging engine uses its built-in taxonomy
+    # until the first category is edited, which stores the defaults here
+    if "taxonomy_categories" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "taxonomy_categories",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("kind", sa.String(20), nullable=False),
+            sa.Column("name", sa.String(100), nullable=False),
+            sa.Column("keywords", sa.JSON(), nullable=False),
+            sa.Column("tags", sa.JSON(), nullable=False),
+            sa.Column("priority", sa.Integer(), nullable=False, server_default="100"),
+            sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("kind", "name", name="uq_taxonomy_kind_name"),
+        )
+        op.create_index("ix_taxonomy_categories_id", "taxonomy_categories", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("taxonomy_categories")
@@ -0,0 +1,39 @@
+"""team roster for sender role resolution
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Starts empty like taxonomy_categories: the built-in roster applies until the first edit
+    if "team_roster" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "team_roster",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(100), nullable=False),
+            sa.Column("aliases", sa.JSON(), nullable=False),
+            sa.Column("role", sa.String(50), nullable=False),
+            sa.Column("member_id", sa.Integer(), sa.ForeignKey("members.id"), nullable=True),
+            sa.Column("priority", sa.Integer(), nullable=False, server_default="100"),
+            sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("member_id", "name", name="uq_team_roster_member_name"),
+        )
+        op.create_index("ix_team_roster_id", "team_roster", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("team_roster")
@@ -0,0 +1,46 @@
+"""unique (member, month, week) keys for metric upserts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# (table, index name)
+PERIOD_KEYS = [
+    ("member_metrics", "uq_metrics_member_period"),
+    ("team_metrics", "uq_team_metrics_member_period"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, index_name in PERIOD_KEYS:
+        if table not in inspector.get_table_names():
+            continue
+        if index_name in {i["name"] for i in inspector.get_indexes(table)}:
+            continue
+        duplicates = bind.execute(sa.text(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} GROUP BY member_id, month, week_number "
+            f"HAVING COUNT(*) > 1) AS duplicate_periods"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(f"{table} has {duplicates} duplicated (member, month, week) periods; "
+                               f"run `python dedupe_corpus.py` before upgrading")
+        op.create_index(index_name, table, ["member_id", "month", "week_number"], unique=True)
+
+
+def downgrade() -> None:
+    for table, index_name in PERIOD_KEYS:
+        op.drop_index(index_name, table_name=table)
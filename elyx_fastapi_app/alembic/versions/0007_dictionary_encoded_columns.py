@@ -0,0 +1,100 @@
+"""dictionary-encode repeated conversation and health event strings
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# (table, string column, code column, dictionary domain, string type, nullable)
+ENCODED_COLUMNS = [
+    ("conversations", "sender", "sender_id", "conversation.sender", sa.String(100), False),
+    ("conversations", "role", "role_id", "conversation.role", sa.String(100), False),
+    ("conversations", "travel_context", "travel_context_id", "conversation.travel_context", sa.String(200), True),
+    ("conversations", "ai_model", "ai_model_id", "conversation.ai_model", sa.String(100), True),
+    ("conversations", "ai_prompt", "ai_prompt_id", "conversation.ai_prompt", sa.Text(), True),
+    ("health_events", "title", "title_id", "health_event.title", sa.String(200), False),
+    ("health_events", "ai_context", "ai_context_id", "health_event.ai_context", sa.Text(), True),
+]
+TABLES = ["conversations", "health_events"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "dictionary_values" not in inspector.get_table_names():
+        op.create_table(
+            "dictionary_values",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("domain", sa.String(50), nullable=False),
+            sa.Column("value", sa.Text(), nullable=False),
+            sa.UniqueConstraint("domain", "value", name="uq_dictionary_domain_value"),
+        )
+
+    for table in TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        encoded = [spec for spec in ENCODED_COLUMNS if spec[0] == table and spec[1] in existing]
+        if not encoded:
+            continue
+
+        # Backfill the codes while the strings are still there
+        for _, name, code, domain, _, _ in encoded:
+            op.add_column(table, sa.Column(code, sa.Integer(), nullable=True))
+            bind.execute(sa.text(
+                f"INSERT INTO dictionary_values (domain, value) SELECT DISTINCT :domain, {name} FROM {table} "
+                f"WHERE {name} IS NOT NULL AND NOT EXISTS (SELECT 1 FROM dictionary_values d "
+                f"WHERE d.domain = :domain AND d.value = {table}.{name})"
+            ), {"domain": domain})
+            bind.execute(sa.text(
+                f"UPDATE {table} SET {code} = (SELECT id FROM dictionary_values d "
+                f"WHERE d.domain = :domain AND d.value = {table}.{name})"
+            ), {"domain": domain})
+
+        if table == "conversations":
+            op.drop_index("idx_conversation_sender", table_name=table)
+        # SQLite rebuilds the table without the string columns, which is where the space comes back
+        with op.batch_alter_table(table) as batch_op:
+            for _, name, code, _, _, nullable in encoded:
+                batch_op.drop_column(name)
+                if not nullable:
+                    batch_op.alter_column(code, existing_type=sa.Integer(), nullable=False)
+                batch_op.create_foreign_key(f"fk_{table}_{code}", "dictionary_values", [code], ["id"])
+        if table == "conversations":
+            op.create_index("idx_conversation_sender", table, ["sender_id"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    for table in TABLES:
+        encoded = [spec for spec in ENCODED_COLUMNS if spec[0] == table]
+        for _, name, code, _, string_type, _ in encoded:
+            op.add_column(table, sa.Column(name, string_type, nullable=True))
+            bind.execute(sa.text(
+                f"UPDATE {table} SET {name} = (SELECT value FROM dictionary_values d WHERE d.id = {table}.{code})"
+            ))
+
+        if table == "conversations":
+            op.drop_index("idx_conversation_sender", table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            for _, name, code, _, string_type, nullable in encoded:
+                batch_op.drop_constraint(f"fk_{table}_{code}", type_="foreignkey")
+                batch_op.drop_column(code)
+                if not nullable:
+                    batch_op.alter_column(name, existing_type=string_type, nullable=False)
+        if table == "conversations":
+            op.create_index("idx_conversation_sender", table, ["sender"])
+
+    op.drop_table("dictionary_values")
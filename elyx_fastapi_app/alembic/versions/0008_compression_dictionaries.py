@@ -0,0 +1,54 @@
+"""trained zstd dictionaries for compressed text columns
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-20 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# (table, column) stored compressed once a dictionary is trained
+COMPRESSED_COLUMNS = [
+    ("conversations", "text"),
+    ("decisions", "reason"),
+    ("decisions", "ai_reasoning"),
+    ("member_metrics", "ai_insights"),
+]
+
+
+def upgrade() -> None:
+    # The columns keep their TEXT type; compressed values are SQLite BLOBs in them,
+    # written by `python compress_corpus.py --train --recompress`
+    inspector = sa.inspect(op.get_bind())
+    if "compression_dictionaries" in inspector.get_table_names():
+        return
+    op.create_table(
+        "compression_dictionaries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("dict_id", sa.BigInteger(), nullable=False, unique=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("sample_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for table, column in COMPRESSED_COLUMNS:
+            compressed = bind.execute(sa.text(
+                f"SELECT COUNT(*) FROM {table} WHERE typeof({column}) = 'blob'"
+            )).scalar()
+            if compressed:
+                raise RuntimeError(f"{table}.{column} has {compressed} compressed values; "
+                                   f"run `python compress_corpus.py --decompress` before downgrading")
+    op.drop_table("compression_dictionaries")
@@ -0,0 +1,36 @@
+"""generation run ids for superseding rows of earlier journey runs
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-21 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# Tables a journey generation run upserts; existing rows keep a NULL run id
+STAMPED_TABLES = ["conversations", "decisions", "health_events", "member_metrics", "team_metrics"]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table in STAMPED_TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        if "run_id" in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        op.add_column(table, sa.Column("run_id", sa.String(36), nullable=True))
+
+
+def downgrade() -> None:
+    for table in STAMPED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("run_id")
@@ -0,0 +1,59 @@
+"""update times and deletion tombstones for incremental corpus exports
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-21 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+# (table, index on the time a row was last written)
+CHANGED_AT_INDEXES = [
+    ("conversations", "idx_conversation_changed"),
+    ("decisions", "idx_decision_changed"),
+    ("health_events", "idx_event_changed"),
+    ("member_metrics", "idx_metrics_changed"),
+    ("team_metrics", "idx_team_metrics_changed"),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for table, index_name in CHANGED_AT_INDEXES:
+        if table not in tables:
+            continue
+        # Existing rows keep a NULL update time; exports fall back to created_at
+        if "updated_at" not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+        if index_name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(index_name, table, [sa.text("coalesce(updated_at, created_at)")])
+
+    if "deleted_rows" not in tables:
+        op.create_table(
+            "deleted_rows",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("table_name", sa.String(50), nullable=False),
+            sa.Column("row_id", sa.String(50), nullable=False),
+            sa.Column("member_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("idx_deleted_rows_created", "deleted_rows", ["created_at"])
+        op.create_index("idx_deleted_rows_row", "deleted_rows", ["table_name", "row_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("deleted_rows")
+    for table, index_name in CHANGED_AT_INDEXES:
+        op.drop_index(index_name, table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("updated_at")
@@ -0,0 +1,31 @@
+"""per-member data versions for the response cache
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-22 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Members without a row are at version 0, so nothing needs backfilling
+    if "data_versions" not in inspector.get_table_names():
+        op.create_table(
+            "data_versions",
+            sa.Column("member_id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
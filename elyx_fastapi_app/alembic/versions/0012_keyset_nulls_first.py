@@ -0,0 +1,47 @@
+"""NULLS FIRST keyset indexes on PostgreSQL
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-22 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# (table, timestamp column, index name)
+KEYSET_INDEXES = [
+    ("conversations", "occurred_at", "idx_conversation_member_ts"),
+    ("decisions", "occurred_at", "idx_decision_member_ts"),
+    ("health_events", "occurred_at", "idx_event_member_ts"),
+    ("member_metrics", "week_start_at", "idx_metrics_member_ts"),
+    ("team_metrics", "occurred_at", "idx_team_metrics_member_ts"),
+]
+
+
+def _recreate(nulls_first: bool) -> None:
+    bind = op.get_bind()
+    # SQLite already sorts NULLs first and rejects NULLS FIRST in an index
+    if bind.dialect.name != "postgresql":
+        return
+    tables = sa.inspect(bind).get_table_names()
+    for table, column, index_name in KEYSET_INDEXES:
+        if table not in tables:
+            continue
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        order = " NULLS FIRST" if nulls_first else ""
+        op.execute(f"CREATE INDEX {index_name} ON {table} (member_id, {column}{order}, id)")
+
+
+def upgrade() -> None:
+    _recreate(nulls_first=True)
+
+
+def downgrade() -> None:
+    _recreate(nulls_first=False)
@@ -6,6 +6,7 @@ from pathlib import Path
 
 # Import Base from models
 from app.models.database import Base
+from app.services.metrics import TimedQueuePool
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./elyx_journey.db")
@@ -25,12 +26,34 @@ if DATABASE_URL.startswith("sqlite"):
 else:
     engine = create_engine(
         DATABASE_URL,
+        poolclass=TimedQueuePool,  # Records checkout waits in db_pool_wait_seconds
         echo=False
     )
 
 # Session configuration
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def create_worker_sessionmaker():
+    """Session factory for background worker threads and streamed responses.
+
+    The SQLite engine above shares one StaticPool connection, which cannot
+    carry concurrent transactions or interleaved cursors, so workers get their
+    own pooled connections that wait on SQLite's write lock instead of failing.
+    """
+    if not DATABASE_URL.startswith("sqlite"):
+        return SessionLocal
+    worker_engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=TimedQueuePool,
+        echo=False
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=worker_engine)
+
+# Streamed responses are iterated from the threadpool after their request returns, while
+# other requests use the StaticPool connection; each stream reads on a connection of its own
+StreamSessionLocal = create_worker_sessionmaker()
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
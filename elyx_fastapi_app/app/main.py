@@ -1,11 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from app.routes import journey
+from typing import Optional, Tuple
+from app.routes import journey, analytics
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_trace import QueryTraceMiddleware
 from app.database import get_db, create_tables
 from app.services.local_ai_service import local_ai_service
+from app.services.metrics import CONTENT_TYPE, metrics_registry
 from app.services.journey_service import journey_service
+from app.services.pagination import Cursor
+from app.services.projections import CONVERSATIONS
+from app.services.response_cache import response_cache
+from app.services.serialization import FastJSONResponse
+from app.models.schemas import ConversationItemsResponse
 from datetime import datetime
+import os
 
 # Create tables on startup
 create_tables()
@@ -13,7 +24,8 @@ create_tables()
 app = FastAPI(
     title="Elyx Life – Member Journey API",
     version="2.0.0",
-    description="Generates 8 months of WhatsApp-style communication, builds a member journey timeline, and tracks internal metrics with FREE local AI integration."
+    description="Generates 8 months of WhatsApp-style communication, builds a member journey timeline, and tracks internal metrics with FREE local AI integration.",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -25,7 +37,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and NDJSON responses; levels trade CPU for bytes on the wire
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    zstd_level=int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+)
+
+# Per-request SQL trace: slow query log and repeated statement (N+1) warnings
+app.add_middleware(QueryTraceMiddleware)
+
+# Outermost, so request latency includes compression and streamed bodies
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(journey.router, prefix="/journey", tags=["Journey"])
+app.include_router(analytics.router, tags=["Analytics"])
 
 @app.get("/", tags=["Root"])
 def root():
@@ -42,51 +70,61 @@ def root():
         ],
         "endpoints": [
             "/journey/generate/{member_id}",
+            "/journey/generate/{member_id}/episode",
+            "/journey/generate/batch",
+            "/journey/generate/batch/{job_id}",
+            "/journey/taxonomy",
+            "/journey/taxonomy/{kind}/{name}",
+            "/journey/roster",
+            "/journey/roster/{name}",
             "/journey/timeline/{member_id}", 
             "/journey/conversations/{member_id}",
             "/journey/decisions/{member_id}",
             "/journey/metrics/{member_id}",
             "/journey/team-metrics/{member_id}",
             "/journey/decision-context/{decision_id}",
+            "/journey/provenance/{decision_id}",
+            "/journey/provenance/batch",
+            "/analytics/cohorts/team-hours",
+            "/analytics/cohorts/adherence",
+            "/analytics/cohorts/adherence-trend",
+            "/cache/stats",
+            "/metrics",
             "/ai/models",
             "/ai/health"
         ],
     }
 
-@app.get("/conversations/{member_id}", tags=["Conversations"])
-def get_conversations(member_id: int, month: int = None, week: int = None, db: Session = Depends(get_db)):
-    """Get conversations for a member with optional filtering"""
+@app.get("/conversations/{member_id}", tags=["Conversations"], response_model=ConversationItemsResponse)
+def get_conversations(member_id: int, month: int = None, week: int = None, fields: Optional[str] = None,
+                      period: Tuple[Optional[int], Optional[int]] = Depends(journey.time_range),
+                      page: Tuple[Optional[Cursor], Optional[int]] = Depends(journey.page_params),
+                      db: Session = Depends(get_db)):
+    """Get conversations for a member with optional filtering and keyset pagination"""
+    names = journey.resolve_fields(CONVERSATIONS, fields)
     try:
         from app.models.database import Conversation
+        from app.services.timestamps import apply_time_range
+        from app.services.pagination import paginate
         
-        query = db.query(Conversation).filter(Conversation.member_id == member_id)
-        
-        if month is not None:
-            query = query.filter(Conversation.month == month)
-        if week is not None:
-            query = query.filter(Conversation.week_number == week)
+        def build():
+            query = CONVERSATIONS.query(db, names).filter(Conversation.member_id == member_id)
+            query = apply_time_range(query, Conversation.occurred_at, *period)
+            
+            if month is not None:
+                query = query.filter(Conversation.month == month)
+            if week is not None:
+                query = query.filter(Conversation.week_number == week)
+            
+            conversations, next_page_token = paginate(query, Conversation.occurred_at, Conversation.id, *page)
+            
+            return {
+                "success": True,
+                "next_page_token": next_page_token,
+                "items": CONVERSATIONS.to_dicts(db, conversations, names)
+            }
         
-        conversations = query.order_by(Conversation.date, Conversation.time).all()
-        
-        return {
-            "success": True,
-            "items": [
-                {
-                    "id": c.id,
-                    "date": c.date,
-                    "time": c.time,
-                    "sender": c.sender,
-                    "role": c.role,
-                    "text": c.text,
-                    "tags": c.tags,
-                    "month": c.month,
-                    "week_number": c.week_number,
-                    "travel_context": c.travel_context,
-                    "decision_impact": c.decision_impact or []
-                }
-                for c in conversations
-            ]
-        }
+        return journey.cached_response(db, "conversation_items", member_id, (month, week, tuple(names), period, page), build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -183,6 +221,16 @@ def ai_health_check():
     """Check health of Groq AI models"""
     return local_ai_service.health_check()
 
+@app.get("/cache/stats", tags=["Cache"])
+def cache_stats():
+    """Hit, miss and size counters of the read response cache"""
+    return response_cache.stats()
+
+@app.get("/metrics", tags=["Metrics"])
+def metrics():
+    """HTTP, database, LLM and generation metrics in the Prometheus text format"""
+    return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/health", tags=["Health"])
 def health_check(db: Session = Depends(get_db)):
     """Health check endpoint"""
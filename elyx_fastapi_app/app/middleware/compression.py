@@ -0,0 +1,199 @@
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+class GzipEncoder:
+    """Incremental encoders share one shape: compress(data, flush) then finish()"""
+
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        data = self._compressor.compress(data)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        data = self._compressor.process(data)
+        return data + self._compressor.flush() if flush else data
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        data = self._compressor.compress(data)
+        return data + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else data
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+def available_encoders() -> Dict[str, type]:
+    """Encoders this process can produce, in server preference order"""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, number = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+def negotiate(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """Pick the best coding the client accepts; ties go to the server's preference order"""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in encodings:
+        q = accepted.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with zstd, brotli or gzip.
+
+    The coding is negotiated from Accept-Encoding. Bodies smaller than
+    `minimum_size` go out untouched, and streamed responses are compressed
+    chunk by chunk with a flush after each one, so clients can decode every
+    batch as soon as it arrives.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, zstd_level: int = 3, encodings: Optional[List[str]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+        self.encoders = available_encoders()
+        if encodings is not None:
+            self.encoders = {name: encoder for name, encoder in self.encoders.items() if name in encodings}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, self.encoders[coding](self.levels[coding]), self.minimum_size)
+        await self.app(scope, receive, responder)
+
+class _CompressionResponder:
+    """Wraps `send` for one response, deciding whether to compress once the body starts"""
+
+    def __init__(self, send: Send, encoder, minimum_size: int):
+        self.send = send
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressing: Optional[bool] = None
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressing is None:
+            self.pending.append(body)
+            self.pending_size += len(body)
+            # Hold back small leading chunks until the threshold or the end of the body decides
+            if more_body and self.pending_size < self.minimum_size:
+                return
+            body = b"".join(self.pending)
+            self.pending = []
+            self.compressing = self._should_compress(self.pending_size)
+            if self.compressing and not more_body:
+                # Whole body in hand: compress it in one go and send an exact Content-Length
+                body = self.encoder.compress(body, flush=False) + self.encoder.finish()
+                await self._start(len(body))
+                await self.send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+            await self._start(None)
+
+        if not self.compressing:
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        data = self.encoder.compress(body) if body else b""
+        if not more_body:
+            data += self.encoder.finish()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _should_compress(self, size: int) -> bool:
+        headers = Headers(raw=self.start_message["headers"])
+        if "content-encoding" in headers or size < self.minimum_size:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _start(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            headers.add_vary_header("Accept-Encoding")
+        if self.compressing:
+            headers["Content-Encoding"] = self.encoder.name
+            if content_length is not None:
+                headers["Content-Length"] = str(content_length)
+            elif "content-length" in headers:
+                # Length is unknown until the stream ends; fall back to chunked transfer
+                del headers["content-length"]
+        await self.send(self.start_message)
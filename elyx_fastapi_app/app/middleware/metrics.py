@@ -0,0 +1,64 @@
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+UNMATCHED_ROUTE = "unmatched"
+
+PATH_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that served a request, so ids don't become label values.
+
+    Routing records the matched route in the scope. Routes of included
+    routers may know only their path within the router, so the prefix the
+    router was mounted under is recovered from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    params = scope.get("path_params", {})
+    rendered = PATH_PARAM.sub(lambda match: str(params.get(match.group(1), match.group(0))), template)
+    path = scope["path"]
+    if path != rendered and path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + template
+    return template
+
+class MetricsMiddleware:
+    """Per-route request counts, latency histograms and in-flight gauges.
+
+    Plain ASGI, so streamed responses are timed to their last body chunk
+    and nothing is buffered. The route is only known once routing has run,
+    so the in-flight gauge is per method.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = route_template(scope)
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.query_tracer import query_tracer
+
+class QueryTraceMiddleware:
+    """Trace the SQL each request runs and log repeated statements when it finishes.
+
+    The trace covers the whole response, so rows a streamed body fetches
+    while it is being sent are counted against the request too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not query_tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with query_tracer.trace(f"{scope['method']} {scope['path']}") as trace:
+            await self.app(scope, receive, send)
+        query_tracer.check(trace)
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional, Union
+
+from sqlalchemy import Text, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+class TextCodec:
+    """zstd compression of long text values with dictionaries trained on the corpus.
+
+    Compressed values are stored as bare zstd frames, which carry the id of
+    the dictionary they were written with, so every dictionary ever trained
+    stays readable and plain text can sit next to compressed rows. Writes
+    compress only with TEXT_COMPRESSION=zstd and a trained dictionary, and
+    only values that come out smaller. Dictionaries are read from the
+    compression_dictionaries table whenever SQLite opens a connection, and
+    again from the database file when a frame names one this process has
+    not seen yet. zstd contexts are not thread-safe, so each thread keeps
+    its own.
+    """
+
+    MIN_BYTES = 64  # Shorter values rarely shrink enough to pay for the frame header
+
+    def __init__(self):
+        self.enabled = os.getenv("TEXT_COMPRESSION", "off").lower() == "zstd" and zstandard is not None
+        self.level = int(os.getenv("TEXT_COMPRESSION_LEVEL", "3"))
+        self.active_dictionary: Optional[int] = None
+        self._dictionaries: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._databases = set()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def add(self, dict_id: int, data: bytes):
+        """Register a dictionary; the most recently added one compresses new values"""
+        if zstandard is None:
+            return
+        with self._lock:
+            if dict_id not in self._dictionaries:
+                self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(bytes(data))
+            self.active_dictionary = dict_id
+
+    def load(self, connection: sqlite3.Connection):
+        """Read the trained dictionaries through a DB-API connection"""
+        try:
+            rows = connection.execute("SELECT dict_id, data FROM compression_dictionaries ORDER BY id").fetchall()
+        except sqlite3.OperationalError:
+            return  # Table not created yet
+        for dict_id, data in rows:
+            self.add(dict_id, data)
+
+    def attach(self, connection: sqlite3.Connection):
+        """Load dictionaries from a new SQLite connection and remember its file for later reloads"""
+        for _, name, path in connection.execute("PRAGMA database_list").fetchall():
+            if name == "main" and path:
+                self._databases.add(path)
+        self.load(connection)
+
+    def _reload(self):
+        for path in list(self._databases):
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                self.load(connection)
+            finally:
+                connection.close()
+
+    def _contexts(self) -> Dict:
+        contexts = getattr(self._local, "contexts", None)
+        if contexts is None:
+            contexts = self._local.contexts = {}
+        return contexts
+
+    def pack(self, value: str, dict_id: Optional[int] = None) -> Union[str, bytes]:
+        """`value` compressed with a dictionary (the active one by default), or unchanged if that isn't smaller"""
+        dict_id = dict_id if dict_id is not None else self.active_dictionary
+        if zstandard is None or dict_id is None:
+            return value
+        raw = value.encode()
+        if len(raw) < self.MIN_BYTES:
+            return value
+        contexts = self._contexts()
+        compressor = contexts.get(("c", dict_id, self.level))
+        if compressor is None:
+            compressor = contexts[("c", dict_id, self.level)] = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self._dictionaries[dict_id])
+        packed = compressor.compress(raw)
+        return packed if len(packed) < len(raw) else value
+
+    def compress(self, value: str) -> Union[str, bytes]:
+        """The value to store for `value`: compressed when compression is enabled"""
+        return self.pack(value) if self.enabled else value
+
+    def decompress(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """The text behind a stored value; plain text passes through"""
+        if not isinstance(value, (bytes, memoryview)):
+            return value
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed text columns")
+        value = bytes(value)
+        dict_id = zstandard.get_frame_parameters(value).dict_id
+        contexts = self._contexts()
+        decompressor = contexts.get(("d", dict_id))
+        if decompressor is None:
+            if dict_id and dict_id not in self._dictionaries:
+                self._reload()
+                if dict_id not in self._dictionaries:
+                    raise LookupError(f"Compression dictionary {dict_id} is not in compression_dictionaries")
+            decompressor = contexts[("d", dict_id)] = zstandard.ZstdDecompressor(
+                dict_data=self._dictionaries[dict_id] if dict_id else None)
+        return decompressor.decompress(value).decode()
+
+class CompressedText(TypeDecorator):
+    """Text that SQLite may store as a zstd frame, decompressed only when the column is selected.
+
+    Other databases keep plain text, which they already compress on disk
+    (PostgreSQL TOAST). Filters and joins on these columns would compare
+    stored bytes, so they are for display text only.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return text_codec.compress(value)
+
+    def process_result_value(self, value, dialect):
+        return text_codec.decompress(value)
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_codec(dbapi_connection, connection_record):
+    # JSON built inside SQLite (the timeline, provenance payloads) decompresses with decompress_text()
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("decompress_text", 1, text_codec.decompress, deterministic=True)
+        text_codec.attach(dbapi_connection)
+
+# Global text codec instance
+text_codec = TextCodec()
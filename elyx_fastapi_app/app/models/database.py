@@ -1,11 +1,116 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index, LargeBinary, UniqueConstraint
+from sqlalchemy import select
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm.attributes import flag_dirty
+from sqlalchemy.sql import func, operators
 from datetime import datetime
 
+from app.models.compression import CompressedText
+
 Base = declarative_base()
 
+def keyset_indexes(name: str, ts_column: Column) -> tuple:
+    """The (member_id, timestamp, id) index that keyset pages read in order.
+
+    Pages sort NULL timestamps first. That is SQLite's ascending order, and
+    SQLite rejects NULLS FIRST in an index, while PostgreSQL sorts NULLs last
+    and only uses the index for NULLS FIRST when it is declared that way.
+    """
+    return (
+        Index(name, 'member_id', ts_column, 'id').ddl_if(
+            callable_=lambda ddl, target, bind, dialect=None, **kw: dialect.name != "postgresql"),
+        Index(name, 'member_id', ts_column.asc().nulls_first(), 'id').ddl_if(dialect="postgresql"),
+    )
+
+class DictionaryValue(Base):
+    """One distinct string of a dictionary-encoded column, shared by every row that repeats it"""
+    __tablename__ = "dictionary_values"
+    
+    id = Column(Integer, primary_key=True)
+    domain = Column(String(50), nullable=False)  # Which column the value belongs to, e.g. conversation.role
+    value = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('domain', 'value', name='uq_dictionary_domain_value'),
+    )
+
+class CompressionDictionary(Base):
+    """A zstd dictionary trained on the corpus; compressed values name theirs in the frame header"""
+    __tablename__ = "compression_dictionaries"
+    
+    id = Column(Integer, primary_key=True)
+    dict_id = Column(BigInteger, nullable=False, unique=True)  # zstd dictionary id (unsigned 32-bit)
+    data = Column(LargeBinary, nullable=False)
+    samples = Column(Integer, nullable=False)  # Values it was trained on
+    sample_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class DecodedComparator(Comparator):
+    """Equality and IN filters on a decoded column compare integer codes, so they can use its index"""
+
+    def __init__(self, expression, domain: str, code):
+        super().__init__(expression)
+        self.domain = domain
+        self.code = code
+
+    @property
+    def type(self):
+        return self.expression.type
+
+    def _codes(self, values):
+        return (select(DictionaryValue.id)
+                .where(DictionaryValue.domain == self.domain, DictionaryValue.value.in_(values))
+                .scalar_subquery())
+
+    def operate(self, op, *other, **kwargs):
+        code = self.code
+        if op is operators.eq and other[0] is not None:
+            return code.in_(self._codes([other[0]]))
+        if op is operators.ne and other[0] is not None:
+            return code.not_in(self._codes([other[0]]))
+        if op is operators.in_op:
+            return code.in_(self._codes(other[0]))
+        if op is operators.not_in_op:
+            return code.not_in(self._codes(other[0]))
+        return super().operate(op, *other, **kwargs)
+
+ASSIGNED_VALUES_KEY = "_assigned_dictionary_values"
+
+def decoded(domain: str, code):
+    """The string behind a dictionary code column, readable and filterable like a plain column.
+
+    Instances decode the code in process from the dictionary cache
+    (app.services.dictionaries), so loading a row selects only its code.
+    In SQL the attribute is a scalar subquery on dictionary_values, for
+    statements that assemble documents in the database. Assigning it on an
+    instance is encoded on flush; Core writes encode with `encode_rows`.
+    The domain is named `<entity>.<attribute>`.
+    """
+    name = domain.rsplit(".", 1)[1]
+
+    def get(self):
+        assigned = self.__dict__.get(ASSIGNED_VALUES_KEY)
+        if assigned and name in assigned:
+            return assigned[name]
+        from app.services.dictionaries import dictionary_encoder
+        return dictionary_encoder.decode(self, getattr(self, code.key))
+
+    def set(self, value):
+        self.__dict__.setdefault(ASSIGNED_VALUES_KEY, {})[name] = value
+        flag_dirty(self)
+
+    def compare(cls):
+        value = (select(DictionaryValue.value).where(DictionaryValue.id == code)
+                 .correlate_except(DictionaryValue).scalar_subquery().label(name))
+        return DecodedComparator(value, domain, code)
+
+    get.__name__ = set.__name__ = name
+    attribute = hybrid_property(get, set, custom_comparator=compare)
+    attribute.info.update(domain=domain, code=code)
+    return attribute
+
 class Member(Base):
     __tablename__ = "members"
     
@@ -44,29 +149,42 @@ class Conversation(Base):
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
     date = Column(String(10), nullable=False)  # YYYY-MM-DD format
     time = Column(String(5), nullable=False)  # HH:MM format
-    sender = Column(String(100), nullable=False)  # Rohan or Elyx team member
-    role = Column(String(100), nullable=False)  # member, doctor, coach, nutritionist, etc.
-    text = Column(Text, nullable=False)
+    occurred_at = Column(Integer, nullable=True)  # Unix epoch seconds (UTC) of date + time
+    sender_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=False)
+    role_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=False)
+    text = Column(CompressedText, nullable=False)
     tags = Column(JSON, nullable=False)  # List of tags for categorization
     relates_to = Column(String(50), nullable=True)  # ID of related message
     month = Column(Integer, nullable=True)  # Month number (1-8)
     week_number = Column(Integer, nullable=True)  # Week number within the journey
-    travel_context = Column(String(200), nullable=True)  # Travel context for this period
+    travel_context_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=True)
     ai_generated = Column(Boolean, default=False)  # Whether this was AI-generated
-    ai_model = Column(String(100), nullable=True)  # Which AI model generated it
-    ai_prompt = Column(Text, nullable=True)  # The prompt used
+    ai_model_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=True)
+    ai_prompt_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=True)
     decision_impact = Column(JSON, nullable=True)  # List of decision IDs influenced by this message
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Set by every later write, upserts included
+    run_id = Column(String(36), nullable=True)  # Journey generation run that last wrote the row
+    
+    # Dictionary-encoded strings, decoded on read
+    sender = decoded("conversation.sender", sender_id)  # Rohan or Elyx team member
+    role = decoded("conversation.role", role_id)  # member, doctor, coach, nutritionist, etc.
+    travel_context = decoded("conversation.travel_context", travel_context_id)  # Travel context for this period
+    ai_model = decoded("conversation.ai_model", ai_model_id)  # Which AI model generated it
+    ai_prompt = decoded("conversation.ai_prompt", ai_prompt_id)  # The prompt used
     
     # Relationships
     member = relationship("Member", back_populates="conversations")
     
     __table_args__ = (
         Index('idx_conversation_date', 'date'),
-        Index('idx_conversation_sender', 'sender'),
+        Index('idx_conversation_sender', 'sender_id'),
         Index('idx_conversation_tags', 'tags'),
         Index('idx_conversation_ai', 'ai_generated'),
         Index('idx_conversation_month_week', 'month', 'week_number'),
+        *keyset_indexes('idx_conversation_member_ts', occurred_at),
+        Index('idx_conversation_created', 'created_at'),
+        Index('idx_conversation_changed', func.coalesce(updated_at, created_at)),
     )
 
 class HealthEvent(Base):
@@ -75,16 +193,23 @@ class HealthEvent(Base):
     id = Column(String(50), primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
     date = Column(String(10), nullable=False)
+    occurred_at = Column(Integer, nullable=True)  # Unix epoch seconds (UTC) of date
     event_type = Column(String(100), nullable=False)  # test, exercise_update, travel, etc.
-    title = Column(String(200), nullable=False)
+    title_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=False)
     details = Column(JSON, nullable=False)  # Event-specific details
     month = Column(Integer, nullable=True)  # Month number (1-8)
     week_number = Column(Integer, nullable=True)  # Week number within the journey
     linked_conversations = Column(JSON, nullable=False)  # List of conversation IDs
     linked_decisions = Column(JSON, nullable=False)  # List of decision IDs
     ai_generated = Column(Boolean, default=False)
-    ai_context = Column(Text, nullable=True)  # AI reasoning for this event
+    ai_context_id = Column(Integer, ForeignKey("dictionary_values.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Set by every later write, upserts included
+    run_id = Column(String(36), nullable=True)  # Journey generation run that last wrote the row
+    
+    # Dictionary-encoded strings, decoded on read
+    title = decoded("health_event.title", title_id)
+    ai_context = decoded("health_event.ai_context", ai_context_id)  # AI reasoning for this event
     
     # Relationships
     member = relationship("Member", back_populates="health_events")
@@ -94,6 +219,9 @@ class HealthEvent(Base):
         Index('idx_event_type', 'event_type'),
         Index('idx_event_ai', 'ai_generated'),
         Index('idx_event_month_week', 'month', 'week_number'),
+        *keyset_indexes('idx_event_member_ts', occurred_at),
+        Index('idx_event_created', 'created_at'),
+        Index('idx_event_changed', func.coalesce(updated_at, created_at)),
     )
 
 class Decision(Base):
@@ -102,8 +230,9 @@ class Decision(Base):
     id = Column(String(50), primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
     date = Column(String(10), nullable=False)
+    occurred_at = Column(Integer, nullable=True)  # Unix epoch seconds (UTC) of date
     title = Column(String(200), nullable=False)
-    reason = Column(Text, nullable=False)
+    reason = Column(CompressedText, nullable=False)
     decision_type = Column(String(100), nullable=False)  # medication, test, exercise, nutrition, etc.
     month = Column(Integer, nullable=True)  # Month number (1-8)
     week_number = Column(Integer, nullable=True)  # Week number within the journey
@@ -111,9 +240,11 @@ class Decision(Base):
     supporting_conversations = Column(JSON, nullable=False)  # List of conversation IDs that support this decision
     effects = Column(JSON, nullable=False)  # List of event IDs affected
     ai_generated = Column(Boolean, default=False)
-    ai_reasoning = Column(Text, nullable=True)  # AI's reasoning process
+    ai_reasoning = Column(CompressedText, nullable=True)  # AI's reasoning process
     confidence_score = Column(Float, nullable=True)  # AI confidence (0.0-1.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Set by every later write, upserts included
+    run_id = Column(String(36), nullable=True)  # Journey generation run that last wrote the row
     
     # Relationships
     member = relationship("Member", back_populates="decisions")
@@ -124,6 +255,9 @@ class Decision(Base):
         Index('idx_decision_confidence', 'confidence_score'),
         Index('idx_decision_month_week', 'month', 'week_number'),
         Index('idx_decision_type', 'decision_type'),
+        *keyset_indexes('idx_decision_member_ts', occurred_at),
+        Index('idx_decision_created', 'created_at'),
+        Index('idx_decision_changed', func.coalesce(updated_at, created_at)),
     )
 
 class MemberMetrics(Base):
@@ -133,14 +267,17 @@ class MemberMetrics(Base):
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
     week_start = Column(String(10), nullable=False)
     week_end = Column(String(10), nullable=False)
+    week_start_at = Column(Integer, nullable=True)  # Unix epoch seconds (UTC) of week_start
     month = Column(Integer, nullable=True)  # Month number (1-8)
     week_number = Column(Integer, nullable=True)  # Week number within the journey
     adherence_estimate = Column(Float, nullable=False)  # 0.0-1.0
     hours_committed = Column(Float, nullable=False)
     key_events = Column(JSON, nullable=False)  # List of event IDs
     notes = Column(Text, nullable=True)
-    ai_insights = Column(Text, nullable=True)  # AI-generated insights for the week
+    ai_insights = Column(CompressedText, nullable=True)  # AI-generated insights for the week
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Set by every later write, upserts included
+    run_id = Column(String(36), nullable=True)  # Journey generation run that last wrote the row
     
     # Relationships
     member = relationship("Member", back_populates="metrics")
@@ -149,6 +286,10 @@ class MemberMetrics(Base):
         Index('idx_metrics_week', 'week_start', 'week_end'),
         Index('idx_metrics_adherence', 'adherence_estimate'),
         Index('idx_metrics_month_week', 'month', 'week_number'),
+        *keyset_indexes('idx_metrics_member_ts', week_start_at),
+        Index('idx_metrics_created', 'created_at'),
+        Index('idx_metrics_changed', func.coalesce(updated_at, created_at)),
+        Index('uq_metrics_member_period', 'member_id', 'month', 'week_number', unique=True),
     )
 
 class TeamMetrics(Base):
@@ -157,6 +298,7 @@ class TeamMetrics(Base):
     id = Column(Integer, primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
     date = Column(String(10), nullable=False)
+    occurred_at = Column(Integer, nullable=True)  # Unix epoch seconds (UTC) of date
     month = Column(Integer, nullable=True)  # Month number (1-8)
     week_number = Column(Integer, nullable=True)  # Week number within the journey
     doctor_hours = Column(Float, default=0.0)
@@ -168,6 +310,8 @@ class TeamMetrics(Base):
     linked_conversations = Column(JSON, nullable=False)  # List of conversation IDs that contributed to these hours
     ai_optimization_suggestions = Column(Text, nullable=True)  # AI suggestions for team efficiency
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Set by every later write, upserts included
+    run_id = Column(String(36), nullable=True)  # Journey generation run that last wrote the row
     
     # Relationships
     member = relationship("Member", back_populates="team_metrics")
@@ -176,6 +320,113 @@ class TeamMetrics(Base):
         Index('idx_team_metrics_date', 'date'),
         Index('idx_team_metrics_member', 'member_id'),
         Index('idx_team_metrics_month_week', 'month', 'week_number'),
+        *keyset_indexes('idx_team_metrics_member_ts', occurred_at),
+        Index('idx_team_metrics_created', 'created_at'),
+        Index('idx_team_metrics_changed', func.coalesce(updated_at, created_at)),
+        Index('uq_team_metrics_member_period', 'member_id', 'month', 'week_number', unique=True),
+    )
+
+class DeletedRow(Base):
+    """Tombstone of a deleted journey row, exported so downstream copies can drop it"""
+    __tablename__ = "deleted_rows"
+    
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(String(50), nullable=False)  # The deleted row's id, as text for the integer-keyed metric tables
+    member_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())  # When the row was deleted
+    
+    __table_args__ = (
+        Index('idx_deleted_rows_created', 'created_at'),
+        Index('idx_deleted_rows_row', 'table_name', 'row_id'),
+    )
+
+class DataVersion(Base):
+    """Write counter per member; cached read responses are keyed on it, so every process sees a commit"""
+    __tablename__ = "data_versions"
+    
+    member_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
+
+class RollupMeasures:
+    """Additive measures shared by the monthly rollup tables"""
+    doctor_hours = Column(Float, nullable=False, default=0.0)
+    coach_hours = Column(Float, nullable=False, default=0.0)
+    nutritionist_hours = Column(Float, nullable=False, default=0.0)
+    physio_hours = Column(Float, nullable=False, default=0.0)
+    concierge_hours = Column(Float, nullable=False, default=0.0)
+    total_interventions = Column(Integer, nullable=False, default=0)
+    message_count = Column(Integer, nullable=False, default=0)
+    member_messages = Column(Integer, nullable=False, default=0)
+    doctor_messages = Column(Integer, nullable=False, default=0)
+    concierge_messages = Column(Integer, nullable=False, default=0)
+    nutritionist_messages = Column(Integer, nullable=False, default=0)
+    coach_messages = Column(Integer, nullable=False, default=0)
+    physio_messages = Column(Integer, nullable=False, default=0)
+    data_analyst_messages = Column(Integer, nullable=False, default=0)
+    strategist_messages = Column(Integer, nullable=False, default=0)
+    other_messages = Column(Integer, nullable=False, default=0)  # Senders without a dedicated role column
+    adherence_sum = Column(Float, nullable=False, default=0.0)  # Sum of weekly adherence estimates
+    adherence_weeks = Column(Integer, nullable=False, default=0)  # Metric weeks behind adherence_sum
+    hours_committed = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class MemberMonthlyRollup(RollupMeasures, Base):
+    __tablename__ = "member_monthly_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
+    cohort = Column(String(7), nullable=False)  # Member onboarding month, YYYY-MM
+    month = Column(Integer, nullable=False)  # Month number (1-8)
+    
+    __table_args__ = (
+        UniqueConstraint('member_id', 'month', name='uq_member_rollup_month'),
+        Index('idx_member_rollup_cohort', 'cohort', 'month'),
+    )
+
+class CohortMonthlyRollup(RollupMeasures, Base):
+    __tablename__ = "cohort_monthly_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cohort = Column(String(7), nullable=False)  # Member onboarding month, YYYY-MM
+    month = Column(Integer, nullable=False)  # Month number (1-8)
+    
+    __table_args__ = (
+        UniqueConstraint('cohort', 'month', name='uq_cohort_rollup_month'),
+    )
+
+class TaxonomyCategory(Base):
+    __tablename__ = "taxonomy_categories"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)  # tag or decision_type
+    name = Column(String(100), nullable=False)  # Category name; the decision type itself for decision_type rows
+    keywords = Column(JSON, nullable=False)  # Lowercase substrings that put a message in this category
+    tags = Column(JSON, nullable=False)  # Tags added to matching messages (tag rows only)
+    priority = Column(Integer, nullable=False, default=100)  # Lower first: tag order, decision type precedence
+    enabled = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('kind', 'name', name='uq_taxonomy_kind_name'),
+    )
+
+class TeamRosterEntry(Base):
+    __tablename__ = "team_roster"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)  # Display name, also matched as an alias
+    aliases = Column(JSON, nullable=False)  # Lowercase substrings of sender names that mean this person
+    role = Column(String(50), nullable=False)  # member, doctor, concierge, nutritionist, coach, physio, ...
+    member_id = Column(Integer, ForeignKey("members.id"), nullable=True)  # Only for this member's chats; null for all
+    priority = Column(Integer, nullable=False, default=100)  # Lower is tried first when several aliases match
+    enabled = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('member_id', 'name', name='uq_team_roster_member_name'),
     )
 
 class AIIntegration(Base):
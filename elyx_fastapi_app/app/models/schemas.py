@@ -130,6 +130,121 @@ class DecisionResponse(BaseModel):
     effects: List[str]
     confidence_score: Optional[float]
 
+class HealthEventResponse(BaseModel):
+    id: str
+    date: str
+    event_type: str
+    title: str
+    details: Dict[str, Any]
+    month: Optional[int]
+    week_number: Optional[int]
+    linked_conversations: List[str]
+    linked_decisions: List[str]
+
+class MetricsResponse(WeekSummary):
+    ai_insights: Optional[str] = None
+
+# Read endpoint envelopes. Items only carry the requested columns when `fields` is given.
+class ConversationListResponse(BaseModel):
+    success: bool
+    next_page_token: Optional[str] = None
+    conversations: List[ConversationResponse]
+
+class ConversationItemsResponse(BaseModel):
+    success: bool
+    next_page_token: Optional[str] = None
+    items: List[ConversationResponse]
+
+class DecisionListResponse(BaseModel):
+    success: bool
+    decisions: List[DecisionResponse]
+
+class MetricsListResponse(BaseModel):
+    success: bool
+    metrics: List[MetricsResponse]
+
+class TeamMetricsListResponse(BaseModel):
+    success: bool
+    team_metrics: List[TeamMetrics]
+
+class TimelineData(BaseModel):
+    member_id: int
+    conversations: Optional[List[ConversationResponse]] = None
+    decisions: Optional[List[DecisionResponse]] = None
+    health_events: Optional[List[HealthEventResponse]] = None
+    metrics: Optional[List[MetricsResponse]] = None
+    team_metrics: Optional[List[TeamMetrics]] = None
+
+class TimelineResponse(BaseModel):
+    success: bool
+    timeline: TimelineData
+    next_page_token: Optional[str] = None
+
+class MonthlyRollup(BaseModel):
+    month: int
+    doctor_hours: float
+    coach_hours: float
+    nutritionist_hours: float
+    physio_hours: float
+    concierge_hours: float
+    total_hours: float
+    total_interventions: int
+    message_count: int
+    messages_by_role: Dict[str, int]
+    adherence_weeks: int
+    avg_adherence: Optional[float]
+    hours_committed: float
+
+class MemberRollup(MonthlyRollup):
+    cohort: str
+
+class CohortRollup(MonthlyRollup):
+    cohort: str
+    members: int
+
+class MemberRollupResponse(BaseModel):
+    success: bool
+    member_id: int
+    rollups: List[MemberRollup]
+
+class CohortRollupResponse(BaseModel):
+    success: bool
+    rollups: List[CohortRollup]
+
+class AnalyticsResponse(BaseModel):
+    success: bool
+    group_by: List[str]
+    rows: List[Dict[str, Any]]
+
+class BatchGenerationRequest(BaseModel):
+    member_ids: Optional[List[int]] = None
+    residence: Optional[str] = None
+    only_missing: bool = False
+    limit: Optional[int] = Field(None, ge=1)
+    workers: int = Field(4, ge=1, le=32)
+
+class TaxonomyCategoryUpdate(BaseModel):
+    keywords: List[str] = Field(..., min_length=1)
+    tags: List[str] = []
+    priority: int = 100
+    enabled: bool = True
+
+class TeamRosterUpdate(BaseModel):
+    role: str
+    aliases: List[str] = []
+    member_id: Optional[int] = None
+    priority: int = 100
+    enabled: bool = True
+
+class ProvenanceBatchRequest(BaseModel):
+    decision_ids: List[str] = Field(..., min_length=1, max_length=500)
+    depth: int = Field(4, ge=1, le=8)
+
+class EpisodeRegenerationRequest(BaseModel):
+    month: int = Field(..., ge=1)
+    week_number: Optional[int] = Field(None, ge=1)
+    conversations: Optional[str] = None
+
 class JourneyData(BaseModel):
     member_id: int
     generated_at: str
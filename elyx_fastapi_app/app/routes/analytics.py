@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.database import get_db
+from app.models.schemas import AnalyticsResponse
+from app.routes.journey import cached_response
+from app.services.analytics_service import cohort_analytics, GROUP_KEYS, DEFAULT_PERCENTILES
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+def group_keys(group_by: str = Query("month", description=f"Comma separated grouping keys: {', '.join(GROUP_KEYS)}")) -> List[str]:
+    """Resolve the `group_by` parameter of the cohort endpoints"""
+    keys = [key.strip() for key in group_by.split(",") if key.strip()]
+    unknown = set(keys) - set(GROUP_KEYS)
+    if not keys or unknown:
+        raise HTTPException(status_code=400, detail=f"group_by must use: {', '.join(GROUP_KEYS)}")
+    return list(dict.fromkeys(keys))
+
+def month_range(month_from: Optional[int] = Query(None, ge=1, description="First journey month"),
+                month_to: Optional[int] = Query(None, ge=1, description="Last journey month, inclusive")
+                ) -> Optional[Tuple[int, int]]:
+    if month_from is None and month_to is None:
+        return None
+    return (month_from or 1, month_to or 10**6)
+
+@router.get("/cohorts/team-hours", response_model=AnalyticsResponse)
+async def get_team_hours(group_by: List[str] = Depends(group_keys), cohort: Optional[str] = None,
+                         months: Optional[Tuple[int, int]] = Depends(month_range),
+                         db: Session = Depends(get_db)):
+    """Role hours, interventions and hours per intervention across all members"""
+    try:
+        def build():
+            return {
+                "success": True,
+                "group_by": group_by,
+                "rows": cohort_analytics.team_hours(db, group_by, cohort, months)
+            }
+
+        return cached_response(db, "analytics_team_hours", None, (tuple(group_by), cohort, months), build)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cohorts/adherence", response_model=AnalyticsResponse)
+async def get_adherence(group_by: List[str] = Depends(group_keys), cohort: Optional[str] = None,
+                        percentiles: str = Query(",".join(str(p) for p in DEFAULT_PERCENTILES),
+                                                 description="Comma separated percentiles, 0-100"),
+                        months: Optional[Tuple[int, int]] = Depends(month_range),
+                        db: Session = Depends(get_db)):
+    """Adherence mean, spread and percentiles across all members"""
+    try:
+        points = tuple(float(p) for p in percentiles.split(",") if p.strip())
+        if not points or any(p < 0 or p > 100 for p in points):
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=400, detail="percentiles must be numbers between 0 and 100")
+
+    try:
+        def build():
+            return {
+                "success": True,
+                "group_by": group_by,
+                "rows": cohort_analytics.adherence(db, group_by, points, cohort, months)
+            }
+
+        return cached_response(db, "analytics_adherence", None, (tuple(group_by), points, cohort, months), build)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cohorts/adherence-trend", response_model=AnalyticsResponse)
+async def get_adherence_trend(window: int = Query(4, ge=1, le=52, description="Rolling window in observed weeks"),
+                              cohort: Optional[str] = None, db: Session = Depends(get_db)):
+    """Weekly adherence per cohort with a rolling mean"""
+    try:
+        def build():
+            return {
+                "success": True,
+                "group_by": ["cohort", "week_number"],
+                "rows": cohort_analytics.adherence_trend(db, window, cohort)
+            }
+
+        return cached_response(db, "analytics_adherence_trend", None, (window, cohort), build)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
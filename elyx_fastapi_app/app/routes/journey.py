@@ -1,14 +1,199 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from app.database import get_db
+from typing import List, Dict, Any, Optional, Tuple, Callable, Hashable
+from app.database import get_db, StreamSessionLocal
 from app.services.journey_service import journey_service
+from app.services.batch_generation import batch_generation_service
+from app.services.episode_regeneration import episode_regeneration_service
 from app.services.local_ai_service import local_ai_service
-from app.models.database import Member, Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics
-from app.models.schemas import JourneyData
+from app.models.database import Member, Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics, TaxonomyCategory, TeamRosterEntry
+from app.models.schemas import (
+    BatchGenerationRequest, TaxonomyCategoryUpdate, TeamRosterUpdate, ProvenanceBatchRequest, EpisodeRegenerationRequest,
+    JourneyData, TimelineResponse, ConversationListResponse, DecisionListResponse,
+    MetricsListResponse, TeamMetricsListResponse, MemberRollupResponse, CohortRollupResponse
+)
+from app.services.provenance import provenance_service
+from app.services.response_cache import response_cache
+from app.services.rollup_service import rollup_service
+from app.services.roster import team_roster, ROSTER_ROLES
+from app.services.serialization import dumps
+from app.services.tagging import tagging_engine, TAXONOMY_KINDS
+from app.services.timeline_assembler import timeline_assembler
+from app.services.timestamps import parse_time_bound, apply_time_range
+from app.services.pagination import Cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, paginate
+from app.services.projections import (
+    EntitySpec, CONVERSATIONS, DECISIONS, METRICS, TEAM_METRICS,
+    parse_fields, select_fields, select_timeline_fields
+)
 
 router = APIRouter(prefix="/journey", tags=["journey"])
 
+def time_range(
+    date_from: Optional[str] = Query(None, alias="from", description="Start date (YYYY-MM-DD, ISO datetime or epoch seconds)"),
+    date_to: Optional[str] = Query(None, alias="to", description="End date, inclusive (YYYY-MM-DD, ISO datetime or epoch seconds)")
+) -> Tuple[Optional[int], Optional[int]]:
+    """Resolve `from`/`to` query parameters into an inclusive epoch range"""
+    try:
+        return parse_time_bound(date_from), parse_time_bound(date_to, end=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def page_params(
+    after: Optional[str] = Query(None, description="Opaque next_page_token from a previous response"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return the full range")
+) -> Tuple[Optional[Cursor], Optional[int]]:
+    """Resolve keyset pagination parameters into a (cursor, limit) pair"""
+    try:
+        cursor = decode_cursor(after) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    return cursor, limit
+
+def resolve_fields(spec: EntitySpec, fields: Optional[str]) -> List[str]:
+    """Resolve a `fields` parameter for a single-entity endpoint"""
+    try:
+        return select_fields(spec, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def cached_response(db: Session, endpoint: str, member_id: Optional[int], filters: Hashable,
+                    build: Callable[[], Dict[str, Any]]) -> Response:
+    """Serve a read response from the version-keyed cache, building it on a miss.
+
+    Bodies are serialised straight to bytes, so FastAPI neither validates
+    against the route's response_model nor runs jsonable_encoder; the models
+    document the payload shape in the OpenAPI schema.
+    """
+    key = response_cache.key(db, endpoint, member_id, filters)
+    body, hit = response_cache.get_or_build(key, lambda: dumps(build()))
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT" if hit else "MISS"})
+
+@router.post("/generate/batch", status_code=202)
+async def generate_batch(request: BatchGenerationRequest, db: Session = Depends(get_db)):
+    """Generate journeys for a list or filter of members on a worker pool"""
+    if not local_ai_service.groq_api_key:
+        raise HTTPException(status_code=503, detail="GROQ_API_KEY is not configured")
+    try:
+        member_ids = batch_generation_service.select_members(
+            db, request.member_ids, request.residence, request.only_missing, request.limit
+        )
+        if not member_ids:
+            raise HTTPException(status_code=404, detail="No members match the batch selection")
+
+        job = batch_generation_service.start(member_ids, request.workers)
+        return {
+            "success": True,
+            "job_id": job.job_id,
+            "member_ids": member_ids,
+            "workers": job.workers
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/generate/batch/{job_id}")
+async def get_batch_status(job_id: str):
+    """Per-member progress and throughput of a batch generation job"""
+    job = batch_generation_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return {"success": True, **job.summary()}
+
+@router.get("/taxonomy")
+async def get_taxonomy(db: Session = Depends(get_db)):
+    """Tag and decision type categories currently in effect, in priority order"""
+    try:
+        tagging_engine.ensure_loaded(db)
+        return {"success": True, "categories": tagging_engine.categories()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/taxonomy/{kind}/{name}")
+async def put_taxonomy_category(kind: str, name: str, request: TaxonomyCategoryUpdate, db: Session = Depends(get_db)):
+    """Create or replace a taxonomy category; new messages use it immediately, stored ones after retag_corpus.py"""
+    if kind not in TAXONOMY_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(TAXONOMY_KINDS)}")
+    try:
+        tagging_engine.seed_defaults(db)
+        category = db.query(TaxonomyCategory).filter(TaxonomyCategory.kind == kind, TaxonomyCategory.name == name).first()
+        if category is None:
+            category = TaxonomyCategory(kind=kind, name=name)
+            db.add(category)
+        category.keywords = [keyword.lower() for keyword in request.keywords]
+        category.tags = request.tags
+        category.priority = request.priority
+        category.enabled = request.enabled
+        db.commit()
+
+        tagging_engine.load(db)
+        return {"success": True, "categories": tagging_engine.categories()}
+
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/roster")
+async def get_roster(db: Session = Depends(get_db)):
+    """Team roster entries used to resolve conversation senders to roles"""
+    try:
+        team_roster.ensure_loaded(db)
+        return {"success": True, "entries": team_roster.entries()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/roster/{name}")
+async def put_roster_entry(name: str, request: TeamRosterUpdate, db: Session = Depends(get_db)):
+    """Create or replace a roster entry, globally or for one member's conversations"""
+    if request.role not in ROSTER_ROLES:
+        raise HTTPException(status_code=400, detail=f"role must be one of: {', '.join(ROSTER_ROLES)}")
+    try:
+        if request.member_id is not None and not db.query(Member.id).filter(Member.id == request.member_id).first():
+            raise HTTPException(status_code=404, detail="Member not found")
+
+        team_roster.seed_defaults(db)
+        entry = db.query(TeamRosterEntry).filter(TeamRosterEntry.name == name,
+                                                 TeamRosterEntry.member_id == request.member_id).first()
+        if entry is None:
+            entry = TeamRosterEntry(name=name, member_id=request.member_id)
+            db.add(entry)
+        entry.role = request.role
+        entry.aliases = [alias.lower() for alias in request.aliases]
+        entry.priority = request.priority
+        entry.enabled = request.enabled
+        db.commit()
+
+        team_roster.load(db)
+        return {"success": True, "entries": team_roster.entries()}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate/{member_id}/episode")
+async def regenerate_episode(member_id: int, request: EpisodeRegenerationRequest, db: Session = Depends(get_db)):
+    """Regenerate one (month, week) episode and recompute only the rows that depend on it"""
+    if request.conversations is None and not local_ai_service.groq_api_key:
+        raise HTTPException(status_code=503, detail="GROQ_API_KEY is not configured; pass the episode `conversations`")
+    try:
+        result = episode_regeneration_service.regenerate(
+            db, member_id, request.month, request.week_number, request.conversations
+        )
+        return {"success": True, "data": result}
+
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/generate/{member_id}")
 async def generate_journey(member_id: int, db: Session = Depends(get_db)):
     """Generate a complete 8-month journey for a member"""
@@ -45,256 +230,185 @@ async def generate_journey(member_id: int, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/timeline/{member_id}")
-async def get_journey_timeline(member_id: int, db: Session = Depends(get_db)):
-    """Get the complete journey timeline for visualization"""
+@router.get("/timeline/{member_id}", response_model=TimelineResponse)
+async def get_journey_timeline(member_id: int, fields: Optional[str] = None,
+                               stream: Optional[str] = Query(None, pattern="^(json|ndjson)$",
+                                                             description="Stream the response as json or ndjson"),
+                               period: Tuple[Optional[int], Optional[int]] = Depends(time_range),
+                               page: Tuple[Optional[Cursor], Optional[int]] = Depends(page_params),
+                               db: Session = Depends(get_db)):
+    """Get the complete journey timeline for visualization.
+
+    When paginated, each page holds `limit` conversations and every other
+    entity that falls in the time window those conversations cover. With
+    `stream`, rows are sent in batches as they are read instead of being
+    buffered, and the response cache is bypassed.
+    """
     try:
-        # Get all conversations
-        conversations = db.query(Conversation).filter(
-            Conversation.member_id == member_id
-        ).order_by(Conversation.date, Conversation.time).all()
-        
-        # Get all decisions
-        decisions = db.query(Decision).filter(
-            Decision.member_id == member_id
-        ).order_by(Decision.date).all()
-        
-        # Get all health events
-        health_events = db.query(HealthEvent).filter(
-            HealthEvent.member_id == member_id
-        ).order_by(HealthEvent.date).all()
-        
-        # Get all metrics
-        metrics = db.query(MemberMetrics).filter(
-            MemberMetrics.member_id == member_id
-        ).order_by(MemberMetrics.week_start).all()
-        
-        # Get team metrics
-        team_metrics = db.query(TeamMetrics).filter(
-            TeamMetrics.member_id == member_id
-        ).order_by(TeamMetrics.date).all()
-        
-        # Build timeline data
-        timeline_data = {
-            "member_id": member_id,
-            "conversations": [
-                {
-                    "id": c.id,
-                    "date": c.date,
-                    "time": c.time,
-                    "sender": c.sender,
-                    "role": c.role,
-                    "text": c.text,
-                    "tags": c.tags,
-                    "month": c.month,
-                    "week_number": c.week_number,
-                    "travel_context": c.travel_context,
-                    "decision_impact": c.decision_impact or []
-                }
-                for c in conversations
-            ],
-            "decisions": [
-                {
-                    "id": d.id,
-                    "date": d.date,
-                    "title": d.title,
-                    "reason": d.reason,
-                    "decision_type": d.decision_type,
-                    "month": d.month,
-                    "week_number": d.week_number,
-                    "triggered_by_conversation": d.triggered_by_conversation,
-                    "supporting_conversations": d.supporting_conversations,
-                    "effects": d.effects,
-                    "confidence_score": d.confidence_score
-                }
-                for d in decisions
-            ],
-            "health_events": [
-                {
-                    "id": e.id,
-                    "date": e.date,
-                    "event_type": e.event_type,
-                    "title": e.title,
-                    "details": e.details,
-                    "month": e.month,
-                    "week_number": e.week_number,
-                    "linked_conversations": e.linked_conversations,
-                    "linked_decisions": e.linked_decisions
-                }
-                for e in health_events
-            ],
-            "metrics": [
-                {
-                    "week_start": m.week_start,
-                    "week_end": m.week_end,
-                    "month": m.month,
-                    "week_number": m.week_number,
-                    "adherence_estimate": m.adherence_estimate,
-                    "hours_committed": m.hours_committed,
-                    "key_events": m.key_events,
-                    "notes": m.notes,
-                    "ai_insights": m.ai_insights
-                }
-                for m in metrics
-            ],
-            "team_metrics": [
-                {
-                    "date": tm.date,
-                    "month": tm.month,
-                    "week_number": tm.week_number,
-                    "doctor_hours": tm.doctor_hours,
-                    "coach_hours": tm.coach_hours,
-                    "nutritionist_hours": tm.nutritionist_hours,
-                    "physio_hours": tm.physio_hours,
-                    "concierge_hours": tm.concierge_hours,
-                    "total_interventions": tm.total_interventions,
-                    "linked_conversations": tm.linked_conversations
-                }
-                for tm in team_metrics
-            ]
-        }
-        
-        return {
-            "success": True,
-            "timeline": timeline_data
-        }
+        selected = select_timeline_fields(parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if stream:
+        chunks = timeline_assembler.stream(StreamSessionLocal, member_id, selected, *period, *page, fmt=stream)
+        media_type = "application/x-ndjson" if stream == "ndjson" else "application/json"
+        return StreamingResponse(chunks, media_type=media_type)
+    
+    try:
+        def build():
+            # All entity sets are fetched in one round trip and decoded in a single pass
+            timeline_data, next_page_token = timeline_assembler.assemble(db, member_id, selected, *period, *page)
+            return {
+                "success": True,
+                "timeline": timeline_data,
+                "next_page_token": next_page_token
+            }
+        
+        filters = (tuple((name, tuple(names)) for name, names in selected.items()), period, page)
+        return cached_response(db, "timeline", member_id, filters, build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/conversations/{member_id}")
-async def get_conversations(member_id: int, month: int = None, week: int = None, db: Session = Depends(get_db)):
-    """Get conversations for a member with optional filtering"""
+@router.get("/conversations/{member_id}", response_model=ConversationListResponse)
+async def get_conversations(member_id: int, month: int = None, week: int = None, fields: Optional[str] = None,
+                            period: Tuple[Optional[int], Optional[int]] = Depends(time_range),
+                            page: Tuple[Optional[Cursor], Optional[int]] = Depends(page_params),
+                            db: Session = Depends(get_db)):
+    """Get conversations for a member with optional filtering and keyset pagination"""
+    names = resolve_fields(CONVERSATIONS, fields)
     try:
-        query = db.query(Conversation).filter(Conversation.member_id == member_id)
-        
-        if month is not None:
-            query = query.filter(Conversation.month == month)
-        if week is not None:
-            query = query.filter(Conversation.week_number == week)
-        
-        conversations = query.order_by(Conversation.date, Conversation.time).all()
+        def build():
+            query = CONVERSATIONS.query(db, names).filter(Conversation.member_id == member_id)
+            query = apply_time_range(query, Conversation.occurred_at, *period)
+            
+            if month is not None:
+                query = query.filter(Conversation.month == month)
+            if week is not None:
+                query = query.filter(Conversation.week_number == week)
+            
+            conversations, next_page_token = paginate(query, Conversation.occurred_at, Conversation.id, *page)
+            
+            return {
+                "success": True,
+                "next_page_token": next_page_token,
+                "conversations": CONVERSATIONS.to_dicts(db, conversations, names)
+            }
         
-        return {
-            "success": True,
-            "conversations": [
-                {
-                    "id": c.id,
-                    "date": c.date,
-                    "time": c.time,
-                    "sender": c.sender,
-                    "role": c.role,
-                    "text": c.text,
-                    "tags": c.tags,
-                    "month": c.month,
-                    "week_number": c.week_number,
-                    "travel_context": c.travel_context,
-                    "decision_impact": c.decision_impact or []
-                }
-                for c in conversations
-            ]
-        }
+        return cached_response(db, "conversations", member_id, (month, week, tuple(names), period, page), build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/decisions/{member_id}")
-async def get_decisions(member_id: int, month: int = None, decision_type: str = None, db: Session = Depends(get_db)):
+@router.get("/decisions/{member_id}", response_model=DecisionListResponse)
+async def get_decisions(member_id: int, month: int = None, decision_type: str = None, fields: Optional[str] = None,
+                        period: Tuple[Optional[int], Optional[int]] = Depends(time_range),
+                        db: Session = Depends(get_db)):
     """Get decisions for a member with optional filtering"""
+    names = resolve_fields(DECISIONS, fields)
     try:
-        query = db.query(Decision).filter(Decision.member_id == member_id)
-        
-        if month is not None:
-            query = query.filter(Decision.month == month)
-        if decision_type is not None:
-            query = query.filter(Decision.decision_type == decision_type)
-        
-        decisions = query.order_by(Decision.date).all()
+        def build():
+            query = DECISIONS.query(db, names).filter(Decision.member_id == member_id)
+            query = apply_time_range(query, Decision.occurred_at, *period)
+            
+            if month is not None:
+                query = query.filter(Decision.month == month)
+            if decision_type is not None:
+                query = query.filter(Decision.decision_type == decision_type)
+            
+            decisions = query.order_by(Decision.occurred_at, Decision.id).all()
+            
+            return {
+                "success": True,
+                "decisions": DECISIONS.to_dicts(db, decisions, names)
+            }
         
-        return {
-            "success": True,
-            "decisions": [
-                {
-                    "id": d.id,
-                    "date": d.date,
-                    "title": d.title,
-                    "reason": d.reason,
-                    "decision_type": d.decision_type,
-                    "month": d.month,
-                    "week_number": d.week_number,
-                    "triggered_by_conversation": d.triggered_by_conversation,
-                    "supporting_conversations": d.supporting_conversations,
-                    "effects": d.effects,
-                    "confidence_score": d.confidence_score
-                }
-                for d in decisions
-            ]
-        }
+        return cached_response(db, "decisions", member_id, (month, decision_type, tuple(names), period), build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/metrics/{member_id}")
-async def get_metrics(member_id: int, month: int = None, db: Session = Depends(get_db)):
+@router.get("/metrics/{member_id}", response_model=MetricsListResponse)
+async def get_metrics(member_id: int, month: int = None, fields: Optional[str] = None,
+                      period: Tuple[Optional[int], Optional[int]] = Depends(time_range),
+                      db: Session = Depends(get_db)):
     """Get metrics for a member with optional filtering"""
+    names = resolve_fields(METRICS, fields)
     try:
-        query = db.query(MemberMetrics).filter(MemberMetrics.member_id == member_id)
+        def build():
+            query = METRICS.query(db, names).filter(MemberMetrics.member_id == member_id)
+            query = apply_time_range(query, MemberMetrics.week_start_at, *period)
+            
+            if month is not None:
+                query = query.filter(MemberMetrics.month == month)
+            
+            metrics = query.order_by(MemberMetrics.week_start_at, MemberMetrics.id).all()
+            
+            return {
+                "success": True,
+                "metrics": METRICS.to_dicts(db, metrics, names)
+            }
         
-        if month is not None:
-            query = query.filter(MemberMetrics.month == month)
+        return cached_response(db, "metrics", member_id, (month, tuple(names), period), build)
         
-        metrics = query.order_by(MemberMetrics.week_start).all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/team-metrics/{member_id}", response_model=TeamMetricsListResponse)
+async def get_team_metrics(member_id: int, month: int = None, fields: Optional[str] = None,
+                           period: Tuple[Optional[int], Optional[int]] = Depends(time_range),
+                           db: Session = Depends(get_db)):
+    """Get team metrics for a member with optional filtering"""
+    names = resolve_fields(TEAM_METRICS, fields)
+    try:
+        def build():
+            query = TEAM_METRICS.query(db, names).filter(TeamMetrics.member_id == member_id)
+            query = apply_time_range(query, TeamMetrics.occurred_at, *period)
+            
+            if month is not None:
+                query = query.filter(TeamMetrics.month == month)
+            
+            team_metrics = query.order_by(TeamMetrics.occurred_at, TeamMetrics.id).all()
+            
+            return {
+                "success": True,
+                "team_metrics": TEAM_METRICS.to_dicts(db, team_metrics, names)
+            }
         
-        return {
-            "success": True,
-            "metrics": [
-                {
-                    "week_start": m.week_start,
-                    "week_end": m.week_end,
-                    "month": m.month,
-                    "week_number": m.week_number,
-                    "adherence_estimate": m.adherence_estimate,
-                    "hours_committed": m.hours_committed,
-                    "key_events": m.key_events,
-                    "notes": m.notes,
-                    "ai_insights": m.ai_insights
-                }
-                for m in metrics
-            ]
-        }
+        return cached_response(db, "team_metrics", member_id, (month, tuple(names), period), build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/team-metrics/{member_id}")
-async def get_team_metrics(member_id: int, month: int = None, db: Session = Depends(get_db)):
-    """Get team metrics for a member with optional filtering"""
+@router.get("/rollups/{member_id}", response_model=MemberRollupResponse)
+async def get_member_rollups(member_id: int, db: Session = Depends(get_db)):
+    """Get pre-aggregated monthly hours, message counts and adherence for a member"""
     try:
-        query = db.query(TeamMetrics).filter(TeamMetrics.member_id == member_id)
+        def build():
+            return {
+                "success": True,
+                "member_id": member_id,
+                "rollups": rollup_service.member_rollups(db, member_id)
+            }
         
-        if month is not None:
-            query = query.filter(TeamMetrics.month == month)
+        return cached_response(db, "member_rollups", member_id, (), build)
         
-        team_metrics = query.order_by(TeamMetrics.date).all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cohort-rollups", response_model=CohortRollupResponse)
+async def get_cohort_rollups(cohort: Optional[str] = Query(None, description="Onboarding month, YYYY-MM"),
+                             db: Session = Depends(get_db)):
+    """Get monthly rollups per member cohort (members grouped by onboarding month)"""
+    try:
+        def build():
+            return {
+                "success": True,
+                "rollups": rollup_service.cohort_rollups(db, cohort)
+            }
         
-        return {
-            "success": True,
-            "team_metrics": [
-                {
-                    "date": tm.date,
-                    "month": tm.month,
-                    "week_number": tm.week_number,
-                    "doctor_hours": tm.doctor_hours,
-                    "coach_hours": tm.coach_hours,
-                    "nutritionist_hours": tm.nutritionist_hours,
-                    "physio_hours": tm.physio_hours,
-                    "concierge_hours": tm.concierge_hours,
-                    "total_interventions": tm.total_interventions,
-                    "linked_conversations": tm.linked_conversations
-                }
-                for tm in team_metrics
-            ]
-        }
+        # Any member's write can change a cohort, so key on the global version
+        return cached_response(db, "cohort_rollups", None, cohort, build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -303,62 +417,101 @@ async def get_team_metrics(member_id: int, month: int = None, db: Session = Depe
 async def get_decision_context(decision_id: str, db: Session = Depends(get_db)):
     """Get the context and conversations that led to a specific decision"""
     try:
-        # Get the decision
-        decision = db.query(Decision).filter(Decision.id == decision_id).first()
-        if not decision:
-            raise HTTPException(status_code=404, detail="Decision not found")
-        
-        # Get supporting conversations
-        supporting_conversations = []
-        if decision.supporting_conversations:
-            conversations = db.query(Conversation).filter(
-                Conversation.id.in_(decision.supporting_conversations)
-            ).order_by(Conversation.date, Conversation.time).all()
+        def build():
+            # Get the decision
+            decision = db.query(Decision).filter(Decision.id == decision_id).first()
+            if not decision:
+                raise HTTPException(status_code=404, detail="Decision not found")
             
-            supporting_conversations = [
-                {
-                    "id": c.id,
-                    "date": c.date,
-                    "time": c.time,
-                    "sender": c.sender,
-                    "role": c.role,
-                    "text": c.text,
-                    "tags": c.tags
-                }
-                for c in conversations
-            ]
-        
-        # Get triggered conversation
-        triggered_conversation = None
-        if decision.triggered_by_conversation:
-            conv = db.query(Conversation).filter(Conversation.id == decision.triggered_by_conversation).first()
-            if conv:
-                triggered_conversation = {
-                    "id": conv.id,
-                    "date": conv.date,
-                    "time": conv.time,
-                    "sender": conv.sender,
-                    "role": conv.role,
-                    "text": conv.text,
-                    "tags": conv.tags
-                }
-        
-        return {
-            "success": True,
-            "decision": {
-                "id": decision.id,
-                "date": decision.date,
-                "title": decision.title,
-                "reason": decision.reason,
-                "decision_type": decision.decision_type,
-                "month": decision.month,
-                "week_number": decision.week_number,
-                "confidence_score": decision.confidence_score,
-                "ai_reasoning": decision.ai_reasoning
-            },
-            "triggered_conversation": triggered_conversation,
-            "supporting_conversations": supporting_conversations
-        }
+            # Get supporting conversations
+            supporting_conversations = []
+            if decision.supporting_conversations:
+                conversations = db.query(Conversation).filter(
+                    Conversation.id.in_(decision.supporting_conversations)
+                ).order_by(Conversation.occurred_at, Conversation.id).all()
+            
+                supporting_conversations = [
+                    {
+                        "id": c.id,
+                        "date": c.date,
+                        "time": c.time,
+                        "sender": c.sender,
+                        "role": c.role,
+                        "text": c.text,
+                        "tags": c.tags
+                    }
+                    for c in conversations
+                ]
+            
+            # Get triggered conversation
+            triggered_conversation = None
+            if decision.triggered_by_conversation:
+                conv = db.query(Conversation).filter(Conversation.id == decision.triggered_by_conversation).first()
+                if conv:
+                    triggered_conversation = {
+                        "id": conv.id,
+                        "date": conv.date,
+                        "time": conv.time,
+                        "sender": conv.sender,
+                        "role": conv.role,
+                        "text": conv.text,
+                        "tags": conv.tags
+                    }
+            
+            return {
+                "success": True,
+                "decision": {
+                    "id": decision.id,
+                    "date": decision.date,
+                    "title": decision.title,
+                    "reason": decision.reason,
+                    "decision_type": decision.decision_type,
+                    "month": decision.month,
+                    "week_number": decision.week_number,
+                    "confidence_score": decision.confidence_score,
+                    "ai_reasoning": decision.ai_reasoning
+                },
+                "triggered_conversation": triggered_conversation,
+                "supporting_conversations": supporting_conversations
+            }
+        
+        # Keyed on the global version since the owning member is only known after the lookup
+        return cached_response(db, "decision_context", None, decision_id, build)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/provenance/{decision_id}")
+async def get_provenance(
+    decision_id: str,
+    depth: int = Query(provenance_service.DEFAULT_DEPTH, ge=1, le=provenance_service.MAX_DEPTH,
+                       description="Hops to follow from the decision"),
+    db: Session = Depends(get_db)
+):
+    """Walk a decision's provenance: conversations, health events, metrics and follow-up decisions"""
+    try:
+        graphs, missing, hits = provenance_service.graphs(db, [decision_id], depth)
+        if missing:
+            raise HTTPException(status_code=404, detail="Decision not found")
+        return Response(content=dumps({"success": True, **graphs[decision_id]}), media_type="application/json",
+                        headers={"X-Cache": "HIT" if hits else "MISS"})
+
+    except HTTPException:
+        raise
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/provenance/batch")
+async def get_provenance_batch(request: ProvenanceBatchRequest, db: Session = Depends(get_db)):
+    """Provenance graphs for many decisions; uncached ones are walked together in one query"""
+    try:
+        graphs, missing, hits = provenance_service.graphs(db, request.decision_ids, request.depth)
+        return Response(content=dumps({"success": True, "graphs": graphs, "missing": missing, "cache_hits": hits}),
+                        media_type="application/json")
+
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
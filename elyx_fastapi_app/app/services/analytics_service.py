@@ -0,0 +1,127 @@
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.database import Member, MemberMetrics, TeamMetrics
+from app.services.response_cache import response_cache
+
+HOUR_COLUMNS = ["doctor_hours", "coach_hours", "nutritionist_hours", "physio_hours", "concierge_hours"]
+GROUP_KEYS = ("cohort", "month", "week_number")
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+
+class CohortAnalytics:
+    """Fleet-wide aggregates over team and member metrics.
+
+    The metric tables are loaded column-wise into pandas frames in one query
+    each and kept until the global data version changes, so every aggregate,
+    percentile and rolling window is computed with vectorised group-bys
+    instead of per-member queries and Python loops.
+    """
+
+    def __init__(self):
+        self._frames: Optional[Tuple[int, pd.DataFrame, pd.DataFrame]] = None
+        self._lock = threading.Lock()
+
+    def frames(self, db: Session) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """(team_metrics, member_metrics) frames for the current data version"""
+        # Read the version first: a write during the load leaves these frames stale, never fresh
+        version = response_cache.version(db, None)
+        with self._lock:
+            if self._frames is not None and self._frames[0] == version:
+                return self._frames[1], self._frames[2]
+
+        team, metrics = self._load(db)
+        with self._lock:
+            self._frames = (version, team, metrics)
+        return team, metrics
+
+    def _frame(self, connection, stmt) -> pd.DataFrame:
+        # Plain tuples into from_records is cheaper than pd.read_sql's per-row handling
+        result = connection.execute(stmt)
+        return pd.DataFrame.from_records(result.all(), columns=list(result.keys()))
+
+    def _load(self, db: Session) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        connection = db.connection()
+        members = self._frame(connection, select(Member.id, Member.created_at))
+        created_at = pd.to_datetime(members["created_at"], errors="coerce")
+        cohorts = pd.Series(created_at.dt.strftime("%Y-%m").fillna("unknown").to_numpy(), index=members["id"])
+
+        team = self._frame(connection, select(
+            TeamMetrics.member_id, TeamMetrics.month, TeamMetrics.week_number,
+            *[getattr(TeamMetrics, name) for name in HOUR_COLUMNS], TeamMetrics.total_interventions
+        ))
+        team[HOUR_COLUMNS] = team[HOUR_COLUMNS].astype("float64").fillna(0.0)
+        team["total_interventions"] = team["total_interventions"].fillna(0).astype("int64")
+        team["total_hours"] = team[HOUR_COLUMNS].to_numpy().sum(axis=1)
+
+        metrics = self._frame(connection, select(
+            MemberMetrics.member_id, MemberMetrics.month, MemberMetrics.week_number,
+            MemberMetrics.adherence_estimate, MemberMetrics.hours_committed
+        ))
+
+        for frame in (team, metrics):
+            frame["cohort"] = frame["member_id"].map(cohorts).fillna("unknown").astype("category")
+        return team, metrics
+
+    def _filter(self, frame: pd.DataFrame, cohort: Optional[str], months: Optional[Tuple[int, int]]) -> pd.DataFrame:
+        mask = np.ones(len(frame), dtype=bool)
+        if cohort is not None:
+            mask &= (frame["cohort"] == cohort).to_numpy()
+        if months is not None:
+            mask &= frame["month"].between(*months).to_numpy()
+        return frame[mask]
+
+    def _records(self, frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        frame = frame.reset_index().round(4)
+        return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+    def team_hours(self, db: Session, group_by: Sequence[str], cohort: Optional[str] = None,
+                   months: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """Role hours, interventions and hours per intervention for each group"""
+        team = self._filter(self.frames(db)[0], cohort, months)
+        grouped = team.groupby(list(group_by), observed=True, sort=True)
+
+        result = grouped[HOUR_COLUMNS + ["total_hours", "total_interventions"]].sum()
+        result.insert(0, "members", grouped["member_id"].nunique())
+        interventions = result["total_interventions"].replace(0, np.nan)
+        for name in HOUR_COLUMNS + ["total_hours"]:
+            result[f"{name}_per_intervention"] = result[name] / interventions
+        result["mean_hours_per_member"] = result["total_hours"] / result["members"]
+        return self._records(result)
+
+    def adherence(self, db: Session, group_by: Sequence[str], percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                  cohort: Optional[str] = None, months: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """Adherence distribution (mean, spread and percentiles) for each group"""
+        metrics = self._filter(self.frames(db)[1], cohort, months)
+        grouped = metrics.groupby(list(group_by), observed=True, sort=True)
+        adherence = grouped["adherence_estimate"]
+
+        result = adherence.agg(["count", "mean", "std", "min", "max"])
+        result.insert(0, "members", grouped["member_id"].nunique())
+        if len(metrics):
+            quantiles = adherence.quantile([p / 100 for p in percentiles]).unstack()
+            quantiles.columns = [f"p{p:g}" for p in percentiles]
+            result = result.join(quantiles)
+        result["mean_hours_committed"] = grouped["hours_committed"].mean()
+        return self._records(result)
+
+    def adherence_trend(self, db: Session, window: int = 4, cohort: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Weekly mean adherence per cohort with a rolling mean over `window` observed weeks"""
+        metrics = self._filter(self.frames(db)[1], cohort, None)
+        grouped = metrics.groupby(["cohort", "week_number"], observed=True, sort=True)
+
+        result = grouped["adherence_estimate"].agg(["count", "mean"])
+        result.insert(0, "members", grouped["member_id"].nunique())
+        result["rolling_mean"] = (
+            result["mean"].groupby(level="cohort", observed=True)
+            .rolling(window, min_periods=1).mean()
+            .droplevel(0)
+        )
+        return self._records(result)
+
+# Global cohort analytics instance
+cohort_analytics = CohortAnalytics()
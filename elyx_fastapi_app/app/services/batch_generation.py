@@ -0,0 +1,174 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+
+from app.database import create_worker_sessionmaker
+from app.models.database import Member, Conversation
+from app.services.journey_service import journey_service
+from app.services.local_ai_service import local_ai_service
+
+def member_payload(member: Member) -> Dict[str, Any]:
+    """Member profile fields passed to journey generation"""
+    return {
+        "id": member.id,
+        "preferred_name": member.preferred_name,
+        "age": member.age,
+        "gender": member.gender,
+        "occupation": member.occupation,
+        "residence": member.residence,
+        "travel_hubs": member.travel_hubs,
+        "tech_preferences": member.tech_preferences,
+        "health_goals": member.health_goals,
+        "communication_preferences": member.communication_preferences,
+        "scheduling_preferences": member.scheduling_preferences
+    }
+
+class BatchJob:
+    """Progress of one batch generation run"""
+
+    def __init__(self, member_ids: List[int], workers: int):
+        self.job_id = str(uuid.uuid4())
+        self.workers = workers
+        self.status = "queued"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.members: Dict[int, Dict[str, Any]] = {
+            member_id: {"status": "pending"} for member_id in member_ids
+        }
+        self._lock = threading.Lock()
+
+    def update(self, member_id: int, **fields):
+        with self._lock:
+            self.members[member_id].update(fields)
+
+    def summary(self, include_members: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            members = {member_id: dict(progress) for member_id, progress in self.members.items()}
+        finished = [p for p in members.values() if p["status"] in ("succeeded", "failed")]
+        succeeded = [p for p in finished if p["status"] == "succeeded"]
+        conversations = sum(p.get("conversations_stored", 0) for p in succeeded)
+        elapsed = ((self.finished_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+
+        summary = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "workers": self.workers,
+            "total": len(members),
+            "completed": len(finished),
+            "succeeded": len(succeeded),
+            "failed": len(finished) - len(succeeded),
+            "running": sum(1 for p in members.values() if p["status"] == "running"),
+            "elapsed_seconds": round(elapsed, 2),
+            "members_per_minute": round(len(finished) / elapsed * 60, 2) if elapsed else 0.0,
+            "conversations_stored": conversations,
+            "conversations_per_second": round(conversations / elapsed, 2) if elapsed else 0.0,
+            "llm_rate_limit": local_ai_service.rate_limiter.stats()
+        }
+        if include_members:
+            summary["members"] = members
+        return summary
+
+class BatchGenerationService:
+    """Generates journeys for many members on a thread pool.
+
+    Generation is dominated by LLM round trips, so threads overlap the waiting
+    while the shared token bucket in LocalAIService keeps the combined request
+    rate inside the API quota. Each worker uses its own database session.
+    """
+
+    MAX_JOBS = 50
+
+    def __init__(self):
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._session_factory = None
+
+    def _sessions(self):
+        if self._session_factory is None:
+            self._session_factory = create_worker_sessionmaker()
+        return self._session_factory
+
+    def select_members(self, db: Session, member_ids: Optional[List[int]] = None, residence: Optional[str] = None,
+                       only_missing: bool = False, limit: Optional[int] = None) -> List[int]:
+        """Resolve a member list or filter into member ids"""
+        query = db.query(Member.id)
+        if member_ids:
+            query = query.filter(Member.id.in_(member_ids))
+        if residence:
+            query = query.filter(Member.residence == residence)
+        if only_missing:
+            # Members onboarded but without a generated journey yet
+            query = query.filter(~exists().where(Conversation.member_id == Member.id))
+        query = query.order_by(Member.id)
+        if limit:
+            query = query.limit(limit)
+        return [member_id for member_id, in query.all()]
+
+    def _generate_member(self, job: BatchJob, member_id: int, on_progress: Optional[Callable]):
+        job.update(member_id, status="running", started_at=datetime.now().isoformat())
+        started = time.monotonic()
+        db = self._sessions()()
+        try:
+            member = db.query(Member).filter(Member.id == member_id).first()
+            if not member:
+                result = {"success": False, "error": "Member not found"}
+            else:
+                result = journey_service.generate_and_store_journey(member_payload(member), db)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        finally:
+            db.close()
+
+        if result["success"]:
+            job.update(member_id, status="succeeded", seconds=round(time.monotonic() - started, 2),
+                       conversations_stored=result["conversations_stored"],
+                       decisions_stored=result["decisions_stored"])
+        else:
+            job.update(member_id, status="failed", seconds=round(time.monotonic() - started, 2),
+                       error=result["error"])
+        if on_progress:
+            on_progress(job, member_id)
+
+    def run(self, job: BatchJob, on_progress: Optional[Callable] = None) -> BatchJob:
+        """Generate every member of the job and block until all are done"""
+        job.status = "running"
+        job.started_at = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=job.workers, thread_name_prefix="journey-batch") as pool:
+                for member_id in list(job.members):
+                    pool.submit(self._generate_member, job, member_id, on_progress)
+            job.status = "completed"
+        except Exception:
+            job.status = "failed"
+            raise
+        finally:
+            job.finished_at = time.monotonic()
+        return job
+
+    def create_job(self, member_ids: List[int], workers: int = 4) -> BatchJob:
+        job = BatchJob(member_ids, max(1, workers))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.MAX_JOBS:
+                self._jobs.popitem(last=False)
+        return job
+
+    def start(self, member_ids: List[int], workers: int = 4) -> BatchJob:
+        """Start a batch in the background and return its job for polling"""
+        job = self.create_job(member_ids, workers)
+        threading.Thread(target=self.run, args=(job,), name=f"journey-batch-{job.job_id[:8]}", daemon=True).start()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+# Global batch generation service instance
+batch_generation_service = BatchGenerationService()
@@ -0,0 +1,184 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.models.database import Conversation, Decision, HealthEvent, Member, MemberMetrics, TeamMetrics
+from app.services.rollup_service import rollup_service
+from app.services.tombstones import delete_recorded
+
+# Rows sharing these columns are one logical row written more than once; the newest copy is kept
+NATURAL_KEYS = [
+    (Conversation, ["member_id", "month", "week_number", "sender_id", "text", "date", "time"]),
+    (Decision, ["member_id", "month", "week_number"]),
+    (HealthEvent, ["member_id", "event_type", "month", "week_number"]),
+    (MemberMetrics, ["member_id", "month", "week_number"]),
+    (TeamMetrics, ["member_id", "month", "week_number"]),
+]
+
+# Columns holding ids of other journey rows: (scalar columns, list columns)
+LINK_COLUMNS = {
+    Conversation: (["relates_to"], ["decision_impact"]),
+    Decision: (["triggered_by_conversation"], ["supporting_conversations", "effects"]),
+    HealthEvent: ([], ["linked_conversations", "linked_decisions"]),
+    MemberMetrics: ([], ["key_events"]),
+    TeamMetrics: ([], ["linked_conversations"]),
+}
+
+class DeduplicationService:
+    """Collapse the duplicate journey rows left by repeated generations.
+
+    Before content-hash keys, every run minted fresh ids, so a member
+    generated twice holds two decisions, health events and metric rows per
+    period. Within each natural key the newest row survives; conversations
+    are duplicates when every identifying column matches, and those only a
+    dropped decision referenced are removed with it, since they belong to
+    the superseded run. Links on the surviving rows are rewritten to the
+    kept ids, removed rows are deleted in bulk (leaving export tombstones), and rollups are rebuilt per
+    member batch, each batch in its own transaction.
+    """
+
+    BATCH_MEMBERS = 200
+    DELETE_CHUNK = 500
+
+    def run(self, db: Session, member_ids: Optional[Sequence[int]] = None, dry_run: bool = False,
+            batch_members: int = BATCH_MEMBERS) -> Dict[str, Any]:
+        started = time.perf_counter()
+        query = select(Member.id).order_by(Member.id)
+        if member_ids:
+            query = query.where(Member.id.in_(member_ids))
+        members = list(db.execute(query).scalars())
+
+        stats: Dict[str, Any] = {model.__tablename__: 0 for model, _ in NATURAL_KEYS}
+        stats.update(links_rewritten=0, members_changed=0)
+        for start in range(0, len(members), batch_members):
+            batch = members[start:start + batch_members]
+            try:
+                changed = self._dedupe(db, batch, stats, dry_run)
+                if dry_run:
+                    db.rollback()
+                else:
+                    if changed:
+                        rollup_service.rebuild(db, changed)
+                    db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            stats["members_changed"] += len(changed)
+            print(f"🧹 Members {batch[0]}-{batch[-1]}: {len(changed)} with duplicates")
+
+        stats["dry_run"] = dry_run
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _dedupe(self, db: Session, member_ids: List[int], stats: Dict[str, Any], dry_run: bool) -> set:
+        """Remove one batch's duplicates in the current transaction; returns the members changed"""
+        remap: Dict[Any, Optional[Any]] = {}
+        dropped: Dict[Any, List[Any]] = {}
+        owners: Dict[Any, int] = {}
+        for model, key in NATURAL_KEYS:
+            dropped[model] = self._duplicates(db, model, key, member_ids, remap, owners)
+
+        # Conversations only a dropped decision drew on belong to the run that decision came from
+        decisions = {row.id: row for row in db.execute(
+            select(Decision.id, Decision.triggered_by_conversation, Decision.supporting_conversations)
+            .where(Decision.id.in_(dropped[Decision] + [remap[i] for i in dropped[Decision]]))
+        )}
+        kept_links = set()
+        for decision_id in set(remap[i] for i in dropped[Decision]):
+            row = decisions[decision_id]
+            kept_links.update(row.supporting_conversations or [], [row.triggered_by_conversation])
+        for decision_id in dropped[Decision]:
+            row = decisions[decision_id]
+            for conversation_id in [row.triggered_by_conversation, *(row.supporting_conversations or [])]:
+                if conversation_id and conversation_id not in kept_links and conversation_id not in remap:
+                    remap[conversation_id] = None
+                    owners[conversation_id] = owners[decision_id]
+                    dropped[Conversation].append(conversation_id)
+        dropped[Conversation] = list(dict.fromkeys(dropped[Conversation]))
+
+        for model, _ in NATURAL_KEYS:
+            stats[model.__tablename__] += len(dropped[model])
+        if not remap:
+            return set()
+
+        for model, (scalars, lists) in LINK_COLUMNS.items():
+            stats["links_rewritten"] += self._rewrite_links(db, model, scalars, lists, member_ids,
+                                                            remap, set(dropped[model]), dry_run)
+        if not dry_run:
+            for model, ids in dropped.items():
+                for start in range(0, len(ids), self.DELETE_CHUNK):
+                    delete_recorded(db, model, model.id.in_(ids[start:start + self.DELETE_CHUNK]))
+        return {owners[row_id] for row_id in remap}
+
+    def _duplicates(self, db: Session, model, key: List[str], member_ids: List[int],
+                    remap: Dict[Any, Optional[Any]], owners: Dict[Any, int]) -> List[Any]:
+        """Ids of the older copies of each natural key, recording old id -> kept id in `remap`"""
+        columns = [getattr(model, name) for name in key]
+        rows = db.execute(
+            select(model.id, model.created_at, *columns)
+            .where(model.member_id.in_(member_ids), model.month.isnot(None))
+        )
+        newest: Dict[tuple, Any] = {}
+        groups: Dict[tuple, List[Any]] = {}
+        for row in sorted(rows, key=lambda row: (row.created_at or datetime.min, str(row.id))):
+            values = tuple(row[2:])
+            groups.setdefault(values, []).append(row.id)
+            newest[values] = row.id
+
+        older = []
+        for values, ids in groups.items():
+            for row_id in ids[:-1]:
+                remap[row_id] = newest[values]
+                owners[row_id] = values[0]
+                older.append(row_id)
+        return older
+
+    def _rewrite_links(self, db: Session, model, scalars: List[str], lists: List[str], member_ids: List[int],
+                       remap: Dict[Any, Optional[Any]], removed: set, dry_run: bool) -> int:
+        """Point the surviving rows' links at the kept ids, dropping links to removed rows"""
+        names = scalars + lists
+        changes = []
+        for row in db.execute(select(model.id, *[getattr(model, name) for name in names])
+                              .where(model.member_id.in_(member_ids))):
+            if row.id in removed:
+                continue
+            values = dict(zip(names, row[1:]))
+            rewritten = {}
+            for name in scalars:
+                if values[name] in remap:
+                    rewritten[name] = remap[values[name]]
+            for name in lists:
+                items = values[name] or []
+                if any(item in remap for item in items):
+                    rewritten[name] = list(dict.fromkeys(
+                        remap.get(item, item) for item in items if remap.get(item, item) is not None
+                    ))
+            if not rewritten:
+                continue
+            values.update(rewritten)
+            if model is Decision and values["triggered_by_conversation"] is None:
+                values["triggered_by_conversation"] = (values["supporting_conversations"] or [None])[0]
+            changes.append({"_id": row.id, **values})
+
+        if changes and not dry_run:
+            table = model.__table__
+            db.execute(update(table).where(table.c.id == bindparam("_id"))
+                       .values({name: bindparam(name) for name in names}), changes)
+        return len(changes)
+
+    def compact(self, engine) -> str:
+        """Return freed pages to the filesystem and refresh planner statistics"""
+        statements = {"sqlite": ["VACUUM", "ANALYZE"], "postgresql": ["VACUUM ANALYZE"]}.get(engine.dialect.name)
+        if statements is None:
+            return f"no compaction step for {engine.dialect.name}"
+        # VACUUM cannot run inside a transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+        return "; ".join(statements)
+
+# Global deduplication service instance
+deduplication_service = DeduplicationService()
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from app.models.database import ASSIGNED_VALUES_KEY, DictionaryValue
+
+PENDING_CODES_KEY = "dictionary_pending_codes"
+
+_ENCODED_ATTRIBUTES: Dict[type, Dict[str, Tuple[str, str]]] = {}
+
+def encoded_attributes(model) -> Dict[str, Tuple[str, str]]:
+    """{decoded attribute: (dictionary domain, code column key)} of a model"""
+    attributes = _ENCODED_ATTRIBUTES.get(model)
+    if attributes is None:
+        attributes = _ENCODED_ATTRIBUTES[model] = {
+            name: (descriptor.info["domain"], descriptor.info["code"].key)
+            for name, descriptor in inspect(model).all_orm_descriptors.items() if "domain" in descriptor.info
+        }
+    return attributes
+
+class DictionaryEncoder:
+    """Maps the strings of dictionary-encoded columns to their integer codes and back.
+
+    Codes are created on first use with an insert that ignores conflicts, in
+    the caller's transaction. Codes never change once committed, so they are
+    cached for the life of the process; codes created by a transaction that
+    has not committed yet stay in the session until it does, since a rolled
+    back id can be handed to a different string later.
+
+    Decoding reads the same cache in reverse. The dictionary only grows, so
+    its version is the highest code loaded: an unknown code loads every
+    value added since, in one query, and rows decode without touching
+    dictionary_values again.
+    """
+
+    def __init__(self):
+        self._codes: Dict[Tuple[str, str], int] = {}
+        self._values: Dict[int, str] = {}
+        self.version = 0
+
+    def encode(self, db: Session, domain: str, values: Iterable[Optional[str]]) -> Dict[str, int]:
+        """{value: code} for the given values of one domain, creating missing codes"""
+        pending = db.info.setdefault(PENDING_CODES_KEY, {})
+        codes, missing = {}, []
+        for value in set(values):
+            if value is None:
+                continue
+            code = self._codes.get((domain, value)) or pending.get((domain, value))
+            if code is None:
+                missing.append(value)
+            else:
+                codes[value] = code
+        if not missing:
+            return codes
+
+        table = DictionaryValue.__table__
+        dialect = db.get_bind().dialect.name
+        rows = [{"domain": domain, "value": value} for value in sorted(missing)]
+        if dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)
+            db.execute(stmt.on_conflict_do_nothing(index_elements=["domain", "value"]), rows)
+            created = self._lookup(db, domain, missing)
+        else:
+            created = self._lookup(db, domain, missing)
+            new_rows = [row for row in rows if row["value"] not in created]
+            if new_rows:
+                db.execute(insert(table), new_rows)
+                created = self._lookup(db, domain, missing)
+
+        for value, code in created.items():
+            pending[(domain, value)] = code
+        codes.update(created)
+        return codes
+
+    def _lookup(self, db: Session, domain: str, values: List[str]) -> Dict[str, int]:
+        codes = {}
+        for start in range(0, len(values), 500):
+            codes.update(db.execute(select(DictionaryValue.value, DictionaryValue.id).where(
+                DictionaryValue.domain == domain, DictionaryValue.value.in_(values[start:start + 500])
+            )).all())
+        return codes
+
+    def values(self, db: Session, codes: Iterable[Optional[int]]) -> Dict[int, str]:
+        """{code: value} for the given codes, loading the values added since the cached version once"""
+        missing = {code for code in codes if code is not None and code not in self._values}
+        if missing:
+            pending = {code: value for (_, value), code in db.info.get(PENDING_CODES_KEY, {}).items()}
+            # A code below the version can still appear when a transaction that took it commits late
+            rows = db.execute(select(DictionaryValue.id, DictionaryValue.domain, DictionaryValue.value).where(
+                or_(DictionaryValue.id > self.version, DictionaryValue.id.in_(sorted(missing - set(pending))))
+            )).all()
+            for code, domain, value in rows:
+                if code not in pending:
+                    self._values[code] = value
+                    self._codes[(domain, value)] = code
+                    self.version = max(self.version, code)
+            return {**pending, **self._values}
+        return self._values
+
+    def decode(self, instance, code: Optional[int]) -> Optional[str]:
+        """The string behind one code column of a loaded instance"""
+        if code is None:
+            return None
+        value = self._values.get(code)
+        if value is None:
+            db = object_session(instance)
+            if db is None:
+                raise DetachedInstanceError(f"Cannot decode dictionary code {code}: {instance!r} is not bound to a Session")
+            value = self.values(db, [code])[code]
+        return value
+
+    def encode_rows(self, db: Session, model, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copies of `rows` with decoded string fields replaced by their code columns, for Core writes"""
+        attributes = {name: spec for name, spec in encoded_attributes(model).items() if rows and name in rows[0]}
+        if not attributes:
+            return rows
+        codes = {name: self.encode(db, domain, (row[name] for row in rows)) for name, (domain, _) in attributes.items()}
+        encoded = []
+        for row in rows:
+            row = dict(row)
+            for name, (_, code_key) in attributes.items():
+                value = row.pop(name)
+                row[code_key] = codes[name][value] if value is not None else None
+            encoded.append(row)
+        return encoded
+
+    def commit(self, db: Session):
+        self._codes.update(db.info.pop(PENDING_CODES_KEY, {}))
+
+    def discard(self, db: Session):
+        db.info.pop(PENDING_CODES_KEY, None)
+
+@event.listens_for(Session, "before_flush")
+def _encode_assigned_values(session: Session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        assigned = obj.__dict__.pop(ASSIGNED_VALUES_KEY, None)
+        if not assigned:
+            continue
+        attributes = encoded_attributes(type(obj))
+        for name, value in assigned.items():
+            domain, code_key = attributes[name]
+            setattr(obj, code_key, dictionary_encoder.encode(session, domain, [value])[value]
+                    if value is not None else None)
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_codes(session: Session):
+    dictionary_encoder.commit(session)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_codes(session: Session):
+    dictionary_encoder.discard(session)
+
+# Global dictionary encoder instance
+dictionary_encoder = DictionaryEncoder()
@@ -0,0 +1,185 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.database import Conversation, Decision, HealthEvent, Member, MemberMetrics, TeamMetrics
+from app.services.batch_generation import member_payload
+from app.services.journey_service import journey_service
+from app.services.local_ai_service import local_ai_service
+from app.services.roster import team_roster
+from app.services.tagging import tagging_engine
+
+def splice(ids: Optional[List[str]], old: Set[str], new: List[str]) -> List[str]:
+    """Replace every id in `old` with `new`, placed where the first old id was (or at the end)"""
+    result, placed = [], False
+    for item in ids or []:
+        if item in old:
+            if not placed:
+                result.extend(new)
+                placed = True
+        else:
+            result.append(item)
+    if not placed:
+        result.extend(new)
+    return result
+
+class EpisodeRegenerationService:
+    """Regenerate one (month, week) episode of a stored journey and recompute what depends on it.
+
+    Only the period's conversations are replaced. Dependency tracking reads
+    the member's link columns (decision supporting/trigger conversations,
+    health event and metric conversation lists) and marks as stale exactly
+    the rows that reference a replaced conversation, or a decision of the
+    period when that decision is new. Everything else is left untouched.
+    LLM calls happen first; all writes then go through the ORM in one
+    transaction, so rollups and cached responses follow the usual hooks.
+    """
+
+    def episode_week(self, month: int) -> int:
+        """First journey week of a month's episode, as generate_8_month_journey numbers them"""
+        return (month - 1) * 4 + 1
+
+    def stale(self, db: Session, member_id: int, conversation_ids: Iterable[str],
+              decision_ids: Iterable[str] = ()) -> Dict[str, List[Any]]:
+        """Ids of the rows that reference any of the given conversations or decisions"""
+        conversation_ids, decision_ids = set(conversation_ids), set(decision_ids)
+
+        def refers(*lists) -> bool:
+            return any(item in conversation_ids for links in lists for item in (links or []))
+
+        stale: Dict[str, List[Any]] = {"decisions": [], "health_events": [], "metrics": [], "team_metrics": []}
+        for row in db.execute(select(Decision.id, Decision.triggered_by_conversation, Decision.supporting_conversations)
+                              .where(Decision.member_id == member_id)):
+            if refers([row.triggered_by_conversation], row.supporting_conversations):
+                stale["decisions"].append(row.id)
+        decision_ids |= set(stale["decisions"])
+        for row in db.execute(select(HealthEvent.id, HealthEvent.linked_conversations, HealthEvent.linked_decisions)
+                              .where(HealthEvent.member_id == member_id)):
+            if refers(row.linked_conversations) or any(item in decision_ids for item in row.linked_decisions or []):
+                stale["health_events"].append(row.id)
+        for row in db.execute(select(MemberMetrics.id, MemberMetrics.key_events).where(MemberMetrics.member_id == member_id)):
+            if refers(row.key_events):
+                stale["metrics"].append(row.id)
+        for row in db.execute(select(TeamMetrics.id, TeamMetrics.linked_conversations)
+                              .where(TeamMetrics.member_id == member_id)):
+            if refers(row.linked_conversations):
+                stale["team_metrics"].append(row.id)
+        return stale
+
+    def regenerate(self, db: Session, member_id: int, month: int, week_number: Optional[int] = None,
+                   conversations_text: Optional[str] = None) -> Dict[str, Any]:
+        """Replace one episode's conversations and recompute its dependents in a single commit.
+
+        `conversations_text` takes episode text in the LLM's output format;
+        without it the episode is generated again with Groq.
+        """
+        started = time.perf_counter()
+        member = db.query(Member).filter(Member.id == member_id).first()
+        if not member:
+            raise LookupError("Member not found")
+        member_data = member_payload(member)
+        week_number = week_number or self.episode_week(month)
+        travel_context = local_ai_service.get_travel_context(month)
+        tagging_engine.ensure_loaded(db)
+        team_roster.ensure_loaded(db)
+
+        if conversations_text is None:
+            result = local_ai_service.generate_episode_conversations(member_data, month, week_number, travel_context)
+            if not result["success"]:
+                raise ValueError(f"Failed to generate episode: {result['error']}")
+            conversations_text = result["episode_conversations"]
+
+        episode = {"month": month, "week_start": week_number, "travel_context": travel_context,
+                   "conversations": conversations_text}
+        conversations = journey_service.parse_conversations_from_journey({"episodes": [episode]}, member_id)
+        if not conversations:
+            raise ValueError("The episode text has no parseable conversations")
+        new_ids = [convo["id"] for convo in conversations]
+
+        old = db.query(Conversation).filter(Conversation.member_id == member_id, Conversation.month == month,
+                                            Conversation.week_number == week_number).all()
+        old_ids = {convo.id for convo in old}
+        stale = self.stale(db, member_id, old_ids)
+
+        # The period's decision keeps its id, so links to it elsewhere stay valid
+        period_decision = (db.query(Decision).filter(Decision.id.in_(stale["decisions"]), Decision.month == month,
+                                                     Decision.week_number == week_number).first()
+                           if stale["decisions"] else None)
+        decision_data = journey_service.build_decision(member_data, month, week_number, conversations)
+        if period_decision is not None:
+            decision_data["id"] = period_decision.id
+        if decision_data["ai_generated"]:
+            for convo in conversations:
+                convo["decision_impact"] = [decision_data["id"]]
+        index = journey_service.build_index(conversations, member_id)
+        team_metric = journey_service.generate_team_metrics_from_conversations(conversations, member_id, index)[0]
+
+        try:
+            for convo in old:
+                db.delete(convo)
+            db.add_all(Conversation(**convo) for convo in conversations)
+
+            if period_decision is None:
+                db.add(Decision(**decision_data))
+            else:
+                for name, value in decision_data.items():
+                    setattr(period_decision, name, value)
+
+            # Other decisions that drew on the replaced conversations only lose those links
+            for decision in db.query(Decision).filter(Decision.id.in_(stale["decisions"]),
+                                                      Decision.id != decision_data["id"]):
+                decision.supporting_conversations = [c for c in decision.supporting_conversations if c not in old_ids]
+                if decision.triggered_by_conversation in old_ids:
+                    decision.triggered_by_conversation = (decision.supporting_conversations or [None])[0]
+
+            if period_decision is None:
+                stale["health_events"] = list(dict.fromkeys(stale["health_events"] + [
+                    event_id for (event_id,) in db.query(HealthEvent.id).filter(HealthEvent.member_id == member_id,
+                                                                                HealthEvent.month == month)]))
+            for event in db.query(HealthEvent).filter(HealthEvent.id.in_(stale["health_events"])):
+                if old_ids & set(event.linked_conversations or []) or event.month == month:
+                    event.linked_conversations = splice(event.linked_conversations, old_ids, new_ids)
+                if decision_data["id"] not in (event.linked_decisions or []) and event.month == month:
+                    event.linked_decisions = [*(event.linked_decisions or []), decision_data["id"]]
+
+            for metric in db.query(MemberMetrics).filter(MemberMetrics.id.in_(stale["metrics"])):
+                metric.key_events = splice(metric.key_events, old_ids, new_ids)
+
+            # Team metrics are unique per period, so the period's row is updated even if it linked nothing stale
+            existing = db.query(TeamMetrics).filter(TeamMetrics.member_id == member_id, TeamMetrics.month == month,
+                                                    TeamMetrics.week_number == week_number).first()
+            if existing is None:
+                db.add(TeamMetrics(**team_metric))
+            else:
+                for name, value in team_metric.items():
+                    setattr(existing, name, value)
+            for metric in db.query(TeamMetrics).filter(TeamMetrics.id.in_(stale["team_metrics"])):
+                if metric is not existing:
+                    metric.linked_conversations = [c for c in metric.linked_conversations if c not in old_ids]
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        print(f"♻️  Regenerated member {member_id} month {month} week {week_number}: "
+              f"{len(old_ids)} → {len(new_ids)} conversations")
+        return {
+            "member_id": member_id,
+            "month": month,
+            "week_number": week_number,
+            "conversations_removed": len(old_ids),
+            "conversations_added": len(new_ids),
+            "decision_id": decision_data["id"],
+            "decision_created": period_decision is None,
+            "health_events_updated": len(stale["health_events"]),
+            "metrics_updated": len(stale["metrics"]),
+            "team_metrics_updated": len(stale["team_metrics"]),
+            "team_metric_created": existing is None,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+# Global episode regeneration service instance
+episode_regeneration_service = EpisodeRegenerationService()
@@ -0,0 +1,217 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Text, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.database import Conversation, Decision, DeletedRow, HealthEvent, MemberMetrics, TeamMetrics
+from app.services.dictionaries import dictionary_encoder, encoded_attributes
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+EXPORT_TABLES = {
+    "conversations": Conversation,
+    "decisions": Decision,
+    "health_events": HealthEvent,
+    "member_metrics": MemberMetrics,
+    "team_metrics": TeamMetrics,
+    # Tombstones of deleted journey rows, for dropping them from earlier exports
+    "deleted_rows": DeletedRow,
+}
+
+STATE_FILE = "_export_state.json"
+
+class CorpusExporter:
+    """Exports the journey corpus across all members to Parquet or Arrow IPC files.
+
+    Rows are streamed with `yield_per` and written one record batch at a time,
+    so memory is bounded by the batch size rather than the table size. Each run
+    exports the rows written (created, or updated in place) after the previous
+    run's watermark, up to now minus a safety lag that leaves room for
+    transactions still in flight, along with tombstones of the rows deleted in
+    that window. Files land in Hive-style `<table>/export_date=YYYY-MM-DD/`
+    partitions.
+    """
+
+    def __init__(self, batch_size: int = 10000, rows_per_file: int = 1000000,
+                 safety_lag: timedelta = timedelta(seconds=30)):
+        self.batch_size = batch_size
+        self.rows_per_file = rows_per_file
+        self.safety_lag = safety_lag
+
+    def _arrow_type(self, column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us", tz="UTC")
+        # Strings, text and JSON documents (kept as JSON text)
+        return pa.string()
+
+    def _columns(self, model) -> Dict[str, Any]:
+        """Exported columns of a model in table order, named for the strings behind dictionary codes"""
+        decoded = {code_key: name for name, (_, code_key) in encoded_attributes(model).items()}
+        return {decoded.get(column.key, column.name): column for column in model.__table__.columns}
+
+    def _projection(self, name: str, names: Optional[List[str]]):
+        """Selected columns and Arrow schema for one table, pruned to `names` when given.
+
+        Dictionary codes are selected as they are and decoded per batch.
+        """
+        model = EXPORT_TABLES[name]
+        available = self._columns(model)
+        encoded = encoded_attributes(model)
+        if names is None:
+            names = list(available)
+        unknown = set(names) - set(available)
+        if unknown:
+            raise ValueError(f"Unknown columns for {name}: {', '.join(sorted(unknown))}")
+
+        columns, fields = [], []
+        for column_name in names:
+            column = available[column_name]
+            fields.append(pa.field(column_name, pa.string() if column_name in encoded else self._arrow_type(column)))
+            # Export JSON as the stored text instead of decoding and re-encoding every document
+            columns.append((cast(column, Text) if isinstance(column.type, JSON) else column).label(column_name))
+        return columns, pa.schema(fields)
+
+    def _changed_at(self, model):
+        """When a row was last written: its update time, or its insert time if never updated"""
+        if "updated_at" in model.__table__.c:
+            return func.coalesce(model.updated_at, model.created_at)
+        return model.created_at
+
+    def _bound(self, dialect: str, value: datetime) -> datetime:
+        # SQLite stores CURRENT_TIMESTAMP as naive UTC text
+        return value.replace(tzinfo=None) if dialect == "sqlite" else value
+
+    def load_state(self, out_dir: str) -> Dict[str, str]:
+        path = os.path.join(out_dir, STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_state(self, out_dir: str, state: Dict[str, str]):
+        path = os.path.join(out_dir, STATE_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _open_writer(self, path: str, schema, fmt: str, compression: Optional[str]):
+        if fmt == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            return pa.ipc.new_file(path, schema, options=options)
+        return pq.ParquetWriter(path, schema, compression=compression or "none")
+
+    def export_table(self, db: Session, name: str, out_dir: str, names: Optional[List[str]] = None,
+                     low: Optional[datetime] = None, high: Optional[datetime] = None,
+                     fmt: str = "parquet", compression: Optional[str] = "zstd", run_id: str = "") -> Dict[str, Any]:
+        """Stream one table's rows written in (low, high] into partitioned files"""
+        model = EXPORT_TABLES[name]
+        columns, schema = self._projection(name, names)
+        encoded = [i for i, field in enumerate(schema) if field.name in encoded_attributes(model)]
+        dialect = db.get_bind().dialect.name
+
+        changed_at = self._changed_at(model)
+        stmt = select(*columns)
+        if low is not None:
+            stmt = stmt.where(changed_at > self._bound(dialect, low))
+        if high is not None:
+            upper = changed_at <= self._bound(dialect, high)
+            # A full export also picks up rows written before created_at was populated
+            stmt = stmt.where(upper if low is not None else or_(upper, changed_at.is_(None)))
+        stmt = stmt.order_by(changed_at)
+
+        partition_dir = os.path.join(out_dir, name, f"export_date={(high or datetime.now(timezone.utc)):%Y-%m-%d}")
+        extension = "arrow" if fmt == "arrow" else "parquet"
+        files, rows, writer, file_rows, path = [], 0, None, 0, None
+
+        try:
+            result = db.execute(stmt, execution_options={"yield_per": self.batch_size})
+            for partition in result.partitions():
+                if writer is None:
+                    os.makedirs(partition_dir, exist_ok=True)
+                    path = os.path.join(partition_dir, f"part-{run_id}-{len(files):05d}.{extension}")
+                    writer = self._open_writer(path + ".tmp", schema, fmt, compression)
+                    files.append(path)
+
+                values = list(zip(*partition))
+                if encoded:
+                    strings = dictionary_encoder.values(db, {code for i in encoded for code in values[i]})
+                    for i in encoded:
+                        values[i] = [strings.get(code) for code in values[i]]
+                arrays = [pa.array(values[i], type=field.type) for i, field in enumerate(schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows += len(partition)
+                file_rows += len(partition)
+
+                if file_rows >= self.rows_per_file:
+                    writer.close()
+                    os.replace(path + ".tmp", path)
+                    writer, file_rows = None, 0
+        except Exception:
+            # Leave nothing behind: the watermark is not advanced, so the next run redoes this table
+            if writer is not None:
+                writer.close()
+                os.remove(path + ".tmp")
+                files.pop()
+            for finished in files:
+                os.remove(finished)
+            raise
+
+        if writer is not None:
+            writer.close()
+            os.replace(path + ".tmp", path)
+
+        return {"rows": rows, "files": files}
+
+    def export(self, db: Session, out_dir: str, tables: Optional[List[str]] = None,
+               columns: Optional[Dict[str, List[str]]] = None, fmt: str = "parquet",
+               compression: Optional[str] = "zstd", since: Optional[datetime] = None,
+               full: bool = False) -> Dict[str, Any]:
+        """Export each table since its stored watermark (or `since`), then advance the watermark"""
+        if pa is None:
+            raise RuntimeError("pyarrow is required for corpus exports: pip install pyarrow")
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        tables = tables or list(EXPORT_TABLES)
+        unknown = set(tables) - set(EXPORT_TABLES)
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+        columns = columns or {}
+
+        os.makedirs(out_dir, exist_ok=True)
+        state = self.load_state(out_dir)
+        # Stop just short of a whole second: created_at may only have second resolution,
+        # and rows stamped with the current second can still be committing
+        high = (datetime.now(timezone.utc) - self.safety_lag).replace(microsecond=0) - timedelta(microseconds=1)
+        run_id = high.strftime("%Y%m%dT%H%M%SZ")
+
+        summary = {}
+        for name in tables:
+            low = None
+            if not full:
+                low = since or (datetime.fromisoformat(state[name]) if name in state else None)
+            print(f"📤 Exporting {name} ({'full' if low is None else f'since {low.isoformat()}'})...")
+            summary[name] = self.export_table(db, name, out_dir, columns.get(name), low, high, fmt, compression, run_id)
+            # Advance the watermark only once the table's files are complete
+            state[name] = high.isoformat()
+            self._save_state(out_dir, state)
+            print(f"✅ {name}: {summary[name]['rows']} rows in {len(summary[name]['files'])} file(s)")
+
+        return {"watermark": high.isoformat(), "tables": summary}
+
+# Global corpus exporter instance
+corpus_exporter = CorpusExporter()
@@ -0,0 +1,65 @@
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Period = Tuple[int, int]
+
+class JourneyIndex:
+    """Buckets of one journey's conversations and decisions, built once per generation.
+
+    Conversations are bucketed by month and (month, week) period up front,
+    and decisions by month as they are added. The derivation stages look
+    their links up here instead of rescanning the full lists for
+    every test, plan change and episode, so linking cost is linear in the
+    journey size. Buckets keep the input order, and periods keep the order
+    of their first conversation, which is how the stages grouped before.
+    """
+
+    def __init__(self, conversations: Iterable[Dict[str, Any]],
+                 role_of: Optional[Callable[[Dict[str, Any]], str]] = None):
+        self._role_of = role_of or (lambda convo: convo["role"])
+        self._by_month: Dict[int, List[Dict[str, Any]]] = {}
+        self._by_period: Dict[Period, List[Dict[str, Any]]] = {}
+        self._role_counts: Dict[Period, Counter] = {}
+        self._decisions_by_month: Dict[int, List[Dict[str, Any]]] = {}
+        self._ids: Dict[Tuple[str, Any], List[str]] = {}
+
+        for convo in conversations:
+            self._by_month.setdefault(convo["month"], []).append(convo)
+            self._by_period.setdefault((convo["month"], convo["week_number"]), []).append(convo)
+
+    def add_decisions(self, decisions: Iterable[Dict[str, Any]]):
+        for decision in decisions:
+            self._decisions_by_month.setdefault(decision["month"], []).append(decision)
+        self._ids = {key: ids for key, ids in self._ids.items() if key[0] != "decisions"}
+
+    def periods(self) -> List[Tuple[Period, List[Dict[str, Any]]]]:
+        return list(self._by_period.items())
+
+    def in_month(self, month: int) -> List[Dict[str, Any]]:
+        return self._by_month.get(month, [])
+
+    def in_period(self, month: int, week: int) -> List[Dict[str, Any]]:
+        return self._by_period.get((month, week), [])
+
+    def role_counts(self, month: int, week: int) -> Counter:
+        """Messages per role in a period"""
+        key = (month, week)
+        if key not in self._role_counts:
+            self._role_counts[key] = Counter(map(self._role_of, self.in_period(month, week)))
+        return self._role_counts[key]
+
+    def decisions_in_month(self, month: int) -> List[Dict[str, Any]]:
+        return self._decisions_by_month.get(month, [])
+
+    def conversation_ids_in_month(self, month: int) -> List[str]:
+        """Ids of a month's conversations; built once and shared, so callers must copy before mutating"""
+        key = ("conversations", month)
+        if key not in self._ids:
+            self._ids[key] = [convo["id"] for convo in self.in_month(month)]
+        return self._ids[key]
+
+    def decision_ids_in_month(self, month: int) -> List[str]:
+        key = ("decisions", month)
+        if key not in self._ids:
+            self._ids[key] = [decision["id"] for decision in self.decisions_in_month(month)]
+        return self._ids[key]
@@ -1,51 +1,113 @@
 import os
 import json
 import uuid
-from typing import Dict, Any, List, Optional
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.models.database import (
     Member, Conversation, HealthEvent, Decision, 
     MemberMetrics, TeamMetrics, AIPrompt, AIGenerationLog
 )
+from app.services.dictionaries import dictionary_encoder
+from app.services.journey_index import JourneyIndex
 from app.services.local_ai_service import local_ai_service
+from app.services.metrics import GENERATION_JOURNEYS, GENERATION_ROWS, GENERATION_STAGE_SECONDS
+from app.services.rollup_service import rollup_service
+from app.services.roster import team_roster
+from app.services.tagging import tagging_engine
+from app.services.timestamps import to_epoch, datetime_to_epoch
+from app.services.tombstones import delete_recorded
+from app.services.upserts import content_id, upsert
 
 class JourneyService:
+    """Generate member journeys and derive the records stored with them.
+
+    The parse, role, tag, index, decision and team metric builders are
+    public and work on any subset of episodes or periods. Episode
+    regeneration and the synthetic data generator call them, so every
+    write path derives rows the same way.
+    """
+
     def __init__(self):
         self.local_ai = local_ai_service
     
     def generate_and_store_journey(self, member_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
-        """Generate complete 8-month journey and store in database"""
+        """Generate complete 8-month journey and store in database.
+
+        Rows are keyed by content (see upserts.content_id) and upserted, so
+        rerunning a member replaces their journey instead of duplicating it:
+        every row is stamped with the run's id, and rows of the regenerated
+        months that carry an older stamp are superseded. All LLM calls finish
+        before the single write transaction.
+        """
         try:
             print(f"🚀 Generating journey for member {member_data.get('id')}")
+            tagging_engine.ensure_loaded(db)
+            team_roster.ensure_loaded(db)
             
             # Generate the journey using local AI
-            journey_result = self.local_ai.generate_8_month_journey(member_data)
+            with GENERATION_STAGE_SECONDS.labels("llm").time():
+                journey_result = self.local_ai.generate_8_month_journey(member_data)
             
             if not journey_result["success"]:
                 raise ValueError(f"Failed to generate journey: {journey_result['error']}")
             
             journey_data = journey_result["journey_data"]
             
-            # Parse and store conversations
-            conversations = self._parse_conversations_from_journey(journey_data, member_data["id"])
-            stored_conversations = self._store_conversations(conversations, db)
+            # Parse conversations
+            with GENERATION_STAGE_SECONDS.labels("parse").time():
+                conversations = self.parse_conversations_from_journey(journey_data, member_data["id"])
+                index = self.build_index(conversations, member_data["id"])
+            
+            # Generate decisions
+            with GENERATION_STAGE_SECONDS.labels("decisions").time():
+                decisions = self._generate_decisions_from_conversations(conversations, member_data, index)
+                index.add_decisions(decisions)
             
-            # Generate and store decisions
-            decisions = self._generate_decisions_from_conversations(stored_conversations, member_data, db)
+            # Generate health events
+            with GENERATION_STAGE_SECONDS.labels("health_events").time():
+                health_events = self._generate_health_events_from_journey(journey_data, conversations, decisions,
+                                                                          member_data["id"], index)
             
-            # Generate and store health events
-            health_events = self._generate_health_events_from_journey(journey_data, stored_conversations, decisions, member_data["id"])
-            self._store_health_events(health_events, db)
+            # Generate metrics
+            with GENERATION_STAGE_SECONDS.labels("member_metrics").time():
+                metrics = self._generate_metrics_from_journey(journey_data, conversations, decisions,
+                                                              member_data["id"], index)
             
-            # Generate and store metrics
-            metrics = self._generate_metrics_from_journey(journey_data, stored_conversations, decisions, member_data["id"])
-            self._store_metrics(metrics, db)
+            # Generate team metrics
+            with GENERATION_STAGE_SECONDS.labels("team_metrics").time():
+                team_metrics = self.generate_team_metrics_from_conversations(conversations, member_data["id"], index)
             
-            # Generate and store team metrics
-            team_metrics = self._generate_team_metrics_from_conversations(stored_conversations, member_data["id"])
-            self._store_team_metrics(team_metrics, db)
+            # Store everything in one transaction, stamped with this run
+            run_id = str(uuid.uuid4())
+            for row in (*conversations, *decisions, *health_events, *metrics, *team_metrics):
+                row["run_id"] = run_id
+            try:
+                with GENERATION_STAGE_SECONDS.labels("store").time():
+                    stored_conversations = self._store_conversations(conversations, db)
+                    self._store_decisions(decisions, db)
+                    self._store_health_events(health_events, db)
+                    self._store_metrics(metrics, db)
+                    self._store_team_metrics(team_metrics, db)
+                    months = {convo["month"] for convo in conversations} | {metric["month"] for metric in metrics}
+                    superseded = self._supersede_earlier_runs(db, member_data["id"], months, run_id, {
+                        Conversation: conversations, Decision: decisions, HealthEvent: health_events,
+                        MemberMetrics: metrics, TeamMetrics: team_metrics,
+                    })
+                with GENERATION_STAGE_SECONDS.labels("rollups").time():
+                    rollup_service.rebuild(db, [member_data["id"]])
+                    db.commit()
+            except Exception:
+                db.rollback()
+                raise
             
+            for stage, rows in (("conversations", len(stored_conversations)), ("decisions", len(decisions)),
+                                ("health_events", len(health_events)), ("member_metrics", len(metrics)),
+                                ("team_metrics", len(team_metrics)), ("superseded", superseded)):
+                GENERATION_ROWS.labels(stage).inc(rows)
+            GENERATION_JOURNEYS.labels("success").inc()
             print(f"✅ Journey generated and stored successfully")
             
             return {
@@ -58,13 +120,25 @@ class JourneyService:
             }
             
         except Exception as e:
+            GENERATION_JOURNEYS.labels("failure").inc()
             print(f"❌ Error generating journey: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def _parse_conversations_from_journey(self, journey_data: Dict[str, Any], member_id: int) -> List[Dict[str, Any]]:
+    def build_index(self, conversations: List[Dict[str, Any]], member_id: int,
+                     decisions: Optional[List[Dict[str, Any]]] = None) -> JourneyIndex:
+        """Index a journey's conversations (and decisions) for the derivation stages"""
+        # Roles follow the current roster, so corrected names count for the right role
+        resolve = team_roster.compiled.role
+        index = JourneyIndex(conversations,
+                             lambda convo: resolve(convo["sender"], member_id) if convo.get("sender") else convo["role"])
+        if decisions:
+            index.add_decisions(decisions)
+        return index
+    
+    def parse_conversations_from_journey(self, journey_data: Dict[str, Any], member_id: int) -> List[Dict[str, Any]]:
         """Parse conversations from the generated journey data"""
         conversations = []
         
@@ -75,7 +149,7 @@ class JourneyService:
             
             # Parse the generated conversations text
             episode_conversations = episode.get("conversations", "")
-            parsed_convos = self._parse_conversation_text(episode_conversations, month, week_start, travel_context)
+            parsed_convos = self.parse_conversation_text(episode_conversations, month, week_start, travel_context, member_id)
             
             for convo in parsed_convos:
                 convo["member_id"] = member_id
@@ -86,9 +160,12 @@ class JourneyService:
         
         return conversations
     
-    def _parse_conversation_text(self, conversation_text: str, month: int, week_start: int, travel_context: str) -> List[Dict[str, Any]]:
+    def parse_conversation_text(self, conversation_text: str, month: int, week_start: int, travel_context: str,
+                                 member_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Parse the AI-generated conversation text into structured conversations"""
         conversations = []
+        # Repeats of a message within the period ("Thanks!") are distinct rows with distinct keys
+        occurrences = Counter()
         
         # Split by lines and parse each message
         lines = conversation_text.split('\n')
@@ -106,19 +183,22 @@ class JourneyService:
                 message = message_part.strip()
                 
                 # Determine role based on sender
-                role = self._determine_role(sender)
+                role = self.determine_role(sender, member_id)
                 
                 # Generate realistic date and time
                 message_date = current_date + timedelta(days=i//2, hours=i%12)
                 
+                occurrences[(sender, message)] += 1
                 conversation = {
-                    "id": str(uuid.uuid4()),
+                    "id": content_id("conversation", member_id, month, week_start, sender, message,
+                                     occurrences[(sender, message)]),
                     "date": message_date.strftime("%Y-%m-%d"),
                     "time": message_date.strftime("%H:%M"),
+                    "occurred_at": datetime_to_epoch(message_date),
                     "sender": sender,
                     "role": role,
                     "text": message,
-                    "tags": self._generate_tags_for_message(message, month, week_start),
+                    "tags": None,
                     "relates_to": None,
                     "ai_generated": True,
                     "ai_model": "groq",
@@ -128,202 +208,139 @@ class JourneyService:
                 
                 conversations.append(conversation)
         
+        # Tag the whole episode in one pass over the compiled taxonomy
+        batch_tags = tagging_engine.tags_batch([(c["text"], month, week_start) for c in conversations])
+        for conversation, tags in zip(conversations, batch_tags):
+            conversation["tags"] = tags
+        
         return conversations
     
-    def _determine_role(self, sender: str) -> str:
-        """Determine the role of the sender"""
-        sender_lower = sender.lower()
-        
-        if "rohan" in sender_lower or "patel" in sender_lower:
-            return "member"
-        elif "dr." in sender_lower or "warren" in sender_lower:
-            return "doctor"
-        elif "ruby" in sender_lower:
-            return "concierge"
-        elif "carla" in sender_lower:
-            return "nutritionist"
-        elif "rachel" in sender_lower:
-            return "coach"
-        elif "advik" in sender_lower:
-            return "data_analyst"
-        elif "neel" in sender_lower:
-            return "strategist"
-        else:
-            return "team_member"
+    def determine_role(self, sender: str, member_id: Optional[int] = None) -> str:
+        """Determine the role of the sender from the team roster"""
+        return team_roster.role(sender, member_id)
     
-    def _generate_tags_for_message(self, message: str, month: int, week_start: int) -> List[str]:
+    def generate_tags_for_message(self, message: str, month: int, week_start: int) -> List[str]:
         """Generate tags for message categorization"""
-        tags = []
-        message_lower = message.lower()
-        
-        # Month-based tags
-        tags.append(f"month_{month}")
-        tags.append(f"week_{week_start}")
-        
-        # Content-based tags
-        if any(word in message_lower for word in ["test", "diagnostic", "panel"]):
-            tags.extend(["diagnostic", "medical"])
-        if any(word in message_lower for word in ["exercise", "workout", "training"]):
-            tags.extend(["exercise", "fitness"])
-        if any(word in message_lower for word in ["nutrition", "diet", "food"]):
-            tags.extend(["nutrition", "diet"])
-        if any(word in message_lower for word in ["travel", "trip", "flight"]):
-            tags.extend(["travel", "scheduling"])
-        if any(word in message_lower for word in ["progress", "improvement", "results"]):
-            tags.extend(["progress", "results"])
-        
-        return tags
+        return tagging_engine.tags(message, month, week_start)
     
     def _store_conversations(self, conversations: List[Dict[str, Any]], db: Session) -> List[Dict[str, Any]]:
-        """Store conversations in the database"""
-        stored_conversations = []
-        
-        for convo_data in conversations:
-            try:
-                # Create conversation object
-                conversation = Conversation(**convo_data)
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
-                
-                stored_conversations.append(convo_data)
-                
-            except Exception as e:
-                print(f"⚠️  Failed to store conversation: {e}")
-                db.rollback()
+        """Upsert conversations by their content key; the caller commits"""
+        upsert(db, Conversation, dictionary_encoder.encode_rows(db, Conversation, conversations))
+        return conversations
+    
+    def _store_decisions(self, decisions: List[Dict[str, Any]], db: Session):
+        """Upsert decisions by their (member, period) key; the caller commits"""
+        upsert(db, Decision, decisions)
+    
+    def _supersede_earlier_runs(self, db: Session, member_id: int, months: Set[int], run_id: str,
+                                written: Dict[Any, List[Dict[str, Any]]]) -> int:
+        """Delete the member's rows in `months` that this run did not write.
+
+        Every row the run upserted carries its `run_id`, so the rows left
+        over are the ones stamped by an earlier run (or before stamping),
+        whatever their number. A table the run wrote no rows to is left
+        alone rather than emptied for those months. Deleted rows leave
+        tombstones for incremental exports.
+        """
+        if not months:
+            return 0
+        removed = 0
+        for model, rows in written.items():
+            if not rows:
                 continue
-        
-        return stored_conversations
+            removed += delete_recorded(db, model, model.member_id == member_id, model.month.in_(months),
+                                       or_(model.run_id.is_(None), model.run_id != run_id))
+        if removed:
+            print(f"♻️  Superseded {removed} rows from earlier runs of member {member_id}")
+        return removed
     
     def _generate_decisions_from_conversations(self, conversations: List[Dict[str, Any]], 
-                                            member_data: Dict[str, Any], db: Session) -> List[Dict[str, Any]]:
+                                            member_data: Dict[str, Any],
+                                            index: Optional[JourneyIndex] = None) -> List[Dict[str, Any]]:
         """Generate decisions based on conversations"""
         decisions = []
+        index = index or self.build_index(conversations, member_data["id"])
         
         print(f"🔍 Generating decisions from {len(conversations)} conversations...")
         
-        # Group conversations by month and week
-        conversations_by_period = {}
-        for convo in conversations:
-            key = (convo["month"], convo["week_number"])
-            if key not in conversations_by_period:
-                conversations_by_period[key] = []
-            conversations_by_period[key].append(convo)
-        
-        print(f"📅 Found {len(conversations_by_period)} conversation periods")
+        periods = index.periods()
+        print(f"📅 Found {len(periods)} conversation periods")
         
         # Generate decisions for each period
-        for (month, week), period_conversations in conversations_by_period.items():
+        for (month, week), period_conversations in periods:
             print(f"🤖 Generating decision for Month {month} Week {week}...")
+            decision_data = self.build_decision(member_data, month, week, period_conversations)
+            label = "Decision" if decision_data["ai_generated"] else "Fallback decision"
+            decisions.append(decision_data)
+            print(f"✅ {label} generated for Month {month} Week {week}")
             
-            # Generate health decisions using local AI
-            decision_result = self.local_ai.generate_health_decision(
-                member_data, period_conversations, {"month": month, "week": week}
-            )
-            
-            if decision_result["success"]:
-                decision_data = {
-                    "id": str(uuid.uuid4()),
-                    "member_id": member_data["id"],
-                    "date": period_conversations[0]["date"],
-                    "title": f"Month {month} Week {week} Health Decision",
-                    "reason": decision_result["decision"],
-                    "decision_type": self._determine_decision_type(period_conversations),
-                    "month": month,
-                    "week_number": week,
-                    "triggered_by_conversation": period_conversations[0]["id"],
-                    "supporting_conversations": [c["id"] for c in period_conversations],
-                    "effects": [],
-                    "ai_generated": True,
-                    "ai_reasoning": decision_result.get("reasoning", ""),
-                    "confidence_score": decision_result.get("confidence_score", 0.85)
-                }
-                
-                # Store decision
-                try:
-                    decision = Decision(**decision_data)
-                    db.add(decision)
-                    db.commit()
-                    db.refresh(decision)
-                    
-                    decisions.append(decision_data)
-                    print(f"✅ Decision stored for Month {month} Week {week}")
-                    
-                    # Update conversations with decision impact
-                    for convo in period_conversations:
-                        if convo.get("decision_impact") is None:
-                            convo["decision_impact"] = []
-                        convo["decision_impact"].append(decision_data["id"])
-                    
-                except Exception as e:
-                    print(f"⚠️  Failed to store decision: {e}")
-                    db.rollback()
-                    continue
-            else:
-                print(f"⚠️  Failed to generate decision for Month {month} Week {week}: {decision_result.get('error', 'Unknown error')}")
-                # Create a simple fallback decision
-                fallback_decision = {
-                    "id": str(uuid.uuid4()),
-                    "member_id": member_data["id"],
-                    "date": period_conversations[0]["date"],
-                    "title": f"Month {month} Week {week} Health Decision",
-                    "reason": f"Health optimization decision based on {len(period_conversations)} conversations",
-                    "decision_type": self._determine_decision_type(period_conversations),
-                    "month": month,
-                    "week_number": week,
-                    "triggered_by_conversation": period_conversations[0]["id"],
-                    "supporting_conversations": [c["id"] for c in period_conversations],
-                    "effects": [],
-                    "ai_generated": False,
-                    "ai_reasoning": "Fallback decision due to AI generation failure",
-                    "confidence_score": 0.5
-                }
-                
-                try:
-                    decision = Decision(**fallback_decision)
-                    db.add(decision)
-                    db.commit()
-                    db.refresh(decision)
-                    
-                    decisions.append(fallback_decision)
-                    print(f"✅ Fallback decision stored for Month {month} Week {week}")
-                    
-                except Exception as e:
-                    print(f"⚠️  Failed to store fallback decision: {e}")
-                    db.rollback()
-                    continue
+            # Update conversations with decision impact
+            if decision_data["ai_generated"]:
+                for convo in period_conversations:
+                    if convo.get("decision_impact") is None:
+                        convo["decision_impact"] = []
+                    convo["decision_impact"].append(decision_data["id"])
         
         print(f"🎯 Generated {len(decisions)} decisions total")
         return decisions
     
-    def _determine_decision_type(self, conversations: List[Dict[str, Any]]) -> str:
-        """Determine the type of decision based on conversations"""
-        all_text = " ".join([c["text"].lower() for c in conversations])
+    def build_decision(self, member_data: Dict[str, Any], month: int, week: int,
+                        period_conversations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Decision row for one period, from the LLM or a fallback when generation fails"""
+        decision_result = self.local_ai.generate_health_decision(
+            member_data, period_conversations, {"month": month, "week": week}
+        )
+        
+        decision_data = {
+            "id": content_id("decision", member_data["id"], month, week),
+            "member_id": member_data["id"],
+            "date": period_conversations[0]["date"],
+            "occurred_at": to_epoch(period_conversations[0]["date"]),
+            "title": f"Month {month} Week {week} Health Decision",
+            "decision_type": self.determine_decision_type(period_conversations),
+            "month": month,
+            "week_number": week,
+            "triggered_by_conversation": period_conversations[0]["id"],
+            "supporting_conversations": [c["id"] for c in period_conversations],
+            "effects": []
+        }
         
-        if any(word in all_text for word in ["test", "diagnostic", "panel"]):
-            return "diagnostic_test"
-        elif any(word in all_text for word in ["exercise", "workout", "training"]):
-            return "exercise_plan"
-        elif any(word in all_text for word in ["nutrition", "diet", "food"]):
-            return "nutrition_plan"
-        elif any(word in all_text for word in ["medication", "supplement", "vitamin"]):
-            return "medication"
+        if decision_result["success"]:
+            decision_data.update({
+                "reason": decision_result["decision"],
+                "ai_generated": True,
+                "ai_reasoning": decision_result.get("reasoning", ""),
+                "confidence_score": decision_result.get("confidence_score", 0.85)
+            })
         else:
-            return "general_health"
+            print(f"⚠️  Failed to generate decision for Month {month} Week {week}: {decision_result.get('error', 'Unknown error')}")
+            decision_data.update({
+                "reason": f"Health optimization decision based on {len(period_conversations)} conversations",
+                "ai_generated": False,
+                "ai_reasoning": "Fallback decision due to AI generation failure",
+                "confidence_score": 0.5
+            })
+        return decision_data
+    
+    def determine_decision_type(self, conversations: List[Dict[str, Any]]) -> str:
+        """Determine the type of decision based on conversations"""
+        return tagging_engine.decision_type(c["text"] for c in conversations)
     
     def _generate_health_events_from_journey(self, journey_data: Dict[str, Any], 
                                            conversations: List[Dict[str, Any]], 
                                            decisions: List[Dict[str, Any]], 
-                                           member_id: int) -> List[Dict[str, Any]]:
+                                           member_id: int, index: Optional[JourneyIndex] = None) -> List[Dict[str, Any]]:
         """Generate health events from the journey data"""
         events = []
+        index = index or self.build_index(conversations, member_id, decisions)
         
         # Diagnostic tests
         for test in journey_data.get("diagnostic_tests", []):
             event_data = {
-                "id": str(uuid.uuid4()),
+                "id": content_id("health_event", member_id, "diagnostic_test", test["month"], test["week"]),
                 "member_id": member_id,
                 "date": self._calculate_date_for_month_week(test["month"], test["week"]),
+                "occurred_at": to_epoch(self._calculate_date_for_month_week(test["month"], test["week"])),
                 "event_type": "diagnostic_test",
                 "title": f"Month {test['month']} Diagnostic Panel",
                 "details": {
@@ -334,8 +351,8 @@ class JourneyService:
                 },
                 "month": test["month"],
                 "week_number": test["week"],
-                "linked_conversations": [c["id"] for c in conversations if c["month"] == test["month"]],
-                "linked_decisions": [d["id"] for d in decisions if d["month"] == test["month"]],
+                "linked_conversations": list(index.conversation_ids_in_month(test["month"])),
+                "linked_decisions": list(index.decision_ids_in_month(test["month"])),
                 "ai_generated": True,
                 "ai_context": "Scheduled diagnostic test based on journey timeline"
             }
@@ -344,9 +361,10 @@ class JourneyService:
         # Plan modifications
         for mod in journey_data.get("plan_modifications", []):
             event_data = {
-                "id": str(uuid.uuid4()),
+                "id": content_id("health_event", member_id, "plan_modification", mod["month"], mod["week"]),
                 "member_id": member_id,
                 "date": self._calculate_date_for_month_week(mod["month"], mod["week"]),
+                "occurred_at": to_epoch(self._calculate_date_for_month_week(mod["month"], mod["week"])),
                 "event_type": "plan_modification",
                 "title": f"Month {mod['month']} Plan Update",
                 "details": {
@@ -357,8 +375,8 @@ class JourneyService:
                 },
                 "month": mod["month"],
                 "week_number": mod["week"],
-                "linked_conversations": [c["id"] for c in conversations if c["month"] == mod["month"]],
-                "linked_decisions": [d["id"] for d in decisions if d["month"] == mod["month"]],
+                "linked_conversations": list(index.conversation_ids_in_month(mod["month"])),
+                "linked_decisions": list(index.decision_ids_in_month(mod["month"])),
                 "ai_generated": True,
                 "ai_context": "Plan modification based on progress and travel constraints"
             }
@@ -373,23 +391,16 @@ class JourneyService:
         return week_date.strftime("%Y-%m-%d")
     
     def _store_health_events(self, events: List[Dict[str, Any]], db: Session):
-        """Store health events in the database"""
-        for event_data in events:
-            try:
-                event = HealthEvent(**event_data)
-                db.add(event)
-                db.commit()
-            except Exception as e:
-                print(f"⚠️  Failed to store health event: {e}")
-                db.rollback()
-                continue
+        """Upsert health events by their (member, type, period) key; the caller commits"""
+        upsert(db, HealthEvent, dictionary_encoder.encode_rows(db, HealthEvent, events))
     
     def _generate_metrics_from_journey(self, journey_data: Dict[str, Any], 
                                      conversations: List[Dict[str, Any]], 
                                      decisions: List[Dict[str, Any]], 
-                                     member_id: int) -> List[Dict[str, Any]]:
+                                     member_id: int, index: Optional[JourneyIndex] = None) -> List[Dict[str, Any]]:
         """Generate member metrics from the journey"""
         metrics = []
+        index = index or self.build_index(conversations, member_id, decisions)
         
         for episode in journey_data.get("episodes", []):
             month = episode.get("month", 1)
@@ -402,11 +413,12 @@ class JourneyService:
                 "member_id": member_id,
                 "week_start": self._calculate_date_for_month_week(month, week_start),
                 "week_end": self._calculate_date_for_month_week(month, week_start + 3),
+                "week_start_at": to_epoch(self._calculate_date_for_month_week(month, week_start)),
                 "month": month,
                 "week_number": week_start,
                 "adherence_estimate": adherence,
                 "hours_committed": adherence * 10,  # 10 hours per week target
-                "key_events": [c["id"] for c in conversations if c["month"] == month],
+                "key_events": list(index.conversation_ids_in_month(month)),
                 "notes": f"Month {month} progress tracking",
                 "ai_insights": f"Adherence pattern shows {adherence:.1%} commitment level"
             }
@@ -415,48 +427,25 @@ class JourneyService:
         return metrics
     
     def _store_metrics(self, metrics: List[Dict[str, Any]], db: Session):
-        """Store metrics in the database"""
-        for metric_data in metrics:
-            try:
-                metric = MemberMetrics(**metric_data)
-                db.add(metric)
-                db.commit()
-            except Exception as e:
-                print(f"⚠️  Failed to store metric: {e}")
-                db.rollback()
-                continue
+        """Upsert member metrics on their (member, month, week) key; the caller commits"""
+        upsert(db, MemberMetrics, metrics, ("member_id", "month", "week_number"))
     
-    def _generate_team_metrics_from_conversations(self, conversations: List[Dict[str, Any]], 
-                                                member_id: int) -> List[Dict[str, Any]]:
+    def generate_team_metrics_from_conversations(self, conversations: List[Dict[str, Any]], 
+                                                member_id: int, index: Optional[JourneyIndex] = None) -> List[Dict[str, Any]]:
         """Generate team metrics from conversations"""
         team_metrics = []
+        index = index or self.build_index(conversations, member_id)
         
-        # Group by month and week
-        conversations_by_period = {}
-        for convo in conversations:
-            key = (convo["month"], convo["week_number"])
-            if key not in conversations_by_period:
-                conversations_by_period[key] = []
-            conversations_by_period[key].append(convo)
-        
-        for (month, week), period_conversations in conversations_by_period.items():
-            # Calculate hours based on role and message count
-            role_hours = {
-                "doctor": 0.0,
-                "coach": 0.0,
-                "nutritionist": 0.0,
-                "physio": 0.0,
-                "concierge": 0.0
-            }
-            
-            for convo in period_conversations:
-                role = convo["role"]
-                if role in role_hours:
-                    role_hours[role] += 0.25  # 15 minutes per message
+        for (month, week), period_conversations in index.periods():
+            # Calculate hours based on role and message count (15 minutes per message)
+            role_counts = index.role_counts(month, week)
+            role_hours = {role: role_counts[role] * 0.25
+                          for role in ("doctor", "coach", "nutritionist", "physio", "concierge")}
             
             metric_data = {
                 "member_id": member_id,
                 "date": period_conversations[0]["date"],
+                "occurred_at": to_epoch(period_conversations[0]["date"]),
                 "month": month,
                 "week_number": week,
                 "doctor_hours": role_hours["doctor"],
@@ -473,16 +462,8 @@ class JourneyService:
         return team_metrics
     
     def _store_team_metrics(self, team_metrics: List[Dict[str, Any]], db: Session):
-        """Store team metrics in the database"""
-        for metric_data in team_metrics:
-            try:
-                metric = TeamMetrics(**metric_data)
-                db.add(metric)
-                db.commit()
-            except Exception as e:
-                print(f"⚠️  Failed to store team metric: {e}")
-                db.rollback()
-                continue
+        """Upsert team metrics on their (member, month, week) key; the caller commits"""
+        upsert(db, TeamMetrics, team_metrics, ("member_id", "month", "week_number"))
 
 # Global journey service instance
 journey_service = JourneyService()
@@ -4,6 +4,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import requests
 from dotenv import load_dotenv
+from app.services.metrics import (LLM_RATE_LIMIT_WAIT_SECONDS, LLM_REQUEST_SECONDS, LLM_REQUESTS, LLM_RETRIES,
+                                  LLM_TOKENS)
+from app.services.rate_limiter import TokenBucket
 
 load_dotenv()
 
@@ -11,6 +14,11 @@ class LocalAIService:
     def __init__(self):
        self.groq_api_key = os.getenv("GROQ_API_KEY")
        self.groq_base_url = "https://api.groq.com/openai/v1"
+       # Shared by every thread generating journeys, so batch runs stay inside the API quota
+       self.rate_limiter = TokenBucket(
+           rate_per_minute=float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+           burst=int(os.getenv("GROQ_REQUEST_BURST", "3"))
+       )
        self._initialize_groq()
         
     def _initialize_groq(self):
@@ -231,8 +239,6 @@ class LocalAIService:
     
     def generate_8_month_journey(self, member_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate complete 8-month journey with episode-specific conversations"""
-        import time
-        
         try:
             if not self.groq_api_key:
                 raise ValueError("Groq not available")
@@ -250,7 +256,7 @@ class LocalAIService:
             # Generate each month's episode
             for month in range(1, 9):
                 week_start = ((month - 1) * 4) + 1
-                travel_context = self._get_travel_context(month)
+                travel_context = self.get_travel_context(month)
                 
                 episode_result = self.generate_episode_conversations(
                     member_data, month, week_start, travel_context
@@ -284,11 +290,6 @@ class LocalAIService:
                     journey_data["total_conversations"] += 20  # ~5 per week
                 else:
                     print(f"⚠️  Failed to generate episode {month}: {episode_result['error']}")
-                
-                # Add delay between episodes to avoid rate limiting
-                if month < 8:
-                    print(f"⏳ Waiting 2 seconds before generating episode {month + 1}...")
-                    time.sleep(2)
             
             return {
                 "success": True,
@@ -309,6 +310,7 @@ class LocalAIService:
         
         max_retries = 3
         base_delay = 1
+        model = "llama3-8b-8192"
         
         for attempt in range(max_retries):
             try:
@@ -328,7 +330,7 @@ Generate realistic, conversational responses that maintain character consistency
                 }
                 
                 payload = {
-                    "model": "llama3-8b-8192",
+                    "model": model,
                     "messages": [
                         {
                             "role": "user",
@@ -339,27 +341,39 @@ Generate realistic, conversational responses that maintain character consistency
                     "max_tokens": 1000
                 }
                 
-                response = requests.post(f"{self.groq_base_url}/chat/completions", headers=headers, json=payload)
+                # Pace requests through the shared limiter instead of fixed sleeps
+                LLM_RATE_LIMIT_WAIT_SECONDS.observe(self.rate_limiter.acquire())
+                with LLM_REQUEST_SECONDS.labels(model).time():
+                    response = requests.post(f"{self.groq_base_url}/chat/completions", headers=headers, json=payload)
                 
                 if response.status_code == 200:
                     data = response.json()
+                    LLM_REQUESTS.labels(model, "success").inc()
+                    usage = data.get("usage") or {}
+                    LLM_TOKENS.labels(model, "prompt").inc(usage.get("prompt_tokens", 0))
+                    LLM_TOKENS.labels(model, "completion").inc(usage.get("completion_tokens", 0))
                     return data['choices'][0]['message']['content'].strip()
                 elif response.status_code == 429:  # Rate limit
+                    LLM_REQUESTS.labels(model, "rate_limited").inc()
                     if attempt < max_retries - 1:
                         delay = base_delay * (2 ** attempt)  # Exponential backoff
                         print(f"Rate limited, retrying in {delay} seconds...")
+                        LLM_RETRIES.labels(model, "rate_limited").inc()
                         time.sleep(delay)
                         continue
                     else:
                         print(f"Rate limit exceeded after {max_retries} attempts")
                         return None
                 else:
+                    LLM_REQUESTS.labels(model, "error").inc()
                     print(f"Groq API error: {response.status_code} - {response.text}")
                     return None
                 
             except Exception as e:
+                LLM_REQUESTS.labels(model, "exception").inc()
                 print(f"Groq generation failed: {e}")
                 if attempt < max_retries - 1:
+                    LLM_RETRIES.labels(model, "exception").inc()
                     time.sleep(base_delay)
                     continue
                 return None
@@ -547,7 +561,7 @@ Generate 4 weeks of realistic WhatsApp conversations for comprehensive review.""
         
         return episode_prompts.get(month, "Generate realistic health coaching conversations for this period.")
     
-    def _get_travel_context(self, month: int) -> str:
+    def get_travel_context(self, month: int) -> str:
         """Get travel context for specific month"""
         travel_contexts = {
             1: "Rohan has a 5-day trip to Seoul in Week 3",
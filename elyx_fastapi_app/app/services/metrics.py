@@ -0,0 +1,267 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+def _format(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+class GaugeValue(CounterValue):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+class Metric:
+    """One metric family; each distinct label tuple gets its own lock-protected value"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        value = self._values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                value = self._values.setdefault(values, self._new_value())
+        return value
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_value(self):
+        return CounterValue()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_text(values)} {_format(value.value)}"
+                for values, value in list(self._values.items())]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def _new_value(self):
+        return GaugeValue()
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self):
+        return HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for values, value in list(self._values.items()):
+            with value._lock:
+                counts, total = list(value.counts), value.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                bucket = self._label_text(values, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(values)} {_format(total)}")
+            lines.append(f"{self.name}_count{self._label_text(values)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text exposition format.
+
+    Recording is a dict lookup and a short lock per call, cheap enough for
+    every request and query. Each process keeps its own values, so run one
+    scrape target per worker process.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUESTS = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = metrics_registry.histogram(
+    "http_request_duration_seconds", "Time from request to the last body byte", ["method", "route"])
+HTTP_IN_FLIGHT = metrics_registry.gauge(
+    "http_requests_in_flight", "Requests currently being served", ["method"])
+
+DB_QUERIES = metrics_registry.counter("db_queries_total", "SQL statements executed", ["operation"])
+DB_QUERY_SECONDS = metrics_registry.histogram(
+    "db_query_duration_seconds", "Cursor execution time per SQL statement", ["operation"], QUERY_BUCKETS)
+DB_POOL_WAIT_SECONDS = metrics_registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", buckets=QUERY_BUCKETS)
+DB_POOL_CHECKED_OUT = metrics_registry.gauge("db_pool_checked_out", "Pooled connections currently checked out")
+
+LLM_REQUESTS = metrics_registry.counter(
+    "llm_requests_total", "LLM API calls by outcome (success, rate_limited, error, exception)", ["model", "outcome"])
+LLM_REQUEST_SECONDS = metrics_registry.histogram(
+    "llm_request_duration_seconds", "LLM API call latency", ["model"], LLM_BUCKETS)
+LLM_TOKENS = metrics_registry.counter("llm_tokens_total", "Tokens reported by the LLM API", ["model", "kind"])
+LLM_RETRIES = metrics_registry.counter("llm_retries_total", "LLM calls retried, by reason", ["model", "reason"])
+LLM_RATE_LIMIT_WAIT_SECONDS = metrics_registry.histogram(
+    "llm_rate_limiter_wait_seconds", "Time spent waiting on the shared LLM rate limiter", buckets=LLM_BUCKETS)
+
+GENERATION_STAGE_SECONDS = metrics_registry.histogram(
+    "generation_stage_duration_seconds", "Journey generation time per stage", ["stage"], LLM_BUCKETS)
+GENERATION_ROWS = metrics_registry.counter(
+    "generation_rows_written_total", "Rows written by journey generation, per stage", ["stage"])
+GENERATION_JOURNEYS = metrics_registry.counter(
+    "generation_journeys_total", "Journey generations by outcome", ["outcome"])
+
+OPERATIONS = {"select", "insert", "update", "delete"}
+
+def query_operation(statement: str) -> str:
+    """Leading SQL keyword of a statement, folded into a small label set"""
+    keyword = statement.lstrip()[:6].lower()
+    if keyword in OPERATIONS:
+        return keyword
+    return "with" if keyword.startswith("with") else "other"
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is None:
+        return
+    operation = query_operation(statement)
+    DB_QUERIES.labels(operation).inc()
+    DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+@event.listens_for(Pool, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+@event.listens_for(Pool, "checkin")
+def _count_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
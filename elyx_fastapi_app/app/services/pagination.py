@@ -0,0 +1,76 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# occurred_at is NULL for rows whose legacy date could not be parsed; they sort first
+Cursor = Tuple[Optional[int], str]
+
+def encode_cursor(occurred_at: Optional[int], row_id: Any) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe token"""
+    raw = json.dumps([occurred_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a token produced by encode_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        occurred_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (None if occurred_at is None else int(occurred_at)), row_id
+    except (ValueError, TypeError):
+        raise ValueError("Invalid page token")
+
+def keyset_order(ts_column, id_column):
+    """(timestamp, id) order with NULL timestamps first on every dialect, matching the keyset indexes"""
+    return ts_column.asc().nulls_first(), id_column.asc()
+
+def after_cursor(ts_column, id_column, cursor: Cursor):
+    """Rows past a keyset position in keyset_order"""
+    occurred_at, row_id = cursor
+    if occurred_at is None:
+        return or_(ts_column.isnot(None), and_(ts_column.is_(None), id_column > row_id))
+    return or_(
+        ts_column > occurred_at,
+        and_(ts_column == occurred_at, id_column > row_id)
+    )
+
+def after_timestamp(ts_column, occurred_at: Optional[int]):
+    """Rows later than a page boundary's timestamp; rows tied with it belong to the earlier page"""
+    if occurred_at is None:
+        return ts_column.isnot(None)
+    return ts_column > occurred_at
+
+def until_timestamp(ts_column, occurred_at: Optional[int]):
+    """Rows up to and including a page boundary's timestamp, counting NULL as the earliest"""
+    if occurred_at is None:
+        return ts_column.is_(None)
+    return or_(ts_column.is_(None), ts_column <= occurred_at)
+
+def apply_keyset(query, ts_column, id_column, cursor: Optional[Cursor]):
+    """Seek past the cursor position on the (timestamp, id) index"""
+    if cursor is None:
+        return query
+    return query.filter(after_cursor(ts_column, id_column, cursor))
+
+def paginate(query, ts_column, id_column, cursor: Optional[Cursor], limit: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one keyset page ordered by (timestamp, id).
+
+    Reads one extra row to detect whether another page exists and returns the
+    rows together with the token for the next page (None on the last page).
+    Without a limit the whole remaining range is returned.
+    """
+    query = apply_keyset(query, ts_column, id_column, cursor).order_by(*keyset_order(ts_column, id_column))
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, ts_column.key), getattr(last, id_column.key))
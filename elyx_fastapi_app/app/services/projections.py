@@ -0,0 +1,204 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import JSON, Float, String, case, cast, func, literal, null
+from sqlalchemy.orm import Session
+
+from app.models.compression import CompressedText
+from app.models.database import Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics
+from app.services.dictionaries import dictionary_encoder, encoded_attributes
+from app.services.serialization import dumps
+
+def json_literal(dialect: str, value: Any):
+    """A constant JSON value, used to fill defaults inside a JSON object built in SQL"""
+    text = literal(dumps(value).decode(), String)
+    if dialect == "sqlite":
+        return func.json(text)
+    return cast(text, JSON)
+
+class EntitySpec:
+    """Column-level description of an entity as exposed by the read endpoints.
+
+    Dictionary-encoded fields are selected as their integer codes and
+    decoded in process by `to_dicts`; only `json_object`, which builds the
+    document inside the database, decodes them in SQL.
+    """
+
+    def __init__(self, name: str, model, fields: Dict[str, Any], ts_column, defaults: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.ts_column = ts_column
+        self.id_column = model.id
+        self.defaults = defaults or {}
+        encoded = encoded_attributes(model)
+        self.codes = {name: getattr(model, encoded[name][1]) for name in fields if name in encoded}
+
+    def column(self, name: str):
+        """The column selected for one field: the code column for dictionary-encoded fields"""
+        return self.codes.get(name, self.fields[name])
+
+    def query(self, db: Session, names: List[str]):
+        """Select only the requested columns, plus the (timestamp, id) keyset columns"""
+        columns = [self.column(name).label(name) for name in names]
+        for key_column in (self.ts_column, self.id_column):
+            if key_column.key not in names:
+                columns.append(key_column)
+        return db.query(*columns)
+
+    def strings(self, db: Session, rows: List[Any], names: List[str]) -> Dict[int, str]:
+        """{code: string} for the dictionary codes in a batch of projected rows"""
+        positions = [i for i, name in enumerate(names) if name in self.codes]
+        if not positions:
+            return {}
+        return dictionary_encoder.values(db, {row[i] for row in rows for i in positions})
+
+    def to_dict(self, row, names: List[str], strings: Dict[int, str]) -> Dict[str, Any]:
+        """Build the response dict for one projected row, decoding its codes through `strings`"""
+        item = {name: row[i] for i, name in enumerate(names)}
+        for name in self.codes:
+            if name in item:
+                item[name] = strings.get(item[name])
+        for name, default in self.defaults.items():
+            if name in item and item[name] is None:
+                item[name] = default
+        return item
+
+    def to_dicts(self, db: Session, rows: Iterable[Any], names: List[str]) -> List[Dict[str, Any]]:
+        rows = list(rows)
+        strings = self.strings(db, rows, names)
+        return [self.to_dict(row, names, strings) for row in rows]
+
+    def json_object(self, dialect: str, names: List[str]):
+        """The dialect's JSON object expression for the requested columns, with defaults applied"""
+        if not names:
+            return null()
+
+        args = []
+        for name in names:
+            column = self.fields[name]
+            # SQLite stores JSON columns as text; json() embeds them as nested JSON
+            if dialect == "sqlite" and isinstance(column.type, JSON):
+                column = func.json(column)
+            # SQLite renders REAL with 15 significant digits; keep full double precision
+            elif dialect == "sqlite" and isinstance(column.type, Float):
+                column = case((column.is_(None), null()), else_=func.json(func.printf("%!.17g", column)))
+            # Compressed text is decoded by a function the codec registers on SQLite connections
+            elif dialect == "sqlite" and isinstance(column.type, CompressedText):
+                column = func.decompress_text(column)
+            if name in self.defaults:
+                column = func.coalesce(column, json_literal(dialect, self.defaults[name]))
+            args.extend([literal(name), column])
+
+        if dialect == "postgresql":
+            return cast(func.json_build_object(*args), String)
+        return func.json_object(*args)
+
+CONVERSATIONS = EntitySpec("conversations", Conversation, {
+    "id": Conversation.id,
+    "date": Conversation.date,
+    "time": Conversation.time,
+    "sender": Conversation.sender,
+    "role": Conversation.role,
+    "text": Conversation.text,
+    "tags": Conversation.tags,
+    "month": Conversation.month,
+    "week_number": Conversation.week_number,
+    "travel_context": Conversation.travel_context,
+    "decision_impact": Conversation.decision_impact
+}, Conversation.occurred_at, defaults={"decision_impact": []})
+
+DECISIONS = EntitySpec("decisions", Decision, {
+    "id": Decision.id,
+    "date": Decision.date,
+    "title": Decision.title,
+    "reason": Decision.reason,
+    "decision_type": Decision.decision_type,
+    "month": Decision.month,
+    "week_number": Decision.week_number,
+    "triggered_by_conversation": Decision.triggered_by_conversation,
+    "supporting_conversations": Decision.supporting_conversations,
+    "effects": Decision.effects,
+    "confidence_score": Decision.confidence_score
+}, Decision.occurred_at)
+
+HEALTH_EVENTS = EntitySpec("health_events", HealthEvent, {
+    "id": HealthEvent.id,
+    "date": HealthEvent.date,
+    "event_type": HealthEvent.event_type,
+    "title": HealthEvent.title,
+    "details": HealthEvent.details,
+    "month": HealthEvent.month,
+    "week_number": HealthEvent.week_number,
+    "linked_conversations": HealthEvent.linked_conversations,
+    "linked_decisions": HealthEvent.linked_decisions
+}, HealthEvent.occurred_at)
+
+METRICS = EntitySpec("metrics", MemberMetrics, {
+    "week_start": MemberMetrics.week_start,
+    "week_end": MemberMetrics.week_end,
+    "month": MemberMetrics.month,
+    "week_number": MemberMetrics.week_number,
+    "adherence_estimate": MemberMetrics.adherence_estimate,
+    "hours_committed": MemberMetrics.hours_committed,
+    "key_events": MemberMetrics.key_events,
+    "notes": MemberMetrics.notes,
+    "ai_insights": MemberMetrics.ai_insights
+}, MemberMetrics.week_start_at)
+
+TEAM_METRICS = EntitySpec("team_metrics", TeamMetrics, {
+    "date": TeamMetrics.date,
+    "month": TeamMetrics.month,
+    "week_number": TeamMetrics.week_number,
+    "doctor_hours": TeamMetrics.doctor_hours,
+    "coach_hours": TeamMetrics.coach_hours,
+    "nutritionist_hours": TeamMetrics.nutritionist_hours,
+    "physio_hours": TeamMetrics.physio_hours,
+    "concierge_hours": TeamMetrics.concierge_hours,
+    "total_interventions": TeamMetrics.total_interventions,
+    "linked_conversations": TeamMetrics.linked_conversations
+}, TeamMetrics.occurred_at)
+
+TIMELINE_ENTITIES = [CONVERSATIONS, DECISIONS, HEALTH_EVENTS, METRICS, TEAM_METRICS]
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Split a comma separated `fields` parameter; None means every field"""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    return requested or None
+
+def select_fields(spec: EntitySpec, requested: Optional[Set[str]]) -> List[str]:
+    """Resolve the requested field names for a single-entity endpoint"""
+    if requested is None:
+        return list(spec.fields)
+    unknown = requested - set(spec.fields)
+    if unknown:
+        raise ValueError(f"Unknown fields for {spec.name}: {', '.join(sorted(unknown))}")
+    return [name for name in spec.fields if name in requested]
+
+def select_timeline_fields(requested: Optional[Set[str]]) -> Dict[str, List[str]]:
+    """Resolve requested fields for every timeline entity set.
+
+    Names may be qualified (`conversations.text`) or bare (`month`), in which
+    case they apply to every entity that has that field. Entity sets without
+    any matching field are left out of the result entirely.
+    """
+    if requested is None:
+        return {spec.name: list(spec.fields) for spec in TIMELINE_ENTITIES}
+
+    selected = {}
+    matched = set()
+    for spec in TIMELINE_ENTITIES:
+        names = []
+        for name in spec.fields:
+            for candidate in (name, f"{spec.name}.{name}"):
+                if candidate in requested:
+                    names.append(name)
+                    matched.add(candidate)
+        if names:
+            selected[spec.name] = list(dict.fromkeys(names))
+
+    unknown = requested - matched
+    if unknown:
+        raise ValueError(f"Unknown timeline fields: {', '.join(sorted(unknown))}")
+    return selected
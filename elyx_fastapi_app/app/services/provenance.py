@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import String, cast, func, literal, null, select, true, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.database import Decision, HealthEvent, MemberMetrics, TeamMetrics
+from app.services.projections import CONVERSATIONS, DECISIONS, HEALTH_EVENTS, METRICS, TEAM_METRICS, EntitySpec
+from app.services.response_cache import response_cache
+from app.services.serialization import dumps, loads
+
+# Link arrays are returned as graph edges, so node payloads leave them out
+LINK_FIELDS = {"supporting_conversations", "effects", "linked_conversations", "linked_decisions", "key_events",
+               "triggered_by_conversation"}
+NODE_SPECS: Dict[str, EntitySpec] = {spec.name: spec for spec in (DECISIONS, CONVERSATIONS, HEALTH_EVENTS,
+                                                                    METRICS, TEAM_METRICS)}
+NODE_FIELDS = {name: [field for field in spec.fields if field not in LINK_FIELDS] for name, spec in NODE_SPECS.items()}
+KIND_ORDER = {name: rank for rank, name in enumerate(NODE_SPECS)}
+
+class ProvenanceService:
+    """Multi-hop provenance graphs for decisions, walked by one recursive CTE.
+
+    Edges follow the stored links: a decision's trigger and supporting
+    conversations and its effects, the health events and member/team
+    metrics that list a conversation, the decisions a health event links,
+    and the follow-up decisions that draw on a metric's conversations.
+    Edges are expanded from the JSON link arrays only for the members that
+    own the requested decisions, and the walk, node payloads and edge list
+    come back from a single statement. Graphs are cached per decision and
+    depth under the owning member's data version.
+    """
+
+    DIALECTS = ("sqlite", "postgresql")
+    DEFAULT_DEPTH = 4
+    MAX_DEPTH = 8
+    MAX_BATCH = 500
+
+    def _elements(self, dialect: str, column):
+        """A JSON array column as a table of its elements (column `value`)"""
+        if dialect == "postgresql":
+            return func.jsonb_array_elements_text(cast(column, JSONB)).table_valued("value")
+        return func.json_each(column).table_valued("value")
+
+    def _edges(self, dialect: str, member_ids):
+        """(source kind, source id, target kind, target id) for every link of the given members"""
+        def edge(source_kind, source_id, target_kind, target_id, model, elements=None, *where):
+            stmt = select(literal(source_kind).label("source_kind"), cast(source_id, String).label("source_id"),
+                          literal(target_kind).label("target_kind"), cast(target_id, String).label("target_id"))
+            stmt = stmt.select_from(model)
+            if elements is not None:
+                stmt = stmt.join(elements, true())
+            return stmt.where(model.member_id.in_(member_ids), *where)
+
+        supporting = self._elements(dialect, Decision.supporting_conversations)
+        effects = self._elements(dialect, Decision.effects)
+        event_conversations = self._elements(dialect, HealthEvent.linked_conversations)
+        event_decisions = self._elements(dialect, HealthEvent.linked_decisions)
+        key_events = self._elements(dialect, MemberMetrics.key_events)
+        team_conversations = self._elements(dialect, TeamMetrics.linked_conversations)
+
+        # (decision, conversation) pairs, materialised once so follow-up lookups join on an indexable table
+        drawn_on = edge("decisions", Decision.id, "conversations", supporting.c.value, Decision, supporting
+                        ).cte("provenance_drawn_on").prefix_with("MATERIALIZED")
+
+        def follow_ups(source_kind, model, elements):
+            return (select(literal(source_kind), cast(model.id, String), literal("decisions"), drawn_on.c.source_id)
+                    .select_from(model).join(elements, true())
+                    .join(drawn_on, drawn_on.c.target_id == cast(elements.c.value, String))
+                    .where(model.member_id.in_(member_ids)).distinct())
+
+        return union_all(
+            select(drawn_on),
+            edge("decisions", Decision.id, "conversations", Decision.triggered_by_conversation, Decision, None,
+                 Decision.triggered_by_conversation.isnot(None)),
+            edge("decisions", Decision.id, "health_events", effects.c.value, Decision, effects),
+            edge("conversations", event_conversations.c.value, "health_events", HealthEvent.id, HealthEvent,
+                 event_conversations),
+            edge("conversations", key_events.c.value, "metrics", MemberMetrics.id, MemberMetrics, key_events),
+            edge("conversations", team_conversations.c.value, "team_metrics", TeamMetrics.id, TeamMetrics,
+                 team_conversations),
+            edge("health_events", HealthEvent.id, "decisions", event_decisions.c.value, HealthEvent, event_decisions),
+            follow_ups("metrics", MemberMetrics, self._elements(dialect, MemberMetrics.key_events)),
+            follow_ups("team_metrics", TeamMetrics, self._elements(dialect, TeamMetrics.linked_conversations)),
+        ).cte("provenance_edges").prefix_with("MATERIALIZED")
+
+    def _statement(self, dialect: str, decision_ids: Sequence[str], depth: int):
+        roots = select(Decision.member_id).where(Decision.id.in_(decision_ids))
+        edges = self._edges(dialect, roots)
+
+        walk = select(
+            Decision.id.label("root"), literal("decisions").label("kind"), Decision.id.label("node_id"),
+            literal(0).label("depth"), cast(null(), String).label("parent_kind"), cast(null(), String).label("parent_id")
+        ).where(Decision.id.in_(decision_ids)).cte("provenance_walk", recursive=True)
+        walk = walk.union(select(
+            walk.c.root, edges.c.target_kind, edges.c.target_id, walk.c.depth + 1, walk.c.kind, walk.c.node_id
+        ).where(edges.c.source_kind == walk.c.kind, edges.c.source_id == walk.c.node_id, walk.c.depth < depth))
+
+        nodes = select(walk.c.root, walk.c.kind, walk.c.node_id, func.min(walk.c.depth).label("depth")
+                       ).group_by(walk.c.root, walk.c.kind, walk.c.node_id).cte("provenance_nodes")
+
+        branches = [select(
+            literal("edge").label("row_type"), walk.c.root, walk.c.parent_kind.label("kind"),
+            walk.c.parent_id.label("node_id"), null().label("depth"), walk.c.kind.label("target_kind"),
+            walk.c.node_id.label("target_id"), cast(null(), String).label("payload")
+        ).where(walk.c.parent_id.isnot(None)).distinct()]
+        for kind, spec in NODE_SPECS.items():
+            branches.append(select(
+                literal("node"), nodes.c.root, nodes.c.kind, nodes.c.node_id, nodes.c.depth, null(), null(),
+                spec.json_object(dialect, NODE_FIELDS[kind])
+            ).join_from(nodes, spec.model, cast(spec.id_column, String) == nodes.c.node_id).where(nodes.c.kind == kind))
+        return union_all(*branches)
+
+    def _walk(self, db: Session, decision_ids: Sequence[str], depth: int) -> Dict[str, Dict[str, Any]]:
+        dialect = db.get_bind().dialect.name
+        if dialect not in self.DIALECTS:
+            raise NotImplementedError(f"Provenance graphs need JSON array functions ({', '.join(self.DIALECTS)})")
+
+        graphs = {decision_id: {"decision_id": decision_id, "depth": depth, "nodes": [], "edges": []}
+                  for decision_id in decision_ids}
+        for row in db.execute(self._statement(dialect, decision_ids, depth)):
+            graph = graphs[row.root]
+            if row.row_type == "edge":
+                graph["edges"].append({"from_kind": row.kind, "from_id": row.node_id,
+                                       "to_kind": row.target_kind, "to_id": row.target_id})
+            else:
+                payload = row.payload
+                graph["nodes"].append({"kind": row.kind, "id": row.node_id, "depth": row.depth,
+                                       "data": loads(payload) if isinstance(payload, (str, bytes)) else payload})
+        for graph in graphs.values():
+            graph["nodes"].sort(key=lambda node: (node["depth"], KIND_ORDER[node["kind"]], node["id"]))
+            graph["edges"].sort(key=lambda edge: (KIND_ORDER[edge["from_kind"]], edge["from_id"],
+                                                  KIND_ORDER[edge["to_kind"]], edge["to_id"]))
+        return graphs
+
+    def graphs(self, db: Session, decision_ids: Sequence[str],
+               depth: int = DEFAULT_DEPTH) -> Tuple[Dict[str, Dict[str, Any]], List[str], int]:
+        """Return ({decision_id: graph}, missing ids, cache hits) for many decisions.
+
+        Cached graphs are reused; the rest are walked together in one query.
+        """
+        decision_ids = list(dict.fromkeys(decision_ids))
+        owners = dict(db.query(Decision.id, Decision.member_id).filter(Decision.id.in_(decision_ids)).all())
+
+        graphs: Dict[str, Dict[str, Any]] = {}
+        keys = {}
+        # Read the versions before querying so a concurrent write is never cached as fresh
+        versions = response_cache.versions(db, owners.values())
+        for decision_id, member_id in owners.items():
+            keys[decision_id] = response_cache.key(db, "provenance", member_id, (decision_id, depth),
+                                                   version=versions[member_id])
+            body = response_cache.get(keys[decision_id])
+            if body is not None:
+                graphs[decision_id] = loads(body)
+        hits = len(graphs)
+
+        pending = [decision_id for decision_id in owners if decision_id not in graphs]
+        if pending:
+            for decision_id, graph in self._walk(db, pending, depth).items():
+                response_cache.set(keys[decision_id], dumps(graph))
+                graphs[decision_id] = graph
+
+        missing = [decision_id for decision_id in decision_ids if decision_id not in owners]
+        return {decision_id: graphs[decision_id] for decision_id in decision_ids if decision_id in graphs}, missing, hits
+
+# Global provenance service instance
+provenance_service = ProvenanceService()
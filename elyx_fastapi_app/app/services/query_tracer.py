@@ -0,0 +1,173 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.metrics import query_operation  # Also registers the listener that starts the query timer
+
+def _type_runs(types: List[str]) -> str:
+    """Consecutive equal type names folded, so a 500-id IN list reads `int × 500`"""
+    runs = []
+    for name in types:
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return ", ".join(name if count == 1 else f"{name} × {count}" for name, count in runs)
+
+def _row_shape(parameters) -> str:
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + _type_runs([type(value).__name__ for value in parameters or ()]) + ")"
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """Parameter types without their values, which may hold member health data"""
+    if executemany:
+        parameters = list(parameters)
+        return f"{len(parameters)} × {_row_shape(parameters[0]) if parameters else '()'}"
+    return _row_shape(parameters)
+
+class QueryRecord:
+    __slots__ = ("statement", "parameters", "operation", "rows", "seconds")
+
+    def __init__(self, statement: str, parameters: str, rows: Optional[int], seconds: float):
+        self.statement = statement
+        self.parameters = parameters
+        self.operation = query_operation(statement)
+        self.rows = rows
+        self.seconds = seconds
+
+class QueryTrace:
+    """The statements one request (or one `assert_max_queries` block) executed"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.queries: List[QueryRecord] = []
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    @property
+    def seconds(self) -> float:
+        return sum(query.seconds for query in self.queries)
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statements run at least `threshold` times, most frequent first.
+
+        The same SQL with different parameters is the N+1 shape (a query per
+        row of an earlier result); `identical` counts the runs that also
+        repeated the parameter types exactly.
+        """
+        counts = Counter(query.statement for query in self.queries)
+        shapes = Counter((query.statement, query.parameters) for query in self.queries)
+        return [{"statement": statement, "count": count,
+                 "identical": max(n for (text, _), n in shapes.items() if text == statement),
+                 "ms": round(sum(q.seconds for q in self.queries if q.statement == statement) * 1000, 3)}
+                for statement, count in counts.most_common() if count >= threshold]
+
+    def report(self, limit: int = 20) -> str:
+        lines = [f"{len(self.queries)} queries in {self.seconds * 1000:.1f} ms{f' for {self.label}' if self.label else ''}"]
+        for repeat in self.repeated(2)[:limit]:
+            lines.append(f"  {repeat['count']:>4} × {' '.join(repeat['statement'].split())[:160]}")
+        for query in self.queries[:limit]:
+            lines.append(f"  {query.seconds * 1000:8.2f} ms  {query.operation:<6}  rows={query.rows}  {query.parameters[:60]}  "
+                         f"{' '.join(query.statement.split())[:160]}")
+        if len(self.queries) > limit:
+            lines.append(f"  ... {len(self.queries) - limit} more")
+        return "\n".join(lines)
+
+_current_trace: ContextVar[Optional[QueryTrace]] = ContextVar("query_trace", default=None)
+
+class QueryTracer:
+    """Per-request SQL tracing, slow query logging and repeated statement detection.
+
+    Every cursor execution is timed by the metrics listener; this one adds
+    the statement, the parameter shape and the reported row count to the
+    trace of the current request, which lives in a context variable so the
+    worker thread running a sync endpoint shares it. Statements slower than
+    SLOW_QUERY_MS are logged wherever they run. When a request finishes,
+    statements it ran QUERY_REPEAT_THRESHOLD or more times are logged as
+    likely N+1 access. Row counts come from the driver: SQLite reports them
+    for writes only, so selects show rows=None there.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("QUERY_TRACING", "on").lower() not in ("0", "off", "false")
+        self.slow_seconds = float(os.getenv("SLOW_QUERY_MS", "200")) / 1000
+        self.repeat_threshold = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+
+    @contextmanager
+    def trace(self, label: str = "") -> Iterator[QueryTrace]:
+        """Collect the queries run in this context (and threads started from it) into a QueryTrace"""
+        trace = QueryTrace(label)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+
+    def record(self, statement: str, parameters, executemany: bool, rows: Optional[int], seconds: float):
+        trace = _current_trace.get()
+        if trace is None and seconds < self.slow_seconds:
+            return
+        query = QueryRecord(statement, parameter_shape(parameters, executemany), rows, seconds)
+        if trace is not None:
+            trace.queries.append(query)
+        if seconds >= self.slow_seconds:
+            where = f" in {trace.label}" if trace is not None and trace.label else ""
+            print(f"🐢 Slow query{where}: {seconds * 1000:.1f} ms, rows={rows}, params {query.parameters[:120]}\n"
+                  f"   {' '.join(statement.split())[:500]}")
+
+    def check(self, trace: QueryTrace):
+        """Log the statements a finished trace repeated often enough to look like N+1 access"""
+        for repeat in trace.repeated(self.repeat_threshold):
+            print(f"🔁 {trace.label or 'Query trace'} ran the same statement {repeat['count']} times "
+                  f"({repeat['identical']} with identical parameter types, {repeat['ms']:.1f} ms): "
+                  f"{' '.join(repeat['statement'].split())[:300]}")
+
+# Global query tracer instance
+query_tracer = QueryTracer()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _trace_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is None or not query_tracer.enabled:
+        return
+    rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+    query_tracer.record(statement, parameters, executemany, rows, time.perf_counter() - started)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "") -> Iterator[QueryTrace]:
+    """Fail when the block runs more than `limit` SQL statements.
+
+    Counts every statement on any engine while the block runs, including
+    those a TestClient request executes on the server thread, so wrap one
+    request at a time and nothing else that touches the database. The
+    error lists the statements, repeated ones first.
+
+        with assert_max_queries(3, "GET /journey/timeline/1"):
+            client.get("/journey/timeline/1")
+    """
+    trace = QueryTrace(label)
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "query_started", None)
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        trace.queries.append(QueryRecord(statement, parameter_shape(parameters, executemany), rows, seconds))
+
+    event.listen(Engine, "after_cursor_execute", collect)
+    try:
+        yield trace
+    finally:
+        event.remove(Engine, "after_cursor_execute", collect)
+    if len(trace) > limit:
+        raise QueryBudgetExceeded(f"Query budget of {limit} exceeded: {trace.report()}")
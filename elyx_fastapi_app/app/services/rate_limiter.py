@@ -0,0 +1,46 @@
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of a rate limited API.
+
+    Tokens refill continuously at `rate_per_minute`; up to `burst` requests
+    may go out back to back. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    self.waited_seconds += waited
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self):
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.capacity,
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited_seconds, 2)
+        }
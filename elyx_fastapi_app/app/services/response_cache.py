@@ -0,0 +1,189 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.database import DataVersion, Member
+
+class ResponseCache:
+    """In-process LRU cache for serialised read responses.
+
+    Keys include the member's data version from the `data_versions` table.
+    Every write that goes through a Session (the API, the batch workers and
+    the CLI scripts) bumps that version in its own transaction, so once it
+    commits, no process builds a key that matches the old entries, which age
+    out of the LRU. Memory is bounded both by entry count and by the total
+    size of cached bodies.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def version(self, db: Session, member_id: Optional[int]) -> int:
+        """Committed data version of a member; None gives a global version that grows with every write"""
+        if member_id is None:
+            stmt = select(func.coalesce(func.sum(DataVersion.version), 0))
+        else:
+            stmt = select(func.coalesce(func.max(DataVersion.version), 0)).where(DataVersion.member_id == member_id)
+        return db.execute(stmt).scalar()
+
+    def versions(self, db: Session, member_ids: Iterable[int]) -> Dict[int, int]:
+        """Committed data versions of many members in one query"""
+        member_ids = set(member_ids)
+        found = dict(db.execute(
+            select(DataVersion.member_id, DataVersion.version).where(DataVersion.member_id.in_(member_ids))
+        ).all()) if member_ids and self.enabled else {}
+        return {member_id: found.get(member_id, 0) for member_id in member_ids}
+
+    def key(self, db: Session, endpoint: str, member_id: Optional[int], filters: Hashable = (),
+            version: Optional[int] = None) -> Tuple:
+        """Build a cache key; read it before querying so a concurrent write is never cached as fresh.
+
+        Pass `version` when it was already read with `versions`.
+        """
+        if version is None:
+            version = self.version(db, member_id) if self.enabled else 0
+        return (endpoint, member_id, filters, version)
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: Tuple, body: bytes):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A body built across a concurrent commit lands under the old version, which no later key uses
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_build(self, key: Tuple, build: Callable[[], bytes]) -> Tuple[bytes, bool]:
+        """Return (body, hit), building and storing the body on a miss"""
+        body = self.get(key)
+        if body is not None:
+            return body, True
+        body = build()
+        self.set(key, body)
+        return body, False
+
+    def invalidate_members(self, member_ids: Iterable[int]):
+        """Drop this process's cached responses for the given members, freeing their memory early"""
+        member_ids = set(member_ids)
+        if not member_ids:
+            return
+        with self._lock:
+            stale = [key for key in self._entries if key[1] in member_ids or key[1] is None]
+            for key in stale:
+                self._size -= len(self._entries.pop(key))
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        }
+
+DIRTY_MEMBERS_KEY = "response_cache_dirty_members"
+
+def bump_versions(connection, member_ids: Iterable[int]):
+    """Add one to the data version of each member, in the caller's transaction"""
+    rows = [{"member_id": member_id, "version": 1} for member_id in sorted(set(member_ids))]
+    if not rows:
+        return
+    table = DataVersion.__table__
+    dialect = connection.dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        upsert = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table).values(rows)
+        connection.execute(upsert.on_conflict_do_update(
+            index_elements=["member_id"], set_={"version": table.c.version + 1}
+        ))
+        return
+
+    for row in rows:
+        result = connection.execute(
+            update(table).where(table.c.member_id == row["member_id"]).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+def mark_members_dirty(session: Session, member_ids: Iterable[int]):
+    """Bump the versions of members written in this transaction; Core writers call it, flushes call it for them"""
+    member_ids = set(member_ids) - session.info.get(DIRTY_MEMBERS_KEY, set())
+    if member_ids:
+        bump_versions(session.connection(), member_ids)
+        session.info.setdefault(DIRTY_MEMBERS_KEY, set()).update(member_ids)
+
+def _member_ids(objects: Iterable[Any]) -> Set[int]:
+    member_ids = set()
+    for obj in objects:
+        member_id = obj.id if isinstance(obj, Member) else getattr(obj, "member_id", None)
+        if member_id is not None:
+            member_ids.add(member_id)
+    return member_ids
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_members(session: Session, flush_context):
+    members = _member_ids(list(session.new) + list(session.dirty) + list(session.deleted))
+    if members:
+        mark_members_dirty(session, members)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_members(session: Session):
+    members = session.info.pop(DIRTY_MEMBERS_KEY, None)
+    if members:
+        response_cache.invalidate_members(members)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_members(session: Session):
+    session.info.pop(DIRTY_MEMBERS_KEY, None)
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
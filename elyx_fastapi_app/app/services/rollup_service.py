@@ -0,0 +1,328 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.database import (
+    Member, Conversation, MemberMetrics, TeamMetrics,
+    MemberMonthlyRollup, CohortMonthlyRollup
+)
+from app.services.dictionaries import dictionary_encoder  # Registers its flush listener first, so codes are set here
+from app.services.response_cache import mark_members_dirty
+
+HOUR_MEASURES = ["doctor_hours", "coach_hours", "nutritionist_hours", "physio_hours", "concierge_hours"]
+MESSAGE_ROLES = ["member", "doctor", "concierge", "nutritionist", "coach", "physio", "data_analyst", "strategist"]
+MEASURES = (HOUR_MEASURES + ["total_interventions", "message_count"]
+            + [f"{role}_messages" for role in MESSAGE_ROLES]
+            + ["other_messages", "adherence_sum", "adherence_weeks", "hours_committed"])
+
+# Attributes of each source row that feed the rollups
+TRACKED_ATTRIBUTES = {
+    Conversation: ["member_id", "month", "role_id"],
+    TeamMetrics: ["member_id", "month"] + HOUR_MEASURES + ["total_interventions"],
+    MemberMetrics: ["member_id", "month", "adherence_estimate", "hours_committed"],
+}
+
+PENDING_DELTAS_KEY = "rollup_pending_deltas"
+
+Delta = Dict[str, float]
+
+def cohort_for(created_at) -> str:
+    """Cohort label of a member: the month they were onboarded"""
+    return created_at.strftime("%Y-%m") if created_at is not None else "unknown"
+
+def message_measure(role: Optional[str]) -> str:
+    return f"{role}_messages" if role in MESSAGE_ROLES else "other_messages"
+
+class RollupService:
+    """Maintains per-member and per-cohort monthly rollups of the journey tables.
+
+    Session events turn every flushed insert, update or delete of a
+    conversation, team metric or member metric into additive deltas, which are
+    applied with atomic `col = col + delta` upserts on the flush's own
+    connection. Rollups therefore commit or roll back together with the rows
+    they summarise. Core bulk writes bypass the events and must call
+    `rebuild` for the members they touched.
+    """
+
+    UPSERT_BATCH = 500  # Rows per multi-row upsert, well under SQLite's bound-parameter limit
+
+    def measures(self, model, values: Dict[str, Any]) -> Delta:
+        """What one source row contributes to its member's month"""
+        if model is Conversation:
+            return {"message_count": 1, message_measure(values["role"]): 1}
+        if model is TeamMetrics:
+            delta = {name: values[name] or 0.0 for name in HOUR_MEASURES}
+            delta["total_interventions"] = values["total_interventions"] or 0
+            return delta
+        return {
+            "adherence_sum": values["adherence_estimate"] or 0.0,
+            "adherence_weeks": 1,
+            "hours_committed": values["hours_committed"] or 0.0
+        }
+
+    def _values(self, session: Session, obj, names: List[str], previous: bool) -> Dict[str, Any]:
+        """Current attribute values, or the values before this flush's changes, with role codes decoded"""
+        state = inspect(obj)
+        values = {}
+        for name in names:
+            history = state.attrs[name].history
+            if previous and history.deleted:
+                values[name] = history.deleted[0]
+            elif previous and history.unchanged:
+                values[name] = history.unchanged[0]
+            else:
+                values[name] = getattr(obj, name)
+        if "role_id" in values:
+            values["role"] = dictionary_encoder.values(session, [values["role_id"]]).get(values["role_id"])
+        return values
+
+    def collect(self, session: Session) -> Dict[Tuple[int, int], Delta]:
+        """Net measure deltas per (member_id, month) for the pending flush"""
+        deltas: Dict[Tuple[int, int], Delta] = defaultdict(lambda: defaultdict(int))
+
+        def add(model, values, sign):
+            if values["member_id"] is None or values["month"] is None:
+                return
+            bucket = deltas[(values["member_id"], values["month"])]
+            for name, value in self.measures(model, values).items():
+                bucket[name] += sign * value
+
+        for obj in session.new:
+            names = TRACKED_ATTRIBUTES.get(type(obj))
+            if names:
+                add(type(obj), self._values(session, obj, names, previous=False), 1)
+        for obj in session.deleted:
+            names = TRACKED_ATTRIBUTES.get(type(obj))
+            if names:
+                add(type(obj), self._values(session, obj, names, previous=True), -1)
+        for obj in session.dirty:
+            names = TRACKED_ATTRIBUTES.get(type(obj))
+            if names and session.is_modified(obj):
+                add(type(obj), self._values(session, obj, names, previous=True), -1)
+                add(type(obj), self._values(session, obj, names, previous=False), 1)
+
+        return {key: {name: value for name, value in delta.items() if value}
+                for key, delta in deltas.items() if any(delta.values())}
+
+    def apply(self, connection, deltas: Dict[Tuple[int, int], Delta]):
+        """Add member deltas to the member and cohort rollups in the current transaction"""
+        if not deltas:
+            return
+        member_ids = {member_id for member_id, _ in deltas}
+        cohorts = {
+            row.id: cohort_for(row.created_at)
+            for row in connection.execute(select(Member.id, Member.created_at).where(Member.id.in_(member_ids)))
+        }
+
+        cohort_deltas: Dict[Tuple[str, int], Delta] = defaultdict(lambda: defaultdict(int))
+        for (member_id, month), delta in sorted(deltas.items()):
+            cohort = cohorts.get(member_id, "unknown")
+            self._increment(connection, MemberMonthlyRollup.__table__,
+                            {"member_id": member_id, "month": month}, delta, {"cohort": cohort})
+            for name, value in delta.items():
+                cohort_deltas[(cohort, month)][name] += value
+
+        for (cohort, month), delta in sorted(cohort_deltas.items()):
+            self._increment(connection, CohortMonthlyRollup.__table__, {"cohort": cohort, "month": month}, delta)
+
+    def _increment(self, connection, table, key: Dict[str, Any], delta: Delta,
+                   insert_only: Optional[Dict[str, Any]] = None):
+        """Atomically add `delta` to the row at `key`, creating it when missing"""
+        dialect = connection.dialect.name
+        values = {**key, **(insert_only or {}), **delta}
+
+        if dialect in ("sqlite", "postgresql"):
+            upsert = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table).values(**values)
+            changes = {name: table.c[name] + upsert.excluded[name] for name in delta}
+            changes["updated_at"] = func.now()
+            connection.execute(upsert.on_conflict_do_update(index_elements=list(key), set_=changes))
+            return
+
+        conditions = [table.c[name] == value for name, value in key.items()]
+        result = connection.execute(
+            update(table).where(*conditions).values({name: table.c[name] + value for name, value in delta.items()})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**values))
+
+    def rebuild(self, db: Session, member_ids: Optional[Iterable[int]] = None):
+        """Recompute rollups from the source tables, for some members or for everyone.
+
+        Used to backfill existing data and after Core bulk writes. Runs in the
+        caller's transaction; the caller commits. Member rows are upserted in
+        place. A scoped rebuild moves the cohort rows by the members' net
+        change with the same atomic upserts the flush events use; a full
+        rebuild recomputes every cohort.
+        """
+        member_ids = set(member_ids) if member_ids is not None else None
+
+        def scoped(stmt, model):
+            return stmt.where(model.member_id.in_(member_ids)) if member_ids is not None else stmt
+
+        totals: Dict[Tuple[int, int], Delta] = defaultdict(lambda: defaultdict(int))
+        role_counts = db.execute(scoped(
+            select(Conversation.member_id, Conversation.month, Conversation.role_id, func.count())
+            .where(Conversation.month.isnot(None))
+            .group_by(Conversation.member_id, Conversation.month, Conversation.role_id), Conversation
+        )).all()
+        roles = dictionary_encoder.values(db, {role_id for _, _, role_id, _ in role_counts})
+        for member_id, month, role_id, count in role_counts:
+            role = roles.get(role_id)
+            totals[(member_id, month)]["message_count"] += count
+            totals[(member_id, month)][message_measure(role)] += count
+
+        hour_columns = [func.coalesce(func.sum(getattr(TeamMetrics, name)), 0.0) for name in HOUR_MEASURES]
+        team_sums = db.execute(scoped(
+            select(TeamMetrics.member_id, TeamMetrics.month, *hour_columns,
+                   func.coalesce(func.sum(TeamMetrics.total_interventions), 0))
+            .where(TeamMetrics.month.isnot(None))
+            .group_by(TeamMetrics.member_id, TeamMetrics.month), TeamMetrics
+        ))
+        for member_id, month, *sums in team_sums:
+            for name, value in zip(HOUR_MEASURES + ["total_interventions"], sums):
+                totals[(member_id, month)][name] += value
+
+        adherence = db.execute(scoped(
+            select(MemberMetrics.member_id, MemberMetrics.month,
+                   func.coalesce(func.sum(MemberMetrics.adherence_estimate), 0.0), func.count(),
+                   func.coalesce(func.sum(MemberMetrics.hours_committed), 0.0))
+            .where(MemberMetrics.month.isnot(None))
+            .group_by(MemberMetrics.member_id, MemberMetrics.month), MemberMetrics
+        ))
+        for member_id, month, adherence_sum, weeks, hours in adherence:
+            totals[(member_id, month)].update(adherence_sum=adherence_sum, adherence_weeks=weeks, hours_committed=hours)
+
+        ids = {member_id for member_id, _ in totals}
+        cohorts = {row.id: cohort_for(row.created_at)
+                   for row in db.execute(select(Member.id, Member.created_at).where(Member.id.in_(ids)))}
+        rows = [{"member_id": member_id, "month": month, "cohort": cohorts.get(member_id, "unknown"),
+                 **{name: measures.get(name, 0) for name in MEASURES}}
+                for (member_id, month), measures in sorted(totals.items())]
+
+        previous = db.execute(scoped(
+            select(MemberMonthlyRollup.member_id, MemberMonthlyRollup.month, MemberMonthlyRollup.cohort,
+                   *[getattr(MemberMonthlyRollup, name) for name in MEASURES]), MemberMonthlyRollup
+        )).all()
+        stale = {(row.member_id, row.month) for row in previous} - set(totals)
+        if stale:
+            db.execute(delete(MemberMonthlyRollup).where(
+                tuple_(MemberMonthlyRollup.member_id, MemberMonthlyRollup.month).in_(sorted(stale))))
+
+        connection = db.connection()
+        self._overwrite(connection, MemberMonthlyRollup.__table__, ["member_id", "month"], rows)
+
+        if member_ids is None:
+            self._rebuild_cohorts(db)
+        else:
+            # Move the cohorts by the difference between the members' old and new rows,
+            # so concurrent writers of the same cohort only ever meet in atomic upserts
+            cohort_deltas: Dict[Tuple[str, int], Delta] = defaultdict(lambda: defaultdict(int))
+            for sign, source in ((-1, [row._mapping for row in previous]), (1, rows)):
+                for row in source:
+                    for name in MEASURES:
+                        cohort_deltas[(row["cohort"], row["month"])][name] += sign * row[name]
+            for (cohort, month), delta in sorted(cohort_deltas.items()):
+                delta = {name: value for name, value in delta.items() if value}
+                if delta:
+                    self._increment(connection, CohortMonthlyRollup.__table__, {"cohort": cohort, "month": month}, delta)
+
+        mark_members_dirty(db, ids | (member_ids or set()))
+        print(f"📊 Rebuilt {len(rows)} member rollup rows")
+
+    def _rebuild_cohorts(self, db: Session):
+        """Recompute every cohort rollup as the sum over its members' rollups"""
+        source = select(
+            MemberMonthlyRollup.cohort, MemberMonthlyRollup.month,
+            *[func.sum(getattr(MemberMonthlyRollup, name)).label(name) for name in MEASURES]
+        ).group_by(MemberMonthlyRollup.cohort, MemberMonthlyRollup.month)
+        rows = [dict(row._mapping) for row in db.execute(source)]
+        keys = {(row["cohort"], row["month"]) for row in rows}
+        stale = [(row.cohort, row.month)
+                 for row in db.execute(select(CohortMonthlyRollup.cohort, CohortMonthlyRollup.month))
+                 if (row.cohort, row.month) not in keys]
+        if stale:
+            db.execute(delete(CohortMonthlyRollup).where(
+                tuple_(CohortMonthlyRollup.cohort, CohortMonthlyRollup.month).in_(stale)))
+        self._overwrite(db.connection(), CohortMonthlyRollup.__table__, ["cohort", "month"], rows)
+
+    def _overwrite(self, connection, table, key: List[str], rows: List[Dict[str, Any]]):
+        """Upsert whole rows: insert each one, or replace the row already at its key"""
+        if not rows:
+            return
+        dialect = connection.dialect.name
+
+        if dialect in ("sqlite", "postgresql"):
+            for start in range(0, len(rows), self.UPSERT_BATCH):
+                upsert = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)\
+                    .values(rows[start:start + self.UPSERT_BATCH])
+                changes = {name: upsert.excluded[name] for name in rows[0] if name not in key}
+                changes["updated_at"] = func.now()
+                connection.execute(upsert.on_conflict_do_update(index_elements=key, set_=changes))
+            return
+
+        for row in rows:
+            conditions = [table.c[name] == row[name] for name in key]
+            result = connection.execute(
+                update(table).where(*conditions).values({name: value for name, value in row.items() if name not in key})
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(**row))
+
+    def _to_dict(self, row, keys: List[str]) -> Dict[str, Any]:
+        item = {key: getattr(row, key) for key in keys}
+        for name in HOUR_MEASURES:
+            item[name] = round(getattr(row, name), 4)
+        item["total_hours"] = round(sum(getattr(row, name) for name in HOUR_MEASURES), 4)
+        item["total_interventions"] = row.total_interventions
+        item["message_count"] = row.message_count
+        item["messages_by_role"] = {role: getattr(row, f"{role}_messages") for role in MESSAGE_ROLES}
+        item["messages_by_role"]["other"] = row.other_messages
+        item["adherence_weeks"] = row.adherence_weeks
+        item["avg_adherence"] = round(row.adherence_sum / row.adherence_weeks, 4) if row.adherence_weeks else None
+        item["hours_committed"] = round(row.hours_committed, 4)
+        return item
+
+    def member_rollups(self, db: Session, member_id: int) -> List[Dict[str, Any]]:
+        rows = db.query(MemberMonthlyRollup).filter(MemberMonthlyRollup.member_id == member_id)\
+            .order_by(MemberMonthlyRollup.month).all()
+        return [self._to_dict(row, ["month", "cohort"]) for row in rows]
+
+    def cohort_rollups(self, db: Session, cohort: Optional[str] = None) -> List[Dict[str, Any]]:
+        member_counts = select(
+            MemberMonthlyRollup.cohort, MemberMonthlyRollup.month, func.count().label("members")
+        ).group_by(MemberMonthlyRollup.cohort, MemberMonthlyRollup.month)
+        query = db.query(CohortMonthlyRollup)
+        if cohort is not None:
+            query = query.filter(CohortMonthlyRollup.cohort == cohort)
+            member_counts = member_counts.where(MemberMonthlyRollup.cohort == cohort)
+        counts = {(row.cohort, row.month): row.members for row in db.execute(member_counts)}
+
+        rollups = []
+        for row in query.order_by(CohortMonthlyRollup.cohort, CohortMonthlyRollup.month).all():
+            item = self._to_dict(row, ["cohort", "month"])
+            item["members"] = counts.get((row.cohort, row.month), 0)
+            rollups.append(item)
+        return rollups
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_deltas(session: Session, flush_context, instances):
+    deltas = rollup_service.collect(session)
+    if deltas:
+        session.info[PENDING_DELTAS_KEY] = deltas
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_deltas(session: Session, flush_context):
+    deltas = session.info.pop(PENDING_DELTAS_KEY, None)
+    if deltas:
+        rollup_service.apply(session.connection(), deltas)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollup_deltas(session: Session):
+    session.info.pop(PENDING_DELTAS_KEY, None)
+
+# Global rollup service instance
+rollup_service = RollupService()
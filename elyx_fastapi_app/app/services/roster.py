@@ -0,0 +1,173 @@
+import re
+import threading
+from difflib import get_close_matches
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.database import TeamRosterEntry
+
+UNKNOWN_ROLE = "team_member"
+ROSTER_ROLES = ("member", "doctor", "concierge", "nutritionist", "coach", "physio", "data_analyst", "strategist",
+                UNKNOWN_ROLE)
+
+# Built-in roster, used until the team_roster table has rows. Aliases are
+# matched as substrings of the sender in priority order, so "Dr. Warren
+# (reviewing Rohan's panel)" still resolves to the member, as it always has
+DEFAULT_ROSTER = [
+    {"name": "Rohan Patel", "aliases": ["rohan", "patel"], "role": "member", "priority": 10},
+    {"name": "Dr. Warren", "aliases": ["dr.", "warren"], "role": "doctor", "priority": 20},
+    {"name": "Ruby", "aliases": ["ruby"], "role": "concierge", "priority": 30},
+    {"name": "Carla", "aliases": ["carla"], "role": "nutritionist", "priority": 40},
+    {"name": "Rachel", "aliases": ["rachel"], "role": "coach", "priority": 50},
+    {"name": "Advik", "aliases": ["advik"], "role": "data_analyst", "priority": 60},
+    {"name": "Neel", "aliases": ["neel"], "role": "strategist", "priority": 70},
+]
+
+# Sender spellings whose aliases do not appear verbatim are matched word by
+# word against alias words at least this long and this similar
+FUZZY_MIN_LENGTH = 4
+FUZZY_CUTOFF = 0.8
+
+def normalise_sender(sender: str) -> str:
+    return " ".join(sender.lower().split())
+
+class CompiledRoster:
+    """An immutable roster snapshot with a memo of resolved sender names.
+
+    Entries scoped to a member are tried before global ones for that
+    member's conversations. Resolution is pure for a snapshot, so results
+    are memoised by (scope, normalised sender); a reload builds a new
+    snapshot with an empty memo.
+    """
+
+    MAX_MEMO = 50000
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        ordered = sorted((e for e in entries if e.get("enabled", True) and e["role"] in ROSTER_ROLES),
+                         key=lambda e: (e.get("priority", 100), e["name"]))
+        self.entries = ordered
+        self.scoped_members = {e["member_id"] for e in ordered if e.get("member_id") is not None}
+        self._memo: Dict[Tuple[Optional[int], str], str] = {}
+        # Exact (member_id, sender) strings seen so far, so repeat senders skip normalising
+        self._raw_memo: Dict[Tuple[Optional[int], str], str] = {}
+
+    def _candidates(self, scope: Optional[int]) -> List[Dict[str, Any]]:
+        scoped = [e for e in self.entries if scope is not None and e.get("member_id") == scope]
+        return scoped + [e for e in self.entries if e.get("member_id") is None]
+
+    def _aliases(self, entry: Dict[str, Any]) -> List[str]:
+        return [normalise_sender(alias) for alias in [entry["name"], *entry.get("aliases", [])] if alias.strip()]
+
+    def _resolve(self, sender: str, scope: Optional[int]) -> str:
+        candidates = self._candidates(scope)
+        for entry in candidates:
+            if any(alias in sender for alias in self._aliases(entry)):
+                return entry["role"]
+
+        # Fuzzy fallback for misspelt names ("Karla", "Dr Waren"): closest alias word per sender word
+        words: Dict[str, str] = {}
+        for entry in reversed(candidates):
+            for alias in self._aliases(entry):
+                for word in re.findall(r"[a-z]+", alias):
+                    if len(word) >= FUZZY_MIN_LENGTH:
+                        words[word] = entry["role"]
+        best: Tuple[float, str] = (0.0, UNKNOWN_ROLE)
+        for token in re.findall(r"[a-z]+", sender):
+            if len(token) < FUZZY_MIN_LENGTH:
+                continue
+            for word in get_close_matches(token, words, n=1, cutoff=FUZZY_CUTOFF):
+                score = 1.0 - abs(len(word) - len(token)) / max(len(word), len(token))
+                if score > best[0]:
+                    best = (score, words[word])
+        return best[1]
+
+    def role(self, sender: str, member_id: Optional[int] = None) -> str:
+        role = self._raw_memo.get((member_id, sender))
+        if role is None:
+            role = self._memo_miss(sender, member_id)
+        return role
+
+    def _memo_miss(self, sender: str, member_id: Optional[int]) -> str:
+        if len(self._raw_memo) >= self.MAX_MEMO:
+            self._raw_memo.clear()
+            self._memo.clear()
+        scope = member_id if member_id in self.scoped_members else None
+        key = (scope, normalise_sender(sender))
+        role = self._memo.get(key)
+        if role is None:
+            role = self._memo[key] = self._resolve(key[1], scope)
+        self._raw_memo[(member_id, sender)] = role
+        return role
+
+class TeamRoster:
+    """Sender-to-role resolution backed by the team_roster table.
+
+    Loaded the same way as the tagging taxonomy: rows are compiled into a
+    CompiledRoster that is swapped in whole, commits that change the table
+    mark it stale, and an empty or missing table means DEFAULT_ROSTER.
+    """
+
+    def __init__(self):
+        self._compiled = CompiledRoster(DEFAULT_ROSTER)
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> CompiledRoster:
+        rows = []
+        if inspect(db.get_bind()).has_table(TeamRosterEntry.__tablename__):
+            rows = [self._to_dict(row) for row in db.query(TeamRosterEntry).all()]
+        compiled = CompiledRoster(rows or DEFAULT_ROSTER)
+        with self._lock:
+            self._compiled = compiled
+            self._loaded = True
+        return compiled
+
+    def ensure_loaded(self, db: Session) -> CompiledRoster:
+        if not self._loaded:
+            return self.load(db)
+        return self._compiled
+
+    def invalidate(self):
+        self._loaded = False
+
+    def seed_defaults(self, db: Session):
+        """Store the built-in roster, so edits start from the names in effect"""
+        if db.query(TeamRosterEntry).first() is None:
+            db.add_all(TeamRosterEntry(**entry) for entry in DEFAULT_ROSTER)
+            db.flush()
+
+    def _to_dict(self, row: TeamRosterEntry) -> Dict[str, Any]:
+        return {"name": row.name, "aliases": row.aliases or [], "role": row.role, "member_id": row.member_id,
+                "priority": row.priority, "enabled": row.enabled}
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return [dict(entry) for entry in self._compiled.entries]
+
+    @property
+    def compiled(self) -> CompiledRoster:
+        return self._compiled
+
+    def role(self, sender: str, member_id: Optional[int] = None) -> str:
+        """Role of a conversation sender, optionally using entries scoped to `member_id`"""
+        return self._compiled.role(sender, member_id)
+
+ROSTER_CHANGED_KEY = "roster_changed"
+
+@event.listens_for(Session, "after_flush")
+def _collect_roster_changes(session: Session, flush_context):
+    if any(isinstance(obj, TeamRosterEntry) for obj in list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info[ROSTER_CHANGED_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _reload_committed_roster(session: Session):
+    if session.info.pop(ROSTER_CHANGED_KEY, False):
+        team_roster.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_roster_changes(session: Session):
+    session.info.pop(ROSTER_CHANGED_KEY, None)
+
+# Global team roster instance
+team_roster = TeamRoster()
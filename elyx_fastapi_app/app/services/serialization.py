@@ -0,0 +1,34 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+if orjson is None:
+    import json
+    from pydantic_core import to_json
+
+def dumps(content: Any) -> bytes:
+    """Serialise plain response dicts straight to compact JSON bytes.
+
+    Uses orjson when installed and pydantic-core's Rust serialiser otherwise;
+    both skip FastAPI's recursive jsonable_encoder pass.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return to_json(content)
+
+def loads(data: Any) -> Any:
+    """Parse JSON text or bytes, e.g. payloads built by the database"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through the fast serialiser"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
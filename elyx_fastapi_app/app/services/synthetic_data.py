@@ -0,0 +1,329 @@
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models.database import Member, Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics
+from app.services.dictionaries import dictionary_encoder
+from app.services.journey_service import journey_service
+from app.services.local_ai_service import local_ai_service
+from app.services.rollup_service import rollup_service
+from app.services.timestamps import to_epoch
+
+FIRST_NAMES = ["Rohan", "Aisha", "Daniel", "Mei", "Arjun", "Sofia", "Kenji", "Priya", "Lucas", "Hana",
+               "Omar", "Elena", "Wei", "Nadia", "James", "Ananya", "Marco", "Yuna", "Kavya", "Ethan"]
+LAST_NAMES = ["Patel", "Tan", "Lim", "Sharma", "Kim", "Wong", "Garcia", "Chen", "Nair", "Muller",
+              "Suzuki", "Rahman", "Lee", "Rossi", "Iyer", "Ng", "Cohen", "Park", "Das", "Walker"]
+HOMES = {
+    "Singapore": ["UK", "US", "South Korea", "Jakarta"],
+    "Hong Kong": ["Shanghai", "Tokyo", "Singapore"],
+    "Dubai": ["London", "Mumbai", "Riyadh"],
+    "London": ["New York", "Frankfurt", "Dubai"],
+    "Mumbai": ["Dubai", "Singapore", "Bangalore"],
+    "Sydney": ["Auckland", "Singapore", "Los Angeles"],
+}
+OCCUPATIONS = ["Regional Head of Sales for a FinTech company", "Managing Director, Private Equity",
+               "Chief Technology Officer", "Partner at a law firm", "Founder of a logistics startup",
+               "VP Operations, Shipping", "Investment Banker", "Head of Strategy, Telecoms"]
+WEARABLES = ["Garmin Fenix 7", "Oura Ring", "Apple Watch Ultra", "Whoop 4.0", "Polar Vantage"]
+GOALS = [
+    {"goal": "Improve cardiovascular health", "target": "Reduce resting heart rate by 10%"},
+    {"goal": "Enhance cognitive performance", "target": "Improve focus and mental clarity"},
+    {"goal": "Annual full-body screening", "target": "November 2025"},
+    {"goal": "Improve sleep quality", "target": "7+ hours with 90% sleep efficiency"},
+    {"goal": "Reduce body fat", "target": "Lose 4% body fat in 6 months"},
+    {"goal": "Lower ApoB", "target": "Below 80 mg/dL"},
+]
+
+# The Elyx team as it appears in generated chats; roles come from JourneyService.determine_role
+TEAM_SENDERS = ["Ruby (Concierge)", "Dr. Warren", "Carla", "Rachel", "Advik", "Neel"]
+
+MESSAGE_TEMPLATES = {
+    "member": [
+        "Landed in {place}, the hotel gym is decent so I can keep the workout going.",
+        "Can we move the diagnostic panel? My flight back from {place} got pushed.",
+        "Struggling with the diet this week, too many client dinners in {place}.",
+        "Sleep was rough, HRV dropped to {value}. Should I skip training tomorrow?",
+        "Seeing real progress on the morning runs, resting heart rate is {value}.",
+        "Quick question on the supplement timing when I'm travelling.",
+    ],
+    "concierge": [
+        "I've booked your blood test for next {day} at 8am, fasting from 10pm.",
+        "Your travel kit for {place} is ready, resistance bands and snacks included.",
+        "Weekly check-in: {value} of your planned sessions are done, great consistency.",
+        "I've rescheduled the physio session around your {place} trip.",
+    ],
+    "doctor": [
+        "Your latest panel results are in, ApoB is at {value} mg/dL, let's review on {day}.",
+        "Given the travel load, I'd like to repeat the diagnostic test in 12 weeks.",
+        "Blood pressure readings look stable, no changes to medication for now.",
+        "The results show improvement in inflammation markers, keep the current plan.",
+    ],
+    "nutritionist": [
+        "For {place}, aim for a protein-first breakfast and skip the airport pastries.",
+        "Let's adjust the diet: add {value}g of fibre daily and cut late-night food.",
+        "Your food log looks solid, the nutrition plan is working.",
+        "Try the Mediterranean options on the {place} hotel menu, I've sent a list.",
+    ],
+    "coach": [
+        "New exercise block this week: zone 2 training, {value} minutes three times.",
+        "Hotel workout for {place}: 20 minutes of mobility plus a bodyweight circuit.",
+        "Strong progress on the deadlift, we'll increase the training load next week.",
+        "Let's swap Thursday's workout for a recovery walk after the flight.",
+    ],
+    "data_analyst": [
+        "Garmin data shows HRV trending up {value}% over the last month, good results.",
+        "Sleep stages from the Oura ring improved during the {place} trip.",
+        "Your training readiness dipped after the flight, plan a lighter session.",
+    ],
+    "strategist": [
+        "Stepping back: the results this quarter justify keeping the current priorities.",
+        "With the {place} travel coming up we'll focus on consistency over intensity.",
+        "Good progress overall, let's align the next phase with your annual screening.",
+    ],
+}
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+class SyntheticDataGenerator:
+    """Deterministic, LLM-free journeys for load and scale testing.
+
+    Personas, team senders, roles, tags and travel contexts follow what
+    journey generation produces, so every endpoint sees realistic shapes.
+    Each member draws from its own RNG seeded with (seed, member id), so a
+    member's journey is identical whatever batch or order it is generated in.
+    Rows are written with Core bulk inserts, which bypass the session events,
+    so rollups and the response cache are rebuilt for each batch of members.
+    """
+
+    def __init__(self, seed: int = 42, start_date: date = date(2025, 1, 6), messages_per_week: int = 20,
+                 onboarding_days: int = 365):
+        self.seed = seed
+        self.start_date = start_date
+        self.messages_per_week = messages_per_week
+        self.onboarding_days = onboarding_days
+        self.roles = {sender: journey_service.determine_role(sender) for sender in TEAM_SENDERS}
+        self._tag_cache: Dict[Tuple[str, int, int], List[str]] = {}
+
+    def _rng(self, member_id: int, stream: str) -> random.Random:
+        return random.Random(f"{self.seed}:{member_id}:{stream}")
+
+    def _id(self, rng: random.Random) -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def member(self, member_id: int) -> Dict[str, Any]:
+        """Member row for `member_id`, including its onboarding date as created_at"""
+        rng = self._rng(member_id, "persona")
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        residence = rng.choice(list(HOMES))
+        age = rng.randint(32, 64)
+        onboarded = self.start_date + timedelta(days=rng.randrange(self.onboarding_days))
+        return {
+            "id": member_id,
+            "preferred_name": f"{first} {last}",
+            "dob": f"{onboarded.year - age}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "age": age,
+            "gender": rng.choice(["Male", "Female"]),
+            "residence": residence,
+            "travel_hubs": HOMES[residence],
+            "occupation": rng.choice(OCCUPATIONS),
+            "pa": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "tech_preferences": {"wearables": rng.sample(WEARABLES, 2), "share_data": rng.random() < 0.8},
+            "health_goals": rng.sample(GOALS, 3),
+            "communication_preferences": {"channel": "WhatsApp", "response_time": "Within 2 hours",
+                                          "detail_depth": rng.choice(["Comprehensive", "Summary"]),
+                                          "language": "English"},
+            "scheduling_preferences": {"morning_exercise": rng.random() < 0.6,
+                                       "avg_weekly_hours": rng.randint(4, 10),
+                                       "travels_every_2_weeks": rng.random() < 0.5},
+            "created_at": datetime(onboarded.year, onboarded.month, onboarded.day, tzinfo=timezone.utc),
+        }
+
+    def journey(self, member: Dict[str, Any], months: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Conversations, decisions, health events and metrics for one member's first `months` months"""
+        rng = self._rng(member["id"], "journey")
+        member_id, first_name = member["id"], member["preferred_name"].split()[0]
+        onboarded = member["created_at"].date()
+        conversations, decisions, events, metrics = [], [], [], []
+
+        for month in range(1, months + 1):
+            travel_context = local_ai_service.get_travel_context((month - 1) % 8 + 1).replace("Rohan", first_name)
+            month_conversations, month_decisions = [], []
+
+            for week in range((month - 1) * 4 + 1, month * 4 + 1):
+                week_start = onboarded + timedelta(weeks=week - 1)
+                period = self._week_conversations(rng, member, month, week, week_start, travel_context)
+                decision = self._decision(rng, member_id, month, week, period)
+                for convo in period:
+                    convo["decision_impact"] = [decision["id"]]
+                month_conversations.extend(period)
+                month_decisions.append(decision)
+
+            adherence = max(0.2, min(0.95, rng.gauss(0.5 + (month - 1) * 0.05, 0.1)))
+            week_start = onboarded + timedelta(weeks=(month - 1) * 4)
+            metrics.append({
+                "member_id": member_id,
+                "week_start": week_start.isoformat(),
+                "week_end": (week_start + timedelta(weeks=3)).isoformat(),
+                "week_start_at": to_epoch(week_start.isoformat()),
+                "month": month,
+                "week_number": (month - 1) * 4 + 1,
+                "adherence_estimate": round(adherence, 3),
+                "hours_committed": round(adherence * 10, 2),
+                "key_events": [c["id"] for c in month_conversations[::10]],
+                "notes": f"Month {month} progress tracking",
+                "ai_insights": f"Adherence pattern shows {adherence:.1%} commitment level"
+            })
+            events.extend(self._events(rng, member_id, month, onboarded, month_conversations, month_decisions))
+            conversations.extend(month_conversations)
+            decisions.extend(month_decisions)
+
+        return {
+            "conversations": conversations,
+            "decisions": decisions,
+            "health_events": events,
+            "member_metrics": metrics,
+            "team_metrics": journey_service.generate_team_metrics_from_conversations(conversations, member_id),
+        }
+
+    def _tags(self, template: str, month: int, week: int) -> List[str]:
+        # Fill-ins (places, days, numbers) never contain tag keywords, so tags depend on the template only
+        key = (template, month, week)
+        tags = self._tag_cache.get(key)
+        if tags is None:
+            tags = self._tag_cache[key] = journey_service.generate_tags_for_message(template, month, week)
+        return list(tags)
+
+    def _week_conversations(self, rng: random.Random, member: Dict[str, Any], month: int, week: int,
+                            week_start: date, travel_context: str) -> List[Dict[str, Any]]:
+        day_labels = [(week_start + timedelta(days=offset)).isoformat() for offset in range(7)]
+        first_epoch = to_epoch(day_labels[0])
+        day_epochs = [first_epoch + offset * 86400 for offset in range(7)]
+
+        conversations = []
+        count = max(1, int(rng.gauss(self.messages_per_week, self.messages_per_week / 4)))
+        for _ in range(count):
+            if rng.random() < 0.35:
+                sender, role = member["preferred_name"], "member"
+            else:
+                sender = rng.choice(TEAM_SENDERS)
+                role = self.roles[sender]
+            template = rng.choice(MESSAGE_TEMPLATES.get(role, MESSAGE_TEMPLATES["concierge"]))
+            text = template.format(place=rng.choice(member["travel_hubs"]), value=rng.randint(5, 95),
+                                   day=rng.choice(DAYS))
+            day, hour, minute = rng.randrange(7), rng.randint(6, 22), rng.randrange(60)
+            conversations.append({
+                "id": self._id(rng),
+                "member_id": member["id"],
+                "date": day_labels[day],
+                "time": f"{hour:02d}:{minute:02d}",
+                "occurred_at": day_epochs[day] + hour * 3600 + minute * 60,
+                "sender": sender,
+                "role": role,
+                "text": text,
+                "tags": self._tags(template, month, week),
+                "relates_to": None,
+                "month": month,
+                "week_number": week,
+                "travel_context": travel_context,
+                "ai_generated": False,
+                "ai_model": "synthetic",
+                "ai_prompt": None,
+            })
+        conversations.sort(key=lambda c: (c["occurred_at"], c["id"]))
+        return conversations
+
+    def _decision(self, rng: random.Random, member_id: int, month: int, week: int,
+                  period: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "id": self._id(rng),
+            "member_id": member_id,
+            "date": period[0]["date"],
+            "occurred_at": to_epoch(period[0]["date"]),
+            "title": f"Month {month} Week {week} Health Decision",
+            "reason": f"Health optimization decision based on {len(period)} conversations",
+            "decision_type": journey_service.determine_decision_type(period),
+            "month": month,
+            "week_number": week,
+            "triggered_by_conversation": period[0]["id"],
+            "supporting_conversations": [c["id"] for c in period],
+            "effects": [],
+            "ai_generated": False,
+            "ai_reasoning": "Synthetic decision",
+            "confidence_score": round(rng.uniform(0.5, 0.95), 2)
+        }
+
+    def _events(self, rng: random.Random, member_id: int, month: int, onboarded: date,
+                conversations: List[Dict[str, Any]], decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """A diagnostic panel every third month and a plan update in travel-heavy months"""
+        planned = []
+        if month % 3 == 1:
+            planned.append(("diagnostic_test", f"Month {month} Diagnostic Panel",
+                            {"type": "full_panel", "description": "Comprehensive health assessment"}))
+        if rng.random() < 0.5:
+            planned.append(("plan_modification", f"Month {month} Plan Update",
+                            {"reason": "Travel constraints and adherence optimization",
+                             "description": "Health plan optimization"}))
+
+        events = []
+        for event_type, title, details in planned:
+            week = (month - 1) * 4 + rng.randint(1, 4)
+            day = (onboarded + timedelta(weeks=week - 1)).isoformat()
+            events.append({
+                "id": self._id(rng),
+                "member_id": member_id,
+                "date": day,
+                "occurred_at": to_epoch(day),
+                "event_type": event_type,
+                "title": title,
+                "details": {"month": month, "week": week, **details},
+                "month": month,
+                "week_number": week,
+                "linked_conversations": [c["id"] for c in conversations if c["week_number"] == week],
+                "linked_decisions": [d["id"] for d in decisions if d["week_number"] == week],
+                "ai_generated": False,
+                "ai_context": "Synthetic event"
+            })
+        return events
+
+    def _batches(self, first_id: int, members: int, batch_members: int) -> Iterator[Tuple[int, int]]:
+        for start in range(first_id, first_id + members, batch_members):
+            yield start, min(start + batch_members, first_id + members)
+
+    def load(self, db: Session, members: int, months: int = 8, first_id: Optional[int] = None,
+             batch_members: int = 200) -> Dict[str, Any]:
+        """Generate and bulk insert `members` journeys, committing every `batch_members` members"""
+        if first_id is None:
+            first_id = (db.query(func.max(Member.id)).scalar() or 0) + 1
+
+        counts = {"members": 0, "conversations": 0, "decisions": 0, "health_events": 0,
+                  "member_metrics": 0, "team_metrics": 0}
+        tables = [("conversations", Conversation), ("decisions", Decision), ("health_events", HealthEvent),
+                  ("member_metrics", MemberMetrics), ("team_metrics", TeamMetrics)]
+        started = time.perf_counter()
+
+        for start, stop in self._batches(first_id, members, batch_members):
+            member_rows = [self.member(member_id) for member_id in range(start, stop)]
+            rows = {name: [] for name, _ in tables}
+            for member in member_rows:
+                for name, journey_rows in self.journey(member, months).items():
+                    rows[name].extend(journey_rows)
+
+            # Table-level inserts skip the ORM bulk persistence layer; executemany does the rest
+            db.execute(insert(Member.__table__), member_rows)
+            for name, model in tables:
+                if rows[name]:
+                    db.execute(insert(model.__table__), dictionary_encoder.encode_rows(db, model, rows[name]))
+                counts[name] += len(rows[name])
+            rollup_service.rebuild(db, range(start, stop))
+            db.commit()
+
+            counts["members"] += len(member_rows)
+            print(f"📦 Members {start}-{stop - 1}: {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+
+        counts["first_id"] = first_id
+        counts["seconds"] = round(time.perf_counter() - started, 2)
+        return counts
@@ -0,0 +1,334 @@
+import re
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.database import Conversation, Decision, TaxonomyCategory
+from app.services.response_cache import mark_members_dirty
+
+DEFAULT_DECISION_TYPE = "general_health"
+
+# Built-in taxonomy, used until the taxonomy_categories table has rows
+DEFAULT_TAXONOMY = [
+    {"kind": "tag", "name": "diagnostic", "keywords": ["test", "diagnostic", "panel"],
+     "tags": ["diagnostic", "medical"], "priority": 10},
+    {"kind": "tag", "name": "exercise", "keywords": ["exercise", "workout", "training"],
+     "tags": ["exercise", "fitness"], "priority": 20},
+    {"kind": "tag", "name": "nutrition", "keywords": ["nutrition", "diet", "food"],
+     "tags": ["nutrition", "diet"], "priority": 30},
+    {"kind": "tag", "name": "travel", "keywords": ["travel", "trip", "flight"],
+     "tags": ["travel", "scheduling"], "priority": 40},
+    {"kind": "tag", "name": "progress", "keywords": ["progress", "improvement", "results"],
+     "tags": ["progress", "results"], "priority": 50},
+    {"kind": "decision_type", "name": "diagnostic_test", "keywords": ["test", "diagnostic", "panel"],
+     "tags": [], "priority": 10},
+    {"kind": "decision_type", "name": "exercise_plan", "keywords": ["exercise", "workout", "training"],
+     "tags": [], "priority": 20},
+    {"kind": "decision_type", "name": "nutrition_plan", "keywords": ["nutrition", "diet", "food"],
+     "tags": [], "priority": 30},
+    {"kind": "decision_type", "name": "medication", "keywords": ["medication", "supplement", "vitamin"],
+     "tags": [], "priority": 40},
+]
+TAXONOMY_KINDS = ("tag", "decision_type")
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation of `keywords` factored into a character trie.
+
+    `re` tries alternatives one by one at every position; sharing prefixes
+    means each position only follows the branch of its own first character,
+    so scanning cost stays flat as the taxonomy grows. Optional tails are
+    greedy, so the longest keyword starting at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" not in node:
+            return body
+        return ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+
+    return build(trie)
+
+class CompiledTaxonomy:
+    """A taxonomy compiled into one trie-shaped regular expression for tagging.
+
+    Tag and decision categories share the expression. A single
+    non-overlapping scan finds the longest keyword at each match
+    position. Keywords hidden by a match are recovered without rescanning:
+    those inside it come from a per-keyword substring closure, and those that
+    start inside it and run past its end are a short precomputed candidate
+    list checked with `in`. The result is exactly the substring semantics of
+    `any(word in text for word in keywords)` for every category at once.
+    """
+
+    def __init__(self, categories: Iterable[Dict[str, Any]]):
+        ordered = sorted((c for c in categories if c.get("enabled", True) and c["kind"] in TAXONOMY_KINDS),
+                         key=lambda c: (TAXONOMY_KINDS.index(c["kind"]), c.get("priority", 100), c["name"]))
+        self.categories = ordered
+        self.tag_categories = [i for i, c in enumerate(ordered) if c["kind"] == "tag"]
+        # Decision categories sort by priority, so the lowest matched index is the highest priority
+        self.decision_names = {i: c["name"] for i, c in enumerate(ordered) if c["kind"] == "decision_type"}
+
+        owners: Dict[str, set] = {}
+        for index, category in enumerate(ordered):
+            for keyword in category["keywords"]:
+                keyword = keyword.lower()
+                if keyword:
+                    owners.setdefault(keyword, set()).add(index)
+
+        by_prefix: Dict[str, List[str]] = {}
+        for keyword in owners:
+            for end in range(1, len(keyword)):
+                by_prefix.setdefault(keyword[:end], []).append(keyword)
+
+        # Categories implied by a match of each keyword: its own and those of every keyword inside it
+        self.categories_for: Dict[str, FrozenSet[int]] = {}
+        # Keywords that may start inside a match of each keyword and end after it
+        self.overlaps: Dict[str, Tuple[str, ...]] = {}
+        for keyword in owners:
+            inside = [owners[keyword[i:j]] for i in range(len(keyword)) for j in range(i + 1, len(keyword) + 1)
+                      if keyword[i:j] in owners]
+            self.categories_for[keyword] = frozenset().union(*inside)
+            self.overlaps[keyword] = tuple(sorted({other for start in range(1, len(keyword))
+                                                   for other in by_prefix.get(keyword[start:], ())}))
+
+        # Best decision category implied by each keyword, and the overlapping keywords that could beat it
+        no_decision = len(ordered)
+        self.decision_rank: Dict[str, int] = {
+            keyword: min((i for i in implied if i in self.decision_names), default=no_decision)
+            for keyword, implied in self.categories_for.items()
+        }
+        self.decision_overlaps: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in self.overlaps[keyword]
+                           if self.decision_rank[other] < self.decision_rank[keyword])
+            for keyword in owners
+        }
+        self.top_decision = min(self.decision_names, default=no_decision)
+
+        self.pattern = re.compile(trie_pattern(owners)) if owners else None
+
+    def _resolve(self, text: str, found: Iterable[str]) -> FrozenSet[int]:
+        matched = frozenset().union(*(self.categories_for[keyword] for keyword in found))
+        for keyword in {other for keyword in found for other in self.overlaps[keyword]}:
+            implied = self.categories_for[keyword]
+            if not implied <= matched and keyword in text:
+                matched |= implied
+        return matched
+
+    def match(self, text: str) -> FrozenSet[int]:
+        """Indexes of every category with a keyword in `text` (already lowercased)"""
+        if self.pattern is None:
+            return frozenset()
+        found = set(self.pattern.findall(text))
+        return self._resolve(text, found) if found else frozenset()
+
+    def match_batch(self, texts: Sequence[str]) -> List[FrozenSet[int]]:
+        """match() for many lowercased texts"""
+        if self.pattern is None:
+            return [frozenset()] * len(texts)
+        findall, resolve = self.pattern.findall, self._resolve
+        return [resolve(text, found) if found else frozenset() for text, found in ((t, findall(t)) for t in texts)]
+
+    def tags(self, matched: FrozenSet[int], month: Any, week: Any) -> List[str]:
+        tags = [f"month_{month}", f"week_{week}"]
+        for index in self.tag_categories:
+            if index in matched:
+                tags.extend(self.categories[index]["tags"])
+        return tags
+
+    def decision_type(self, texts: Iterable[str]) -> str:
+        """Highest priority decision category matched by any of a period's messages (already lowercased).
+
+        Each message is scanned once with the shared expression and only its
+        best decision hit is kept, stopping early once the top priority
+        category has matched.
+        """
+        if self.pattern is None or not self.decision_names:
+            return DEFAULT_DECISION_TYPE
+        best = len(self.categories)
+        findall, rank, overlaps = self.pattern.findall, self.decision_rank, self.decision_overlaps
+        for text in texts:
+            for keyword in findall(text):
+                if rank[keyword] < best:
+                    best = rank[keyword]
+                for other in overlaps[keyword]:
+                    if rank[other] < best and other in text:
+                        best = rank[other]
+            if best == self.top_decision:
+                break
+        return self.decision_names.get(best, DEFAULT_DECISION_TYPE)
+
+class TaggingEngine:
+    """Message tagging and decision classification driven by the taxonomy table.
+
+    The enabled taxonomy_categories rows are compiled once into a
+    CompiledTaxonomy and swapped in atomically; commits that change the table
+    mark it stale and the next `ensure_loaded` recompiles it, so categories
+    can be added or edited without code changes. An empty or missing table
+    falls back to DEFAULT_TAXONOMY, which matches the original keyword rules.
+    """
+
+    RETAG_BATCH_SIZE = 5000
+
+    def __init__(self):
+        self._compiled = CompiledTaxonomy(DEFAULT_TAXONOMY)
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def compiled(self) -> CompiledTaxonomy:
+        return self._compiled
+
+    def load(self, db: Session) -> CompiledTaxonomy:
+        """Compile the taxonomy currently stored in the database"""
+        rows = []
+        if inspect(db.get_bind()).has_table(TaxonomyCategory.__tablename__):
+            rows = [self._to_dict(row) for row in db.query(TaxonomyCategory).all()]
+        compiled = CompiledTaxonomy(rows or DEFAULT_TAXONOMY)
+        with self._lock:
+            self._compiled = compiled
+            self._loaded = True
+        return compiled
+
+    def ensure_loaded(self, db: Session) -> CompiledTaxonomy:
+        if not self._loaded:
+            return self.load(db)
+        return self._compiled
+
+    def invalidate(self):
+        self._loaded = False
+
+    def seed_defaults(self, db: Session):
+        """Store the built-in taxonomy, so edits start from the rules in effect"""
+        if db.query(TaxonomyCategory).first() is None:
+            db.add_all(TaxonomyCategory(**category) for category in DEFAULT_TAXONOMY)
+            db.flush()
+
+    def _to_dict(self, row: TaxonomyCategory) -> Dict[str, Any]:
+        return {"kind": row.kind, "name": row.name, "keywords": row.keywords or [], "tags": row.tags or [],
+                "priority": row.priority, "enabled": row.enabled}
+
+    def categories(self) -> List[Dict[str, Any]]:
+        return [dict(category) for category in self._compiled.categories]
+
+    def tags(self, text: str, month: Any, week: Any) -> List[str]:
+        compiled = self._compiled
+        return compiled.tags(compiled.match(text.lower()), month, week)
+
+    def tags_batch(self, items: Sequence[Tuple[str, Any, Any]]) -> List[List[str]]:
+        """Tags for many (text, month, week) messages against one compiled taxonomy snapshot"""
+        compiled = self._compiled
+        matched = compiled.match_batch([text.lower() for text, _, _ in items])
+        return [compiled.tags(found, month, week) for found, (_, month, week) in zip(matched, items)]
+
+    def decision_type(self, texts: Iterable[str]) -> str:
+        """Decision type for a period: the highest priority category any of its texts matches"""
+        return self._compiled.decision_type(text.lower() for text in texts)
+
+    def decision_types(self, periods: Sequence[Sequence[str]]) -> List[str]:
+        """decision_type() for many periods' texts against one compiled taxonomy snapshot"""
+        compiled = self._compiled
+        return [compiled.decision_type(text.lower() for text in texts) for texts in periods]
+
+    def retag(self, db: Session, member_ids: Optional[Sequence[int]] = None, decisions: bool = False,
+              batch_size: int = RETAG_BATCH_SIZE) -> Dict[str, Any]:
+        """Recompute stored conversation tags (and optionally decision types) with the current taxonomy.
+
+        Walks the table in primary key order in batches, rewrites only rows
+        whose result changed and commits each batch.
+        """
+        self.load(db)
+        started = time.perf_counter()
+        stats = {"conversations": 0, "conversations_updated": 0, "decisions": 0, "decisions_updated": 0}
+        table = Conversation.__table__
+        set_tags = update(table).where(table.c.id == bindparam("b_id")).values(tags=bindparam("b_tags"))
+
+        last_id = ""
+        while True:
+            stmt = (select(table.c.id, table.c.member_id, table.c.text, table.c.month, table.c.week_number, table.c.tags)
+                    .where(table.c.id > last_id).order_by(table.c.id).limit(batch_size))
+            if member_ids:
+                stmt = stmt.where(table.c.member_id.in_(member_ids))
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+            new_tags = self.tags_batch([(row.text, row.month, row.week_number) for row in rows])
+            changed = [(row, tags) for row, tags in zip(rows, new_tags) if tags != row.tags]
+            if changed:
+                db.execute(set_tags, [{"b_id": row.id, "b_tags": tags} for row, tags in changed])
+                mark_members_dirty(db, {row.member_id for row, _ in changed})
+            db.commit()
+            stats["conversations"] += len(rows)
+            stats["conversations_updated"] += len(changed)
+            last_id = rows[-1].id
+            print(f"🏷️  Retagged {stats['conversations']:,} conversations ({stats['conversations_updated']:,} changed)")
+
+        if decisions:
+            self._retag_decisions(db, member_ids, batch_size, stats)
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+        return stats
+
+    def _retag_decisions(self, db: Session, member_ids: Optional[Sequence[int]], batch_size: int,
+                         stats: Dict[str, Any]):
+        table, conversations = Decision.__table__, Conversation.__table__
+        set_type = update(table).where(table.c.id == bindparam("b_id")).values(decision_type=bindparam("b_type"))
+
+        last_id = ""
+        while True:
+            stmt = (select(table.c.id, table.c.member_id, table.c.decision_type, table.c.supporting_conversations)
+                    .where(table.c.id > last_id).order_by(table.c.id).limit(batch_size))
+            if member_ids:
+                stmt = stmt.where(table.c.member_id.in_(member_ids))
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+
+            wanted = list({cid for row in rows for cid in (row.supporting_conversations or [])})
+            texts = {}
+            for start in range(0, len(wanted), 500):
+                texts.update(db.execute(select(conversations.c.id, conversations.c.text)
+                                        .where(conversations.c.id.in_(wanted[start:start + 500]))).all())
+
+            supporting = [[texts[cid] for cid in (row.supporting_conversations or []) if cid in texts] for row in rows]
+            changed = []
+            for row, period, decision_type in zip(rows, supporting, self.decision_types(supporting)):
+                if period and decision_type != row.decision_type:
+                    changed.append({"b_id": row.id, "b_type": decision_type, "member_id": row.member_id})
+            if changed:
+                db.execute(set_type, [{"b_id": c["b_id"], "b_type": c["b_type"]} for c in changed])
+                mark_members_dirty(db, {c["member_id"] for c in changed})
+            db.commit()
+            stats["decisions"] += len(rows)
+            stats["decisions_updated"] += len(changed)
+            last_id = rows[-1].id
+            print(f"🏷️  Reclassified {stats['decisions']:,} decisions ({stats['decisions_updated']:,} changed)")
+
+TAXONOMY_CHANGED_KEY = "taxonomy_changed"
+
+@event.listens_for(Session, "after_flush")
+def _collect_taxonomy_changes(session: Session, flush_context):
+    if any(isinstance(obj, TaxonomyCategory) for obj in list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info[TAXONOMY_CHANGED_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _reload_committed_taxonomy(session: Session):
+    if session.info.pop(TAXONOMY_CHANGED_KEY, False):
+        tagging_engine.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_taxonomy_changes(session: Session):
+    session.info.pop(TAXONOMY_CHANGED_KEY, None)
+
+# Global tagging engine instance
+tagging_engine = TaggingEngine()
@@ -0,0 +1,131 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, bindparam, func, select, type_coerce, update
+from sqlalchemy.orm import Session
+from sqlalchemy.types import NullType
+
+from app.models.compression import CompressedText, text_codec, zstandard
+from app.models.database import Base, CompressionDictionary
+
+def compressed_columns() -> List[Tuple[Table, Any]]:
+    """(table, column) for every CompressedText column"""
+    return [(table, column) for table in Base.metadata.sorted_tables for column in table.columns
+            if isinstance(column.type, CompressedText)]
+
+def stored_size(value) -> int:
+    return len(value) if isinstance(value, (bytes, memoryview)) else len(value.encode())
+
+class TextCompressionService:
+    """Train compression dictionaries and move existing rows to them.
+
+    A dictionary is trained on a random sample of every compressed column,
+    since the LLM prose in them shares most of its phrasing. Recompression
+    walks each table in primary key order, rewrites only rows whose stored
+    form changes (plain to compressed, an older dictionary to the active
+    one, or back to plain text) and commits each batch, so it can be
+    interrupted and run again. Stored values are read and written raw,
+    bypassing the column type, so the outcome doesn't depend on
+    TEXT_COMPRESSION.
+    """
+
+    SAMPLES = 20000
+    DICTIONARY_BYTES = 64 * 1024
+    BATCH_SIZE = 2000
+
+    def load(self, db: Session):
+        """Register the stored dictionaries with the codec, oldest first so the newest is active"""
+        for row in db.query(CompressionDictionary).order_by(CompressionDictionary.id):
+            text_codec.add(row.dict_id, row.data)
+
+    def sample(self, db: Session, samples: int = SAMPLES) -> List[bytes]:
+        """Up to `samples` random non-empty values, spread evenly over the compressed columns"""
+        columns = compressed_columns()
+        values = []
+        for table, column in columns:
+            values.extend(value.encode() for value in db.execute(
+                select(column).where(column.isnot(None), column != "")
+                .order_by(func.random()).limit(samples // len(columns))
+            ).scalars())
+        return values
+
+    def train(self, db: Session, samples: int = SAMPLES, size: int = DICTIONARY_BYTES) -> Dict[str, Any]:
+        """Train a dictionary on the corpus, store it and make it the active one"""
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        started = time.perf_counter()
+        values = self.sample(db, samples)
+        sample_bytes = sum(len(value) for value in values)
+        if len(values) < 100:
+            raise ValueError(f"Only {len(values)} values to train on; generate some journeys first")
+        # zstd needs the samples to be many times larger than the dictionary
+        size = min(size, max(1024, sample_bytes // 10))
+        dictionary = zstandard.train_dictionary(size, values, level=text_codec.level)
+
+        row = CompressionDictionary(dict_id=dictionary.dict_id(), data=dictionary.as_bytes(),
+                                    samples=len(values), sample_bytes=sample_bytes)
+        db.add(row)
+        db.commit()
+        text_codec.add(row.dict_id, row.data)
+
+        trial = values[:1000]
+        packed = sum(stored_size(text_codec.pack(value.decode())) for value in trial)
+        return {
+            "dict_id": row.dict_id,
+            "dictionary_bytes": len(row.data),
+            "samples": len(values),
+            "sample_bytes": sample_bytes,
+            "sample_ratio": round(sum(len(value) for value in trial) / packed, 2) if packed else None,
+            "seconds": round(time.perf_counter() - started, 2)
+        }
+
+    def recompress(self, db: Session, decompress: bool = False, batch_size: int = BATCH_SIZE,
+                   dry_run: bool = False) -> Dict[str, Any]:
+        """Rewrite stored values with the active dictionary, or as plain text with `decompress`"""
+        self.load(db)
+        if not decompress and text_codec.active_dictionary is None:
+            raise ValueError("No compression dictionary; run with --train first")
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {"rows": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0, "columns": {}}
+
+        for table, column in compressed_columns():
+            name = f"{table.name}.{column.name}"
+            column_stats = stats["columns"][name] = {"rows": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+            raw = type_coerce(column, NullType())
+            set_value = (update(table).where(table.c.id == bindparam("b_id"))
+                         .values({column.name: type_coerce(bindparam("b_value"), NullType())}))
+
+            last_id: Optional[Any] = None
+            while True:
+                stmt = select(table.c.id, raw.label("stored")).where(column.isnot(None))
+                if last_id is not None:
+                    stmt = stmt.where(table.c.id > last_id)
+                rows = db.execute(stmt.order_by(table.c.id).limit(batch_size)).all()
+                if not rows:
+                    break
+
+                changes = []
+                for row in rows:
+                    value = text_codec.decompress(row.stored)
+                    target = value if decompress else text_codec.pack(value)
+                    column_stats["bytes_before"] += stored_size(row.stored)
+                    column_stats["bytes_after"] += stored_size(target)
+                    if target != row.stored:
+                        changes.append({"b_id": row.id, "b_value": target})
+                if changes and not dry_run:
+                    db.execute(set_value, changes)
+                db.commit()
+                column_stats["rows"] += len(rows)
+                column_stats["rewritten"] += len(changes)
+                last_id = rows[-1].id
+            print(f"🗜️  {name}: {column_stats['rewritten']:,} of {column_stats['rows']:,} rows rewritten, "
+                  f"{column_stats['bytes_before'] / 1024:,.0f} → {column_stats['bytes_after'] / 1024:,.0f} KiB")
+
+            for key in ("rows", "rewritten", "bytes_before", "bytes_after"):
+                stats[key] += column_stats[key]
+        stats["dry_run"] = dry_run
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+        return stats
+
+# Global text compression service instance
+text_compression_service = TextCompressionService()
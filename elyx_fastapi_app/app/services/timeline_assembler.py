@@ -0,0 +1,261 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import String, cast, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.services.pagination import (
+    Cursor, after_cursor, after_timestamp, encode_cursor, keyset_order, paginate, until_timestamp
+)
+from app.services.projections import EntitySpec, CONVERSATIONS, TIMELINE_ENTITIES
+from app.services.serialization import dumps, loads
+from app.services.timestamps import apply_time_range
+
+class TimelineAssembler:
+    """Builds the journey timeline in a single database round trip.
+
+    Every requested entity set becomes one branch of a UNION ALL that returns
+    plain (kind, timestamp, id, payload) tuples, where payload is a JSON object
+    built by the database from only the requested columns. Rows are decoded
+    and bucketed in one pass, without hydrating ORM entities.
+    """
+
+    KIND_ORDER = {spec.name: rank for rank, spec in enumerate(TIMELINE_ENTITIES)}
+    JSON_OBJECT_DIALECTS = ("sqlite", "postgresql", "mysql")
+    STREAM_BATCH_SIZE = 500
+
+    def _branch(self, dialect: str, spec: EntitySpec, names: List[str], member_id: int,
+                start: Optional[int], end: Optional[int]):
+        """One UNION ALL branch: the entity's rows as (kind, ts, id, payload)"""
+        stmt = select(
+            literal(self.KIND_ORDER[spec.name]).label("kind"),
+            spec.ts_column.label("ts"),
+            cast(spec.id_column, String).label("row_id"),
+            spec.json_object(dialect, names).label("payload")
+        ).where(spec.model.member_id == member_id)
+
+        if start is not None:
+            stmt = stmt.where(spec.ts_column >= start)
+        if end is not None:
+            stmt = stmt.where(spec.ts_column <= end)
+        return stmt
+
+    def _conversation_page(self, stmt, cursor: Optional[Cursor], limit: Optional[int]):
+        """Apply the keyset seek and page limit (plus one lookahead row) to the conversation branch"""
+        ts_column, id_column = CONVERSATIONS.ts_column, CONVERSATIONS.id_column
+        if cursor is not None:
+            stmt = stmt.where(after_cursor(ts_column, id_column, cursor))
+        if limit is None:
+            return stmt, None
+
+        order = keyset_order(ts_column, id_column)
+        page = stmt.order_by(*order).limit(limit + 1).subquery()
+        keyset = select(ts_column).where(stmt.whereclause).order_by(*order)
+        # Another page follows, and the timestamp of this page's last conversation (NULL for legacy rows)
+        window = (keyset.offset(limit).limit(1).exists(), keyset.offset(limit - 1).limit(1).scalar_subquery())
+        return select(page), window
+
+    def assemble(self, db: Session, member_id: int, selected: Dict[str, List[str]],
+                 start: Optional[int] = None, end: Optional[int] = None,
+                 cursor: Optional[Cursor] = None, limit: Optional[int] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return the timeline dict and the next page token for one member"""
+        dialect = db.get_bind().dialect.name
+        if dialect not in self.JSON_OBJECT_DIALECTS:
+            return self._assemble_sequential(db, member_id, selected, start, end, cursor, limit)
+
+        branches = []
+        window = None
+        conversation_fields = selected.get(CONVERSATIONS.name, [])
+        if conversation_fields or limit is not None:
+            stmt = self._branch(dialect, CONVERSATIONS, conversation_fields, member_id, start, end)
+            stmt, window = self._conversation_page(stmt, cursor, limit)
+            branches.append(stmt)
+
+        for spec in TIMELINE_ENTITIES[1:]:
+            names = selected.get(spec.name)
+            if not names:
+                continue
+            stmt = self._branch(dialect, spec, names, member_id, start, end)
+            if cursor is not None:
+                stmt = stmt.where(after_timestamp(spec.ts_column, cursor[0]))
+            if window is not None:
+                more, window_end = window
+                # until_timestamp in SQL: a NULL window end keeps only rows without a timestamp
+                stmt = stmt.where(or_(~more, spec.ts_column.is_(None), spec.ts_column <= window_end))
+            branches.append(stmt)
+
+        timeline_data = {"member_id": member_id}
+        for name in selected:
+            timeline_data[name] = []
+        if not branches:
+            return timeline_data, None
+
+        union = union_all(*[select(branch.subquery()) for branch in branches]).subquery()
+        rows = db.execute(select(union).order_by(union.c.kind, union.c.ts.asc().nulls_first(), union.c.row_id)).all()
+        return self._build(rows, selected, timeline_data, limit)
+
+    def _build(self, rows, selected: Dict[str, List[str]], timeline_data: Dict[str, Any],
+               limit: Optional[int]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Decode payloads and bucket rows by entity set in a single pass"""
+        specs = [(spec, spec.name in selected) for spec in TIMELINE_ENTITIES]
+        conversation_count = 0
+        next_page_token = None
+
+        for kind, ts, row_id, payload in rows:
+            spec, wanted = specs[kind]
+            if kind == 0:
+                conversation_count += 1
+                if limit is not None and conversation_count > limit:
+                    next_page_token = encode_cursor(*last_conversation)
+                    continue
+                last_conversation = (ts, row_id)
+            if not wanted:
+                continue
+
+            timeline_data[spec.name].append(loads(payload))
+
+        return timeline_data, next_page_token
+
+    def stream(self, session_factory: Callable[[], Session], member_id: int, selected: Dict[str, List[str]],
+               start: Optional[int] = None, end: Optional[int] = None,
+               cursor: Optional[Cursor] = None, limit: Optional[int] = None,
+               fmt: str = "json") -> Iterator[bytes]:
+        """Yield the timeline incrementally as JSON or NDJSON chunks.
+
+        Each entity set is read in its (timestamp, id) index order with
+        `yield_per`, so rows are encoded and sent in fixed-size batches and
+        memory stays flat however long the journey is. The generator opens its
+        own session because it outlives the request's dependency scope; the
+        factory must give it a connection no other request uses (see
+        `StreamSessionLocal`), since its cursor stays open between chunks.
+
+        JSON mode produces the same document as the buffered endpoint. NDJSON
+        mode writes a `timeline` header line, one `{"type", "data"}` line per
+        entity and a closing `end` line carrying the next page token.
+        """
+        ndjson = fmt == "ndjson"
+        db = session_factory()
+        try:
+            dialect = db.get_bind().dialect.name
+            if ndjson:
+                yield dumps({"type": "timeline", "member_id": member_id}) + b"\n"
+            else:
+                yield b'{"success":true,"timeline":{"member_id":' + dumps(member_id)
+
+            page_end = None
+            next_page_token = None
+            for spec in TIMELINE_ENTITIES:
+                names = selected.get(spec.name, [])
+                paged = spec is CONVERSATIONS and limit is not None
+                if not names and not paged:
+                    continue
+                if names and not ndjson:
+                    yield b',"' + spec.name.encode() + b'":['
+
+                count = 0
+                emitted = 0
+                last_row = None
+                prefix = b'{"type":"' + spec.name.encode() + b'","data":'
+                for rows in self._stream_batches(db, dialect, spec, names, member_id, start, end,
+                                                 cursor, limit if paged else None, page_end):
+                    items = []
+                    strings = spec.strings(db, rows, names) if dialect not in self.JSON_OBJECT_DIALECTS else {}
+                    for row in rows:
+                        count += 1
+                        if paged and count > limit:
+                            next_page_token = encode_cursor(last_row.ts, last_row.row_id)
+                            page_end = (last_row.ts, last_row.row_id)
+                            break
+                        last_row = row
+                        if names:
+                            items.append(self._encode(dialect, spec, names, row, strings))
+                    if not items:
+                        continue
+                    if ndjson:
+                        yield b"".join(prefix + item + b"}\n" for item in items)
+                    else:
+                        yield (b"," if emitted else b"") + b",".join(items)
+                    emitted += len(items)
+
+                if names and not ndjson:
+                    yield b"]"
+
+            if ndjson:
+                yield dumps({"type": "end", "next_page_token": next_page_token}) + b"\n"
+            else:
+                yield b'},"next_page_token":' + dumps(next_page_token) + b"}"
+        finally:
+            db.close()
+
+    def _stream_batches(self, db: Session, dialect: str, spec: EntitySpec, names: List[str], member_id: int,
+                        start: Optional[int], end: Optional[int], cursor: Optional[Cursor],
+                        limit: Optional[int], page_end: Optional[Cursor]):
+        """Execute one entity set's ordered select and yield its rows in batches"""
+        if dialect in self.JSON_OBJECT_DIALECTS:
+            stmt = self._branch(dialect, spec, names, member_id, start, end)
+        else:
+            stmt = select(
+                *[spec.column(name).label(name) for name in names],
+                spec.ts_column.label("ts"),
+                cast(spec.id_column, String).label("row_id")
+            ).where(spec.model.member_id == member_id)
+            stmt = apply_time_range(stmt, spec.ts_column, start, end)
+
+        if cursor is not None:
+            if spec is CONVERSATIONS:
+                stmt = stmt.where(after_cursor(spec.ts_column, spec.id_column, cursor))
+            else:
+                stmt = stmt.where(after_timestamp(spec.ts_column, cursor[0]))
+        if page_end is not None:
+            stmt = stmt.where(until_timestamp(spec.ts_column, page_end[0]))
+        stmt = stmt.order_by(*keyset_order(spec.ts_column, spec.id_column))
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        result = db.execute(stmt, execution_options={"yield_per": self.STREAM_BATCH_SIZE})
+        yield from result.partitions()
+
+    def _encode(self, dialect: str, spec: EntitySpec, names: List[str], row, strings: Dict[int, str]) -> bytes:
+        """JSON bytes for one streamed row; database-built payloads are passed through untouched"""
+        if dialect in self.JSON_OBJECT_DIALECTS:
+            payload = row.payload
+            return payload if isinstance(payload, bytes) else payload.encode()
+        return dumps(spec.to_dict(row, names, strings))
+
+    def _assemble_sequential(self, db: Session, member_id: int, selected: Dict[str, List[str]],
+                             start: Optional[int], end: Optional[int],
+                             cursor: Optional[Cursor], limit: Optional[int]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Fallback for dialects without a JSON object function: one column select per entity set"""
+        timeline_data = {"member_id": member_id}
+        page_end = None
+        next_page_token = None
+
+        conversation_fields = selected.get(CONVERSATIONS.name, [])
+        if conversation_fields or limit is not None:
+            query = apply_time_range(
+                CONVERSATIONS.query(db, conversation_fields).filter(CONVERSATIONS.model.member_id == member_id),
+                CONVERSATIONS.ts_column, start, end
+            )
+            conversations, next_page_token = paginate(query, CONVERSATIONS.ts_column, CONVERSATIONS.id_column, cursor, limit)
+            page_end = (conversations[-1].occurred_at, conversations[-1].id) if next_page_token else None
+            if conversation_fields:
+                timeline_data[CONVERSATIONS.name] = CONVERSATIONS.to_dicts(db, conversations, conversation_fields)
+
+        for spec in TIMELINE_ENTITIES[1:]:
+            names = selected.get(spec.name)
+            if not names:
+                continue
+            query = apply_time_range(
+                spec.query(db, names).filter(spec.model.member_id == member_id),
+                spec.ts_column, start, end
+            )
+            if cursor is not None:
+                query = query.filter(after_timestamp(spec.ts_column, cursor[0]))
+            if page_end is not None:
+                query = query.filter(until_timestamp(spec.ts_column, page_end[0]))
+            timeline_data[spec.name] = spec.to_dicts(
+                db, query.order_by(*keyset_order(spec.ts_column, spec.id_column)).all(), names)
+
+        return timeline_data, next_page_token
+
+# Global timeline assembler instance
+timeline_assembler = TimelineAssembler()
@@ -0,0 +1,51 @@
+import calendar
+import re
+from datetime import datetime
+from typing import Optional
+
+DATE_FORMAT = "%Y-%m-%d"
+DATE_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# A `+hh:mm` offset whose `+` arrived URL-decoded as a space
+DECODED_PLUS_OFFSET = re.compile(r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?) (\d{2}:?\d{2})$")
+
+def to_epoch(date: str, time: Optional[str] = None) -> int:
+    """Convert a stored YYYY-MM-DD date (and optional HH:MM time) to Unix epoch seconds (UTC)"""
+    if time:
+        parsed = datetime.strptime(f"{date} {time}", DATE_TIME_FORMAT)
+    else:
+        parsed = datetime.strptime(date, DATE_FORMAT)
+    return calendar.timegm(parsed.timetuple())
+
+def datetime_to_epoch(value: datetime) -> int:
+    """Convert a naive datetime (treated as UTC) to Unix epoch seconds"""
+    return calendar.timegm(value.replace(second=0, microsecond=0).timetuple())
+
+def parse_time_bound(value: Optional[str], end: bool = False) -> Optional[int]:
+    """Parse a `from`/`to` query value into an inclusive epoch bound.
+
+    Accepts epoch seconds, YYYY-MM-DD or an ISO datetime. A bare date used as
+    an upper bound covers the whole day. Datetimes with a UTC offset (or `Z`)
+    are converted to UTC; naive ones are taken as UTC.
+    """
+    if value is None or value == "":
+        return None
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    try:
+        if len(value) == 10:
+            bound = to_epoch(value)
+            return bound + 86399 if end else bound
+        parsed = datetime.fromisoformat(DECODED_PLUS_OFFSET.sub(r"\1+\2", value).replace("Z", "+00:00"))
+        return calendar.timegm(parsed.utctimetuple())
+    except ValueError:
+        raise ValueError(f"Invalid date bound '{value}', expected YYYY-MM-DD, ISO datetime or epoch seconds")
+
+def apply_time_range(query, column, start: Optional[int], end: Optional[int]):
+    """Restrict a query to an inclusive epoch range on an indexed timestamp column"""
+    if start is not None:
+        query = query.filter(column >= start)
+    if end is not None:
+        query = query.filter(column <= end)
+    return query
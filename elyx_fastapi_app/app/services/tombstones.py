@@ -0,0 +1,26 @@
+from sqlalchemy import String, cast, delete, event, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.database import Conversation, Decision, DeletedRow, HealthEvent, MemberMetrics, TeamMetrics
+
+# Journey tables whose deletions are recorded for incremental exports
+TRACKED_MODELS = (Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics)
+
+def delete_recorded(db: Session, model, *criteria) -> int:
+    """DELETE the rows of `model` matching `criteria`, leaving a tombstone for each.
+
+    The tombstones are copied with INSERT ... SELECT on the same criteria,
+    in the caller's transaction, so no ids pass through Python.
+    """
+    deleted = select(literal(model.__tablename__), cast(model.id, String), model.member_id).where(*criteria)
+    db.execute(insert(DeletedRow).from_select(["table_name", "row_id", "member_id"], deleted))
+    return db.execute(delete(model).where(*criteria)).rowcount
+
+@event.listens_for(Session, "before_flush")
+def _record_deleted_objects(session: Session, flush_context, instances):
+    # An object deleted and re-added under the same id in one flush is written as an UPDATE
+    added = {(type(obj), obj.id) for obj in session.new if isinstance(obj, TRACKED_MODELS)}
+    session.add_all([
+        DeletedRow(table_name=obj.__tablename__, row_id=str(obj.id), member_id=obj.member_id)
+        for obj in session.deleted if isinstance(obj, TRACKED_MODELS) and (type(obj), obj.id) not in added
+    ])
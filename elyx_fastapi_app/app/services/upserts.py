@@ -0,0 +1,48 @@
+import uuid
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# Namespace of the content-hash keys; changing it re-keys every generated row
+CONTENT_NAMESPACE = uuid.UUID("73abf227-cd13-4c62-b37f-b1444563095e")
+
+# Columns an upsert never overwrites: the original insert time is kept
+PRESERVED_COLUMNS = {"id", "created_at"}
+
+def content_id(*parts: Any) -> str:
+    """Deterministic UUID of a row's identifying content (UUID5 over the parts)"""
+    return str(uuid.uuid5(CONTENT_NAMESPACE, "\x1f".join(map(str, parts))))
+
+def upsert(db: Session, model, rows: List[Dict[str, Any]], index_elements: Sequence[str] = ("id",)) -> int:
+    """INSERT ... ON CONFLICT DO UPDATE `rows` keyed on `index_elements`, in the caller's transaction.
+
+    Rows must share the same keys. Core statements bypass the ORM session
+    events, so callers rebuild rollups for the members they wrote. Tables
+    with an `updated_at` column get it bumped on conflict, so incremental
+    exports pick the rewritten rows up.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    key = list(index_elements)
+    changed = [name for name in rows[0] if name not in key and name not in PRESERVED_COLUMNS]
+
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)
+        changes = {name: stmt.excluded[name] for name in changed}
+        if "updated_at" in table.c:
+            changes["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=key, set_=changes)
+        db.execute(stmt, rows)
+        return len(rows)
+
+    for row in rows:
+        conditions = [table.c[name] == row[name] for name in key]
+        result = db.execute(update(table).where(*conditions).values({name: row[name] for name in changed}))
+        if result.rowcount == 0:
+            db.execute(insert(table).values(**row))
+    return len(rows)
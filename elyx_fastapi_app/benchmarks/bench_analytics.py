@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Cohort analytics benchmark.
+
+Populates a throwaway SQLite database with thousands of members' weekly team
+metrics and monthly member metrics, then answers "average coach hours per
+intervention by month" the per-member way (one ORM query per member, summed
+in Python) and with the vectorised CohortAnalytics engine.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_analytics.py --members 5000 --runs 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base, Member, MemberMetrics, TeamMetrics
+from app.services.analytics_service import CohortAnalytics
+from bench_timeline import measure
+
+def populate(session_factory, members: int, seed: int = 7):
+    """Insert `members` members with 32 weekly team metrics and 8 monthly member metrics each"""
+    rng = random.Random(seed)
+    db = session_factory()
+    db.execute(insert(Member), [{
+        "id": member_id, "preferred_name": f"Member {member_id}", "dob": "1980-01-01", "age": 45, "gender": "Male",
+        "residence": "Singapore", "travel_hubs": [], "occupation": "Bench", "pa": "N/A", "tech_preferences": {},
+        "health_goals": [], "communication_preferences": {}, "scheduling_preferences": {}
+    } for member_id in range(1, members + 1)])
+
+    team_metrics, metrics = [], []
+    for member_id in range(1, members + 1):
+        for week in range(1, 33):
+            month = (week - 1) // 4 + 1
+            team_metrics.append({
+                "member_id": member_id, "date": "2026-01-01", "month": month, "week_number": week,
+                "doctor_hours": rng.choice([0.0, 0.25, 0.5, 1.0]), "coach_hours": rng.choice([0.25, 0.5, 0.75]),
+                "nutritionist_hours": rng.choice([0.0, 0.25, 0.5]), "physio_hours": rng.choice([0.0, 0.25]),
+                "concierge_hours": rng.choice([0.5, 0.75, 1.0]), "total_interventions": rng.randint(4, 24),
+                "linked_conversations": []
+            })
+        for month in range(1, 9):
+            adherence = min(0.95, max(0.2, rng.gauss(0.5 + month * 0.04, 0.1)))
+            metrics.append({
+                "member_id": member_id, "week_start": "2026-01-01", "week_end": "2026-01-28", "month": month,
+                "week_number": (month - 1) * 4 + 1, "adherence_estimate": adherence,
+                "hours_committed": adherence * 10, "key_events": []
+            })
+    db.execute(insert(TeamMetrics), team_metrics)
+    db.execute(insert(MemberMetrics), metrics)
+    db.commit()
+    db.close()
+
+def per_member(session_factory, members: int):
+    """What a client has to do today: fetch each member's team metrics and sum in Python"""
+    db = session_factory()
+    try:
+        coach, interventions = defaultdict(float), defaultdict(int)
+        for member_id in range(1, members + 1):
+            for tm in db.query(TeamMetrics).filter(TeamMetrics.member_id == member_id).all():
+                coach[tm.month] += tm.coach_hours
+                interventions[tm.month] += tm.total_interventions
+        return {month: coach[month] / interventions[month] for month in sorted(coach)}
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cohort analytics")
+    parser.add_argument("--members", type=int, default=5000, help="Members to generate")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+
+        print(f"📦 Populating {args.members} members ({args.members * 32} team metric rows)...")
+        populate(session_factory, args.members)
+
+        def vectorised(analytics):
+            db = session_factory()
+            try:
+                rows = analytics.team_hours(db, ["month"])
+                return {row["month"]: row["coach_hours_per_intervention"] for row in rows}
+            finally:
+                db.close()
+
+        expected = per_member(session_factory, args.members)
+        actual = vectorised(CohortAnalytics())
+        assert all(abs(expected[m] - actual[m]) < 1e-4 for m in expected), "results differ"
+
+        print(f"⏱️  Coach hours per intervention by month, {args.members} members, {args.runs} runs")
+        loop = measure("per-member ORM loop", lambda: per_member(session_factory, args.members), args.runs)
+        cold = measure("vectorised, cold (load + agg)", lambda: vectorised(CohortAnalytics()), args.runs)
+        warm_engine = CohortAnalytics()
+        vectorised(warm_engine)
+        warm = measure("vectorised, frames cached", lambda: vectorised(warm_engine), args.runs)
+        measure("adherence p25/p50/p75/p90", lambda: warm_engine.adherence(session_factory(), ["cohort", "month"]), args.runs)
+        measure("adherence rolling trend", lambda: warm_engine.adherence_trend(session_factory(), 4), args.runs)
+        print(f"🚀 Speedup: {loop / cold:.1f}x cold, {loop / warm:.0f}x with cached frames")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
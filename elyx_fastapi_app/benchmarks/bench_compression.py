@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Response compression benchmark.
+
+Populates a throwaway SQLite database, fetches the large read endpoints
+uncompressed through the app, then reports bytes on the wire and the CPU
+cost of each available encoding and level. Streamed bodies are compressed
+chunk by chunk with a flush per chunk, as the middleware does.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_compression.py --messages 12000 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+def compress_cost(encoder_cls, level: int, chunks, runs: int):
+    """Median CPU seconds and output size for compressing one response body"""
+    timings = []
+    size = 0
+    for _ in range(runs):
+        start = time.process_time()
+        encoder = encoder_cls(level)
+        if len(chunks) == 1:
+            size = len(encoder.compress(chunks[0], flush=False) + encoder.finish())
+        else:
+            size = sum(len(encoder.compress(chunk)) for chunk in chunks) + len(encoder.finish())
+        timings.append(time.process_time() - start)
+    return statistics.median(timings), size
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response compression")
+    parser.add_argument("--messages", type=int, default=12000, help="Conversations for the benchmark member")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per encoding and level")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.database import SessionLocal
+        from app.middleware.compression import available_encoders
+        from app.services.projections import select_timeline_fields
+        from app.services.timeline_assembler import timeline_assembler
+        from bench_timeline import populate
+
+        print(f"📦 Populating {args.messages} messages...")
+        populate(SessionLocal, args.messages)
+        client = TestClient(app)
+        identity = {"Accept-Encoding": "identity"}
+
+        bodies = {
+            "timeline": [client.get("/journey/journey/timeline/1", headers=identity).content],
+            "conversations": [client.get("/journey/journey/conversations/1", headers=identity).content],
+            "team-metrics (fields)": [client.get("/journey/journey/team-metrics/1?fields=date,doctor_hours,coach_hours",
+                                                 headers=identity).content],
+            "timeline stream=ndjson": list(timeline_assembler.stream(SessionLocal, 1, select_timeline_fields(None),
+                                                                     fmt="ndjson"))
+        }
+        levels = {"gzip": (1, 6, 9), "br": (1, 4, 6, 9), "zstd": (1, 3, 9, 15)}
+
+        for endpoint, chunks in bodies.items():
+            raw = sum(len(chunk) for chunk in chunks)
+            print(f"\n⏱️  {endpoint}: {raw / 1024:.0f} KiB in {len(chunks)} chunk(s)")
+            for name, encoder_cls in available_encoders().items():
+                for level in levels[name]:
+                    cpu, size = compress_cost(encoder_cls, level, chunks, args.runs)
+                    throughput = raw / cpu / 1024 / 1024 if cpu else float("inf")
+                    print(f"  {name:<5} level {level:>2}   wire {size / 1024:8.1f} KiB   ratio {raw / size:6.1f}x   "
+                          f"cpu {cpu * 1000:7.1f} ms   {throughput:7.0f} MiB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Parse/tag/derive pipeline micro-benchmark with a golden-output check.
+
+Runs the CPU-side JourneyService stages over a checked-in corpus of large
+episode outputs in the format the LLM returns (benchmarks/corpus/episodes.json.gz):
+
+    parse          parse_conversation_text, per episode
+    role           determine_role, per parsed sender
+    tags           generate_tags_for_message, per message
+    decision_type  determine_decision_type, per (month, week) period
+    team_metrics   generate_team_metrics_from_conversations, per journey
+
+and reports the median time per call, per message and per journey. Before
+timing, the pipeline's output is compared with benchmarks/corpus/golden.json.gz
+so an optimisation that changes any sender, role, text, tag, decision type or
+team-hours figure fails loudly. Generated ids and dates (content hashes, "now") are
+left out of the comparison.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_pipeline.py --runs 5
+    python benchmarks/bench_pipeline.py --update-golden      # after an intended behaviour change
+    python benchmarks/bench_pipeline.py --rebuild-corpus     # regenerate the corpus itself
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.journey_service import journey_service
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+CORPUS_PATH = CORPUS_DIR / "episodes.json.gz"
+GOLDEN_PATH = CORPUS_DIR / "golden.json.gz"
+
+# Sender spellings seen in LLM episode output, including ones determine_role does not know
+SENDERS = ["Rohan", "Rohan Patel", "Ruby (Concierge)", "Ruby", "Dr. Warren", "Dr. Warren (Medical Strategist)",
+           "Carla (Nutritionist)", "Rachel (PT)", "Advik (Performance Scientist)", "Neel (Concierge Lead)",
+           "Sarah (PA)", "Elyx Team", "[Day 2, 08:15] Ruby", "**Dr. Warren**"]
+MESSAGES = [
+    "Morning! Your diagnostic panel is booked for Thursday, fasting from 10pm please.",
+    "Landed in Seoul, the hotel gym looks decent. Will try the workout tomorrow morning.",
+    "Results: LDL at 3.1 mmol/L, ApoB 95 mg/dL. We'll discuss the test results on our call.",
+    "For the trip, pack the protein bars. Airport food options are limited, focus on the diet plan.",
+    "Zone 2 training block starts this week: 3 x 45 minutes, keep heart rate under 135.",
+    "Garmin data shows HRV improvement of 8% over two weeks, good progress on recovery.",
+    "Flight delayed again, can we move Friday's session? Travel is killing my routine.",
+    "Let's look at the bigger picture: your results this quarter justify the current plan.",
+    "Quick reminder to take the vitamin D supplement with breakfast.",
+    "I've coordinated with Sarah to block 7am slots for exercise next week.",
+    "The nutrition log shows too much late-night food after client dinners.",
+    "Blood pressure readings are stable, no medication changes needed.",
+    "Can you send the flight details so we can plan the physio around the trip?",
+    "Strength training progress is excellent, deadlift up 10kg since month one.",
+    "Sleep was poor last night, only 5 hours. Skipping training today.",
+    "Adjusting the meal plan: more fibre, fewer refined carbs, same protein target.",
+    "Sounds good, thanks!",
+    "👍",
+]
+NOISE = ["", "**Week {week} – {context}**", "---", "(No response over the weekend)", "Ok.",
+         "Note: the member was travelling this week"]
+
+def build_corpus(journeys: int = 4, lines_per_episode: int = 320, seed: int = 2025):
+    """Deterministic episode outputs shaped like the Groq responses journey generation parses"""
+    rng = random.Random(seed)
+    corpus = []
+    for journey in range(1, journeys + 1):
+        episodes = []
+        for month in range(1, 9):
+            week_start = (month - 1) * 4 + 1
+            context = f"Travel context {month}"
+            lines = []
+            for _ in range(lines_per_episode):
+                if rng.random() < 0.08:
+                    lines.append(rng.choice(NOISE).format(week=week_start + rng.randrange(4), context=context))
+                else:
+                    lines.append(f"{rng.choice(SENDERS)}: {rng.choice(MESSAGES)}")
+            episodes.append({"month": month, "week_start": week_start, "travel_context": context,
+                             "conversations": "\n".join(lines)})
+        corpus.append({"member_id": journey, "episodes": episodes})
+    return corpus
+
+def load_gz(path: Path):
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return json.load(handle)
+
+def save_gz(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mtime=0 keeps the checked-in files byte-identical across rebuilds
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as handle:
+        handle.write(json.dumps(data, indent=1, ensure_ascii=False).encode("utf-8"))
+
+def parse_journey(journey):
+    """Parsed conversations for one journey, as parse_conversations_from_journey builds them"""
+    return journey_service.parse_conversations_from_journey(journey, journey["member_id"])
+
+def periods(conversations):
+    grouped = {}
+    for convo in conversations:
+        grouped.setdefault((convo["month"], convo["week_number"]), []).append(convo)
+    return grouped
+
+def pipeline_output(corpus):
+    """The stable, comparable result of every stage for every journey"""
+    output = []
+    for journey in corpus:
+        conversations = parse_journey(journey)
+        team_metrics = journey_service.generate_team_metrics_from_conversations(conversations, journey["member_id"])
+        output.append({
+            "member_id": journey["member_id"],
+            "messages": [[c["sender"], c["role"], c["text"], c["tags"]] for c in conversations],
+            "decision_types": [[month, week, journey_service.determine_decision_type(rows)]
+                               for (month, week), rows in periods(conversations).items()],
+            "team_metrics": [[tm["month"], tm["week_number"], tm["doctor_hours"], tm["coach_hours"],
+                              tm["nutritionist_hours"], tm["physio_hours"], tm["concierge_hours"],
+                              tm["total_interventions"]] for tm in team_metrics],
+        })
+    return output
+
+def first_difference(expected, actual):
+    for journey_expected, journey_actual in zip(expected, actual):
+        for key in ("messages", "decision_types", "team_metrics"):
+            for index, (want, got) in enumerate(zip(journey_expected[key], journey_actual[key])):
+                if want != got:
+                    return f"member {journey_expected['member_id']} {key}[{index}]: expected {want}, got {got}"
+            if len(journey_expected[key]) != len(journey_actual[key]):
+                return (f"member {journey_expected['member_id']} {key}: expected {len(journey_expected[key])} "
+                        f"rows, got {len(journey_actual[key])}")
+    return f"expected {len(expected)} journeys, got {len(actual)}"
+
+def timed(fn, runs: int) -> float:
+    """Median seconds for fn() over `runs` runs"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the conversation parse/tag/derive pipeline")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite the golden output from the current code")
+    parser.add_argument("--rebuild-corpus", action="store_true", help="Regenerate the episode corpus (implies --update-golden)")
+    parser.add_argument("--out", help="Write timings as JSON to this file")
+    args = parser.parse_args()
+
+    if args.rebuild_corpus or not CORPUS_PATH.exists():
+        save_gz(CORPUS_PATH, build_corpus())
+        print(f"📦 Wrote corpus to {CORPUS_PATH}")
+        args.update_golden = True
+    corpus = load_gz(CORPUS_PATH)
+
+    output = pipeline_output(corpus)
+    if args.update_golden:
+        save_gz(GOLDEN_PATH, output)
+        print(f"💾 Wrote golden output to {GOLDEN_PATH}")
+    else:
+        golden = load_gz(GOLDEN_PATH)
+        if golden != output:
+            print(f"❌ Pipeline output differs from the golden corpus: {first_difference(golden, output)}")
+            sys.exit(1)
+        print("✅ Pipeline output matches the golden corpus")
+
+    episodes = [episode for journey in corpus for episode in journey["episodes"]]
+    conversations = [parse_journey(journey) for journey in corpus]
+    messages = [convo for journey in conversations for convo in journey]
+    all_periods = [rows for journey in conversations for rows in periods(journey).values()]
+    total_lines = sum(episode["conversations"].count("\n") + 1 for episode in episodes)
+    print(f"⏱️  {len(corpus)} journeys, {len(episodes)} episodes, {total_lines:,} lines, "
+          f"{len(messages):,} messages, {args.runs} runs")
+
+    stages = {
+        "parse": (lambda: [journey_service.parse_conversation_text(e["conversations"], e["month"], e["week_start"],
+                                                                    e["travel_context"]) for e in episodes], len(episodes)),
+        "role": (lambda: [journey_service.determine_role(c["sender"]) for c in messages], len(messages)),
+        "tags": (lambda: [journey_service.generate_tags_for_message(c["text"], c["month"], c["week_number"])
+                          for c in messages], len(messages)),
+        "decision_type": (lambda: [journey_service.determine_decision_type(rows) for rows in all_periods], len(all_periods)),
+        "team_metrics": (lambda: [journey_service.generate_team_metrics_from_conversations(rows, 1)
+                                  for rows in conversations], len(conversations)),
+    }
+
+    results = {}
+    for name, (fn, calls) in stages.items():
+        seconds = timed(fn, args.runs)
+        results[name] = {
+            "calls": calls,
+            "total_ms": round(seconds * 1000, 3),
+            "per_call_us": round(seconds / calls * 1e6, 3),
+            "per_message_us": round(seconds / len(messages) * 1e6, 3),
+            "per_journey_ms": round(seconds / len(corpus) * 1000, 3),
+        }
+        print(f"   {name:<14} {results[name]['total_ms']:9.2f} ms total   {results[name]['per_call_us']:9.2f} µs/call   "
+              f"{results[name]['per_message_us']:7.3f} µs/message   {results[name]['per_journey_ms']:7.2f} ms/journey")
+
+    end_to_end = timed(lambda: pipeline_output(corpus), args.runs)
+    results["end_to_end"] = {"total_ms": round(end_to_end * 1000, 3),
+                             "per_message_us": round(end_to_end / len(messages) * 1e6, 3),
+                             "per_journey_ms": round(end_to_end / len(corpus) * 1000, 3)}
+    print(f"   {'end to end':<14} {results['end_to_end']['total_ms']:9.2f} ms total   "
+          f"{results['end_to_end']['per_journey_ms']:7.2f} ms/journey")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        print(f"💾 Timings written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Read-path load benchmark.
+
+For each database size (counted in conversations) this populates a SQLite
+database with synthetic journeys, starts the API under uvicorn in a
+subprocess and drives the journey read endpoints with concurrent clients.
+It records throughput, p50/p95/p99 latency per endpoint and the server's
+peak RSS, writes everything as JSON and can compare a run against a saved
+baseline, exiting non-zero on regressions.
+
+The response cache is disabled by default so every request reaches the
+database; pass --cache to measure the cached path instead.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_read_path.py --sizes 1k,100k --out results.json
+    python benchmarks/bench_read_path.py --sizes 1k,100k,10M --keep-dir /data/bench --concurrency 16
+    python benchmarks/bench_read_path.py --sizes 1k,100k --baseline results.json --tolerance 0.2
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(APP_DIR))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base, Conversation, Decision, Member
+from app.services.synthetic_data import SyntheticDataGenerator
+
+MONTHS = 8
+MESSAGES_PER_WEEK = 20
+ENDPOINTS = {
+    "timeline": "/journey/journey/timeline/{member_id}",
+    "conversations": "/journey/journey/conversations/{member_id}",
+    "decisions": "/journey/journey/decisions/{member_id}",
+    "team_metrics": "/journey/journey/team-metrics/{member_id}",
+    "decision_context": "/journey/journey/decision-context/{decision_id}",
+}
+# Compared against the baseline: (metric, True if higher is better)
+REGRESSION_METRICS = [("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)]
+
+def parse_size(value: str) -> int:
+    """'1k', '100k', '10M' or a plain number of conversations"""
+    value = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * scale)
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def prepare_database(path: Path, conversations: int, seed: int) -> dict:
+    """Populate `path` with enough synthetic members for `conversations`, reusing a complete earlier run"""
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        db = session_factory()
+        try:
+            existing = db.execute(select(func.count()).select_from(Conversation)).scalar()
+            if existing < conversations * 0.9:
+                members = max(1, math.ceil(conversations / (MESSAGES_PER_WEEK * 4 * MONTHS)))
+                print(f"📦 Populating {members:,} members for ~{conversations:,} conversations in {path.name}...")
+                SyntheticDataGenerator(seed=seed, messages_per_week=MESSAGES_PER_WEEK).load(db, members, MONTHS, first_id=1)
+            else:
+                print(f"♻️  Reusing {path.name} ({existing:,} conversations)")
+            return {
+                "conversations": db.execute(select(func.count()).select_from(Conversation)).scalar(),
+                "member_ids": list(db.execute(select(Member.id)).scalars()),
+                "decision_ids": list(db.execute(select(Decision.id).order_by(func.random()).limit(2000)).scalars()),
+            }
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(db_path: Path, port: int, cache: bool) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    if not cache:
+        env["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+def peak_rss_mib(pid: int):
+    """High-water resident set size of a process (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+def drive(port: int, paths, concurrency: int) -> dict:
+    """Send every path once across `concurrency` keep-alive clients"""
+    local = threading.local()
+    latencies, errors, cache_hits = [], [0], [0]
+    lock = threading.Lock()
+
+    def request(path):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        start = time.perf_counter()
+        try:
+            local.connection.request("GET", path, headers={"Accept-Encoding": "identity"})
+            response = local.connection.getresponse()
+            response.read()
+            ok, hit = response.status == 200, response.getheader("X-Cache") == "HIT"
+        except (OSError, http.client.HTTPException):
+            local.connection.close()
+            del local.connection
+            ok, hit = False, False
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += not ok
+            cache_hits[0] += hit
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(request, paths))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(paths),
+        "errors": errors[0],
+        "cache_hits": cache_hits[0],
+        "throughput_rps": round(len(paths) / wall, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2),
+    }
+
+def request_paths(endpoint: str, dataset: dict, requests: int, rng: random.Random):
+    template = ENDPOINTS[endpoint]
+    if endpoint == "decision_context":
+        return [template.format(decision_id=rng.choice(dataset["decision_ids"])) for _ in range(requests)]
+    return [template.format(member_id=rng.choice(dataset["member_ids"])) for _ in range(requests)]
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Regressions of every metric beyond `tolerance` (relative) versus the baseline"""
+    regressions = []
+    for size, run in results["sizes"].items():
+        base_run = baseline.get("sizes", {}).get(size)
+        if not base_run:
+            continue
+        for endpoint, stats in run["endpoints"].items():
+            base = base_run["endpoints"].get(endpoint)
+            if not base:
+                continue
+            for metric, higher_is_better in REGRESSION_METRICS:
+                old, new = base[metric], stats[metric]
+                if not old:
+                    continue
+                change = (new - old) / old
+                if (-change if higher_is_better else change) > tolerance:
+                    regressions.append(f"{size} {endpoint} {metric}: {old} -> {new} ({change:+.0%})")
+        old_rss, new_rss = base_run.get("peak_rss_mib"), run.get("peak_rss_mib")
+        if old_rss and new_rss and (new_rss - old_rss) / old_rss > tolerance:
+            regressions.append(f"{size} peak_rss_mib: {old_rss} -> {new_rss} ({(new_rss - old_rss) / old_rss:+.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the journey read endpoints")
+    parser.add_argument("--sizes", default="1k,100k", help="Comma separated database sizes in conversations (1k,100k,10M)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma separated endpoints to drive")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per endpoint before measuring")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for data and request mix")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--keep-dir", help="Keep databases here and reuse them on later runs")
+    parser.add_argument("--out", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "sqlite": sqlite3.sqlite_version, "cpu_count": os.cpu_count()},
+        "settings": {"requests": args.requests, "concurrency": args.concurrency, "cache": args.cache, "seed": args.seed},
+        "sizes": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_dir = Path(args.keep_dir or tmp)
+        db_dir.mkdir(parents=True, exist_ok=True)
+        for label in [size.strip() for size in args.sizes.split(",") if size.strip()]:
+            db_path = db_dir / f"read_path_{label}.db"
+            dataset = prepare_database(db_path, parse_size(label), args.seed)
+            rng = random.Random(args.seed)
+            port = free_port()
+            server = start_server(db_path, port, args.cache)
+            try:
+                run = {"conversations": dataset["conversations"], "members": len(dataset["member_ids"]), "endpoints": {}}
+                print(f"⏱️  {label}: {dataset['conversations']:,} conversations, {args.requests} requests per endpoint, "
+                      f"{args.concurrency} clients")
+                for endpoint in endpoints:
+                    drive(port, request_paths(endpoint, dataset, args.warmup, rng), args.concurrency)
+                    stats = drive(port, request_paths(endpoint, dataset, args.requests, rng), args.concurrency)
+                    run["endpoints"][endpoint] = stats
+                    print(f"   {endpoint:<18} {stats['throughput_rps']:8.1f} req/s   p50 {stats['p50_ms']:8.1f} ms   "
+                          f"p95 {stats['p95_ms']:8.1f} ms   p99 {stats['p99_ms']:8.1f} ms   errors {stats['errors']}")
+                run["peak_rss_mib"] = peak_rss_mib(server.pid)
+                print(f"   peak RSS {run['peak_rss_mib']} MiB")
+            finally:
+                server.terminate()
+                server.wait()
+            results["sizes"][label] = run
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        print(f"💾 Results written to {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("settings") != results["settings"]:
+            print(f"⚠️  Baseline settings differ: {baseline.get('settings')} vs {results['settings']}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
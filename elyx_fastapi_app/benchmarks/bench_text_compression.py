@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Compressed text storage benchmark.
+
+Builds a plain-text SQLite corpus (synthetic journeys, or a copy of an
+existing database), then for each zstd level trains a dictionary on it,
+recompresses the text columns and vacuums. It reports the stored bytes of
+every compressed column and the file size, the per-value codec cost, read
+latency with and without the text fields (timeline JSON built in SQLite,
+and projected conversation rows) and bulk ingest time with compression
+on. Synthetic messages are short templates; measure a copy of a real
+corpus with --database for representative ratios.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_text_compression.py --members 50 --runs 5
+    python benchmarks/bench_text_compression.py --database elyx_journey.db --levels 3,9,19
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.compression import CompressedText, text_codec, zstandard
+from app.models.database import Base, Conversation, Member
+from app.services.deduplication import deduplication_service
+from app.services.projections import CONVERSATIONS, TIMELINE_ENTITIES, select_timeline_fields
+from app.services.synthetic_data import SyntheticDataGenerator
+from app.services.text_compression import compressed_columns, text_compression_service
+from app.services.timeline_assembler import timeline_assembler
+from bench_timeline import measure
+
+def open_database(path: Path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine)
+
+def storage(engine, path: Path) -> dict:
+    """Stored bytes per compressed column, and the vacuumed file size"""
+    deduplication_service.compact(engine)
+    sizes = {}
+    with engine.connect() as connection:
+        for table, column in compressed_columns():
+            sizes[f"{table.name}.{column.name}"] = connection.execute(text(
+                f"SELECT COALESCE(SUM(LENGTH(CAST({column.name} AS BLOB))), 0) FROM {table.name}"
+            )).scalar()
+    sizes["file"] = path.stat().st_size
+    return sizes
+
+def codec_cost(values, runs: int):
+    """Median microseconds per value to compress and to decompress with the active dictionary"""
+    packed = [text_codec.pack(value) for value in values]
+    compress, decompress = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for value in values:
+            text_codec.pack(value)
+        compress.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for value in packed:
+            text_codec.decompress(value)
+        decompress.append(time.perf_counter() - start)
+    return (statistics.median(compress) / len(values) * 1e6, statistics.median(decompress) / len(values) * 1e6)
+
+def read_latency(session_factory, member_ids, runs: int) -> dict:
+    with_text = select_timeline_fields(None)
+    without_text = {spec.name: [name for name in spec.fields if not isinstance(spec.fields[name].type, CompressedText)]
+                    for spec in TIMELINE_ENTITIES}
+    names = ["id", "date", "time", "sender", "role", "text", "tags"]
+    db = session_factory()
+    try:
+        def timeline(selected):
+            return lambda: [timeline_assembler.assemble(db, member_id, selected) for member_id in member_ids]
+
+        def conversations(fields):
+            return lambda: [CONVERSATIONS.to_dicts(db, CONVERSATIONS.query(db, fields)
+                                                   .filter(Conversation.member_id == member_id).all(), fields)
+                            for member_id in member_ids]
+
+        return {
+            "timeline": measure("  timeline (all fields)", timeline(with_text), runs),
+            "timeline_pruned": measure("  timeline (no text fields)", timeline(without_text), runs),
+            "conversations": measure("  conversation rows", conversations(names), runs),
+            "conversations_pruned": measure("  conversation rows, no text", conversations(names[:-2] + ["tags"]),
+                                            runs),
+        }
+    finally:
+        db.close()
+
+def ingest(session_factory, members: int, seed: int) -> float:
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        SyntheticDataGenerator(seed=seed + 1).load(db, members)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compressed text storage")
+    parser.add_argument("--members", type=int, default=50, help="Synthetic members to populate")
+    parser.add_argument("--database", help="Benchmark a copy of this SQLite database instead of synthetic data")
+    parser.add_argument("--levels", default="3,9,19", help="Comma-separated zstd levels")
+    parser.add_argument("--read-members", type=int, default=5, help="Members per timed read")
+    parser.add_argument("--ingest-members", type=int, default=10, help="Members inserted for the ingest timing")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if zstandard is None:
+        print("❌ zstandard is not installed")
+        sys.exit(1)
+    levels = [int(level) for level in args.levels.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path = Path(tmp) / "plain.db"
+        if args.database:
+            shutil.copyfile(args.database, plain_path)
+        engine, session_factory = open_database(plain_path)
+        db = session_factory()
+        try:
+            if args.database:
+                print(f"📦 Decompressing a copy of {args.database}...")
+                text_compression_service.recompress(db, decompress=True)
+            else:
+                print(f"📦 Populating {args.members} synthetic members...")
+                SyntheticDataGenerator(seed=args.seed).load(db, args.members, first_id=1)
+            member_ids = list(db.execute(select(Member.id).order_by(Member.id).limit(args.read_members)).scalars())
+            values = list(db.execute(select(Conversation.text).order_by(func.random()).limit(5000)).scalars())
+        finally:
+            db.close()
+        engine.dispose()
+
+        results = {}
+        for label, level in [("plain", None)] + [(f"zstd-{level}", level) for level in levels]:
+            path = Path(tmp) / f"{label}-run.db"
+            shutil.copyfile(plain_path, path)
+            engine, session_factory = open_database(path)
+            print(f"\n⏱️  {label}")
+            text_codec.enabled = level is not None
+            if level is not None:
+                text_codec.level = level
+                db = session_factory()
+                try:
+                    info = text_compression_service.train(db)
+                    text_compression_service.recompress(db)
+                finally:
+                    db.close()
+                compress_us, decompress_us = codec_cost(values, args.runs)
+                print(f"  dictionary {info['dictionary_bytes'] / 1024:.0f} KiB trained in {info['seconds']}s   "
+                      f"compress {compress_us:.1f} µs/value   decompress {decompress_us:.1f} µs/value")
+            results[label] = {"storage": storage(engine, path), "reads": read_latency(session_factory, member_ids,
+                                                                                      args.runs)}
+            results[label]["ingest"] = ingest(session_factory, args.ingest_members, args.seed)
+            print(f"  ingest {args.ingest_members} members          {results[label]['ingest'] * 1000:8.1f} ms")
+            engine.dispose()
+        text_codec.enabled = False
+
+        plain = results["plain"]
+        print("\n📊 Storage (KiB) and read latency relative to plain text")
+        columns = list(plain["storage"])
+        print(f"  {'':<10}" + "".join(f"{name:>28}" for name in columns))
+        for label, result in results.items():
+            print(f"  {label:<10}" + "".join(
+                f"{result['storage'][name] / 1024:>18,.0f} ({plain['storage'][name] / max(1, result['storage'][name]):4.2f}x)"
+                for name in columns))
+        for label, result in results.items():
+            reads = "   ".join(f"{name} {result['reads'][name] / plain['reads'][name]:.2f}x" for name in result["reads"])
+            print(f"  {label:<10} {reads}   ingest {result['ingest'] / plain['ingest']:.2f}x")
+
+if __name__ == "__main__":
+    main()
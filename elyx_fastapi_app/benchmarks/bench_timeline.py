@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Timeline assembly benchmark.
+
+Populates a throwaway SQLite database with one member holding 10k+ messages
+and compares the original per-entity ORM timeline build against the
+single-round-trip TimelineAssembler, then the buffered response against the
+streamed one for time-to-first-byte and peak Python memory.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/bench_timeline.py --messages 12000 --runs 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base, Member, Conversation, Decision, HealthEvent, MemberMetrics, TeamMetrics
+from app.services.dictionaries import dictionary_encoder
+from app.services.projections import select_timeline_fields
+from app.services.serialization import dumps
+from app.services.timeline_assembler import timeline_assembler
+
+SENDERS = [("Ruby (Concierge)", "concierge"), ("Dr. Warren", "doctor"), ("Carla", "nutritionist"),
+           ("Rachel", "coach"), ("Rohan", "member"), ("Advik", "data_analyst")]
+TEXT = ("Quick update on this week's plan: the diagnostic panel is booked, nutrition targets are "
+        "adjusted for travel and the exercise block moves to the hotel gym. ")
+
+def populate(session_factory, messages: int, member_id: int = 1):
+    """Insert one member with `messages` conversations and the derived entity sets"""
+    base_epoch = 1767225600  # 2026-01-01
+    db = session_factory()
+    db.add(Member(id=member_id, preferred_name="Bench Member", dob="1979-03-12", age=46, gender="Male",
+                  residence="Singapore", travel_hubs=["UK"], occupation="Bench", pa="N/A",
+                  tech_preferences={}, health_goals=[], communication_preferences={}, scheduling_preferences={}))
+    db.commit()
+
+    conversations = []
+    per_week = max(1, messages // 32)
+    for i in range(messages):
+        week = min(32, i // per_week + 1)
+        month = (week - 1) // 4 + 1
+        epoch = base_epoch + i * 1200
+        sender, role = SENDERS[i % len(SENDERS)]
+        conversations.append({
+            "id": str(uuid.UUID(int=i)), "member_id": member_id,
+            "date": time.strftime("%Y-%m-%d", time.gmtime(epoch)), "time": time.strftime("%H:%M", time.gmtime(epoch)),
+            "occurred_at": epoch, "sender": sender, "role": role, "text": TEXT * 2,
+            "tags": [f"month_{month}", f"week_{week}", "diagnostic", "medical"], "month": month, "week_number": week,
+            "travel_context": "Rohan has a 5-day trip to Seoul in Week 3", "ai_generated": True,
+            "ai_model": "groq", "ai_prompt": f"episode_{month}_conversation", "decision_impact": []
+        })
+    db.execute(insert(Conversation), dictionary_encoder.encode_rows(db, Conversation, conversations))
+
+    periods = {}
+    for convo in conversations:
+        periods.setdefault((convo["month"], convo["week_number"]), []).append(convo)
+
+    decisions, team_metrics, metrics, events = [], [], [], []
+    for (month, week), rows in periods.items():
+        first = rows[0]
+        decisions.append({
+            "id": str(uuid.uuid4()), "member_id": member_id, "date": first["date"], "occurred_at": first["occurred_at"],
+            "title": f"Month {month} Week {week} Health Decision", "reason": TEXT * 6, "decision_type": "diagnostic_test",
+            "month": month, "week_number": week, "triggered_by_conversation": first["id"],
+            "supporting_conversations": [r["id"] for r in rows], "effects": [], "ai_generated": True,
+            "ai_reasoning": TEXT, "confidence_score": 0.85
+        })
+        team_metrics.append({
+            "member_id": member_id, "date": first["date"], "occurred_at": first["occurred_at"], "month": month,
+            "week_number": week, "doctor_hours": 1.25, "coach_hours": 0.75, "nutritionist_hours": 0.5,
+            "physio_hours": 0.0, "concierge_hours": 1.0, "total_interventions": len(rows),
+            "linked_conversations": [r["id"] for r in rows]
+        })
+        if week % 4 == 1:
+            metrics.append({
+                "member_id": member_id, "week_start": first["date"], "week_end": first["date"],
+                "week_start_at": first["occurred_at"], "month": month, "week_number": week,
+                "adherence_estimate": 0.65, "hours_committed": 6.5, "key_events": [r["id"] for r in rows],
+                "notes": f"Month {month} progress tracking", "ai_insights": "Adherence pattern shows 65.0% commitment level"
+            })
+            events.append({
+                "id": str(uuid.uuid4()), "member_id": member_id, "date": first["date"], "occurred_at": first["occurred_at"],
+                "event_type": "diagnostic_test", "title": f"Month {month} Diagnostic Panel",
+                "details": {"month": month, "week": week}, "month": month, "week_number": week,
+                "linked_conversations": [r["id"] for r in rows], "linked_decisions": [], "ai_generated": True
+            })
+
+    db.execute(insert(Decision), decisions)
+    db.execute(insert(TeamMetrics), team_metrics)
+    db.execute(insert(MemberMetrics), metrics)
+    db.execute(insert(HealthEvent), dictionary_encoder.encode_rows(db, HealthEvent, events))
+    db.commit()
+    db.close()
+
+def legacy_timeline(db, member_id: int):
+    """The original implementation: five ORM queries, then a parallel dict copy"""
+    conversations = db.query(Conversation).filter(Conversation.member_id == member_id).order_by(Conversation.date, Conversation.time).all()
+    decisions = db.query(Decision).filter(Decision.member_id == member_id).order_by(Decision.date).all()
+    health_events = db.query(HealthEvent).filter(HealthEvent.member_id == member_id).order_by(HealthEvent.date).all()
+    metrics = db.query(MemberMetrics).filter(MemberMetrics.member_id == member_id).order_by(MemberMetrics.week_start).all()
+    team_metrics = db.query(TeamMetrics).filter(TeamMetrics.member_id == member_id).order_by(TeamMetrics.date).all()
+    return {
+        "conversations": [{"id": c.id, "date": c.date, "time": c.time, "sender": c.sender, "role": c.role, "text": c.text,
+                           "tags": c.tags, "month": c.month, "week_number": c.week_number,
+                           "travel_context": c.travel_context, "decision_impact": c.decision_impact or []} for c in conversations],
+        "decisions": [{"id": d.id, "date": d.date, "title": d.title, "reason": d.reason, "decision_type": d.decision_type,
+                       "month": d.month, "week_number": d.week_number, "triggered_by_conversation": d.triggered_by_conversation,
+                       "supporting_conversations": d.supporting_conversations, "effects": d.effects,
+                       "confidence_score": d.confidence_score} for d in decisions],
+        "health_events": [{"id": e.id, "date": e.date, "event_type": e.event_type, "title": e.title, "details": e.details,
+                           "month": e.month, "week_number": e.week_number, "linked_conversations": e.linked_conversations,
+                           "linked_decisions": e.linked_decisions} for e in health_events],
+        "metrics": [{"week_start": m.week_start, "week_end": m.week_end, "month": m.month, "week_number": m.week_number,
+                     "adherence_estimate": m.adherence_estimate, "hours_committed": m.hours_committed,
+                     "key_events": m.key_events, "notes": m.notes, "ai_insights": m.ai_insights} for m in metrics],
+        "team_metrics": [{"date": tm.date, "month": tm.month, "week_number": tm.week_number, "doctor_hours": tm.doctor_hours,
+                          "coach_hours": tm.coach_hours, "nutritionist_hours": tm.nutritionist_hours,
+                          "physio_hours": tm.physio_hours, "concierge_hours": tm.concierge_hours,
+                          "total_interventions": tm.total_interventions,
+                          "linked_conversations": tm.linked_conversations} for tm in team_metrics]
+    }
+
+def measure(label: str, fn, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+    print(f"{label:<32} median {statistics.median(timings):8.1f} ms   p95 {p95:8.1f} ms   min {timings[0]:8.1f} ms")
+    return statistics.median(timings)
+
+def measure_stream(label: str, produce):
+    """Time to first chunk, total time and peak traced memory for one response body"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in produce():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<32} first byte {first * 1000:8.1f} ms   total {total * 1000:8.1f} ms   "
+          f"peak {peak / 1024 / 1024:6.1f} MiB   body {size / 1024:.0f} KiB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark journey timeline assembly")
+    parser.add_argument("--messages", type=int, default=12000, help="Conversations for the benchmark member")
+    parser.add_argument("--runs", type=int, default=15, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+
+        print(f"📦 Populating {args.messages} messages...")
+        populate(session_factory, args.messages)
+        selected = select_timeline_fields(None)
+
+        def run_legacy():
+            db = session_factory()
+            try:
+                legacy_timeline(db, 1)
+            finally:
+                db.close()
+
+        def run_assembler(fields=selected):
+            db = session_factory()
+            try:
+                timeline_assembler.assemble(db, 1, fields)
+            finally:
+                db.close()
+
+        run_legacy()
+        run_assembler()
+        print(f"⏱️  Timeline latency, {args.messages} messages, {args.runs} runs")
+        legacy = measure("ORM hydration (5 queries)", run_legacy, args.runs)
+        single = measure("assembler (1 round trip)", run_assembler, args.runs)
+        sparse = measure("assembler, team_metrics hours", lambda: run_assembler(
+            select_timeline_fields({"team_metrics.date", "team_metrics.doctor_hours", "team_metrics.coach_hours"})
+        ), args.runs)
+        print(f"🚀 Speedup: {legacy / single:.2f}x full timeline, {legacy / sparse:.1f}x sparse dashboard fields")
+
+        db = session_factory()
+        content = {"success": True, "timeline": timeline_assembler.assemble(db, 1, selected)[0]}
+        db.close()
+        print(f"⏱️  Serialising the full timeline ({len(dumps(content)) / 1024:.0f} KiB)")
+        default = measure("jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(content)).encode(), args.runs)
+        fast = measure("fast path (serialization.dumps)", lambda: dumps(content), args.runs)
+        print(f"🚀 Serialisation speedup: {default / fast:.1f}x")
+        del content
+
+        def buffered():
+            db = session_factory()
+            try:
+                yield dumps({"success": True, "timeline": timeline_assembler.assemble(db, 1, selected)[0],
+                             "next_page_token": None})
+            finally:
+                db.close()
+
+        print("⏱️  Buffered vs streamed response body")
+        measure_stream("buffered (assemble + dumps)", buffered)
+        measure_stream("stream=json", lambda: timeline_assembler.stream(session_factory, 1, selected))
+        measure_stream("stream=ndjson", lambda: timeline_assembler.stream(session_factory, 1, selected, fmt="ndjson"))
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
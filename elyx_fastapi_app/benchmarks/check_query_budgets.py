@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Per-endpoint SQL query budgets.
+
+Populates a throwaway SQLite database with synthetic journeys, then calls
+each read endpoint in-process and counts the SQL statements it runs with
+`assert_max_queries`. Every endpoint is called once to warm the roster,
+taxonomy and dictionary caches before the counted call, and the response
+cache is off, so the counts are the steady-state cost of a cache miss.
+Exits with status 1 when any endpoint goes over its budget, listing the
+statements it ran, repeated ones first. Lower a budget when a change
+removes queries, so the improvement is kept.
+
+Usage (from elyx_fastapi_app/):
+    python benchmarks/check_query_budgets.py
+    python benchmarks/check_query_budgets.py --members 5 --verbose
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Maximum SQL statements per request; {member_id} and {decision_id} are filled from the database
+QUERY_BUDGETS = {
+    "/journey/journey/timeline/{member_id}": 1,
+    "/journey/journey/conversations/{member_id}": 1,
+    "/journey/journey/decisions/{member_id}": 1,
+    "/journey/journey/metrics/{member_id}": 1,
+    "/journey/journey/team-metrics/{member_id}": 1,
+    "/journey/journey/rollups/{member_id}": 1,
+    "/journey/journey/cohort-rollups": 2,
+    "/journey/journey/decision-context/{decision_id}": 3,
+    "/journey/journey/provenance/{decision_id}": 2,
+    "/conversations/{member_id}": 1,
+    # Served from the analytics frames, which the warm-up call loads (3 queries);
+    # the one query checks the global data version the frames were loaded at
+    "/analytics/cohorts/team-hours": 1,
+    "/analytics/cohorts/adherence": 1,
+    "/analytics/cohorts/adherence-trend": 1,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Check SQL query counts per endpoint against their budgets")
+    parser.add_argument("--members", type=int, default=3, help="Synthetic members to populate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="Print every endpoint's statements")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads its settings on import
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'budgets.db'}"
+        os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["QUERY_TRACING"] = "off"
+
+        from fastapi.testclient import TestClient
+        from sqlalchemy import select
+
+        from app.database import SessionLocal, engine
+        from app.main import app
+        from app.models.database import Decision, Member
+        from app.services.query_tracer import QueryBudgetExceeded, assert_max_queries
+        from app.services.synthetic_data import SyntheticDataGenerator
+
+        db = SessionLocal()
+        try:
+            print(f"📦 Populating {args.members} synthetic members...")
+            SyntheticDataGenerator(seed=args.seed).load(db, args.members, first_id=1)
+            ids = {
+                "member_id": db.execute(select(Member.id).order_by(Member.id)).scalars().first(),
+                "decision_id": db.execute(select(Decision.id).order_by(Decision.id)).scalars().first(),
+            }
+        finally:
+            db.close()
+
+        failures = []
+        with TestClient(app) as client:
+            for template, budget in QUERY_BUDGETS.items():
+                path = template.format(**ids)
+                response = client.get(path)
+                if response.status_code != 200:
+                    failures.append(template)
+                    print(f"❌ {template}: status {response.status_code}")
+                    continue
+                try:
+                    with assert_max_queries(budget, f"GET {template}") as trace:
+                        client.get(path)
+                except QueryBudgetExceeded as e:
+                    failures.append(template)
+                    print(f"❌ {e}")
+                    continue
+                print(f"✅ {template}: {len(trace)} of {budget} queries")
+                if args.verbose:
+                    print(trace.report())
+        engine.dispose()
+
+    if failures:
+        print(f"\n❌ {len(failures)} endpoint(s) over their query budget")
+        sys.exit(1)
+    print("\n✅ Every endpoint is within its query budget")
+
+if __name__ == "__main__":
+    main()
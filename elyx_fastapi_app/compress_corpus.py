@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Train a zstd dictionary on the corpus and recompress the long text columns.
+
+Conversation text, decision reasons and reasoning and weekly metric
+insights are stored compressed on SQLite once a dictionary exists and the
+app runs with TEXT_COMPRESSION=zstd. This trains that dictionary and
+rewrites the rows already stored, plain or compressed with an older
+dictionary; `--decompress` turns everything back into plain text (needed
+before downgrading past the 0008 migration). Batches commit independently,
+so an interrupted run can be restarted.
+
+Usage:
+    python compress_corpus.py --train
+    python compress_corpus.py --train --recompress
+    python compress_corpus.py --recompress --dry-run
+    python compress_corpus.py --decompress
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal, engine
+from app.models.compression import text_codec
+from app.services.deduplication import deduplication_service
+from app.services.text_compression import text_compression_service
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress the journey text columns with a trained dictionary")
+    parser.add_argument("--train", action="store_true", help="Train a new dictionary and make it the active one")
+    parser.add_argument("--recompress", action="store_true", help="Rewrite stored rows with the active dictionary")
+    parser.add_argument("--decompress", action="store_true", help="Rewrite stored rows as plain text")
+    parser.add_argument("--samples", type=int, default=text_compression_service.SAMPLES,
+                        help="Values to train the dictionary on")
+    parser.add_argument("--dict-size", type=int, default=text_compression_service.DICTIONARY_BYTES,
+                        help="Dictionary size in bytes")
+    parser.add_argument("--batch-size", type=int, default=text_compression_service.BATCH_SIZE,
+                        help="Rows per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Report the sizes without rewriting anything")
+    parser.add_argument("--no-compact", action="store_true", help="Skip VACUUM/ANALYZE after rewriting")
+    args = parser.parse_args()
+    if not (args.train or args.recompress or args.decompress):
+        parser.error("nothing to do: pass --train, --recompress or --decompress")
+    if args.decompress and (args.train or args.recompress):
+        parser.error("--decompress cannot be combined with --train or --recompress")
+
+    db = SessionLocal()
+    try:
+        if args.train:
+            info = text_compression_service.train(db, args.samples, args.dict_size)
+            print(f"📚 Trained dictionary {info['dict_id']} ({info['dictionary_bytes'] / 1024:.0f} KiB) on "
+                  f"{info['samples']:,} values ({info['sample_bytes'] / 1024:,.0f} KiB), "
+                  f"{info['sample_ratio']}x on a sample, in {info['seconds']}s")
+        stats = None
+        if args.recompress or args.decompress:
+            stats = text_compression_service.recompress(db, args.decompress, args.batch_size, args.dry_run)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Compression failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    if stats is not None:
+        verb = "Would rewrite" if args.dry_run else "Rewrote"
+        ratio = stats["bytes_before"] / stats["bytes_after"] if stats["bytes_after"] else 1
+        print(f"✅ {verb} {stats['rewritten']:,} of {stats['rows']:,} values: "
+              f"{stats['bytes_before'] / 1024 / 1024:,.1f} → {stats['bytes_after'] / 1024 / 1024:,.1f} MiB "
+              f"({ratio:.2f}x) in {stats['seconds']}s")
+        if not args.dry_run and not args.no_compact and stats["rewritten"]:
+            print(f"🗜️  Compacted: {deduplication_service.compact(engine)}")
+    if not args.decompress and not text_codec.enabled:
+        print("ℹ️  TEXT_COMPRESSION is not set to zstd, so rows written from now on are stored as plain text")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Remove duplicate journey rows left by repeated generations, then compact.
+
+Journeys generated before content-hash keys got fresh ids on every run, so
+members generated more than once hold several decisions, health events and
+metric rows per period. This keeps the newest copy of each, rewrites links
+to it, deletes the rest in bulk and rebuilds the affected rollups. Run it
+before `alembic upgrade head` if the 0006 migration reports duplicated
+metric periods. Batches commit independently, so an interrupted run can be
+restarted.
+
+Usage:
+    python dedupe_corpus.py --dry-run
+    python dedupe_corpus.py
+    python dedupe_corpus.py --member-id 1 --member-id 2 --no-compact
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal, engine
+from app.services.deduplication import deduplication_service
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate and compact the journey tables")
+    parser.add_argument("--member-id", type=int, action="append", help="Only deduplicate this member (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Count duplicates without changing anything")
+    parser.add_argument("--batch-members", type=int, default=deduplication_service.BATCH_MEMBERS,
+                        help="Members per transaction")
+    parser.add_argument("--no-compact", action="store_true", help="Skip VACUUM/ANALYZE after deleting")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = deduplication_service.run(db, args.member_id, args.dry_run, args.batch_members)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Deduplication failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"✅ {verb} {stats['conversations']:,} conversations, {stats['decisions']:,} decisions, "
+          f"{stats['health_events']:,} health events, {stats['member_metrics']:,} member metrics and "
+          f"{stats['team_metrics']:,} team metrics across {stats['members_changed']:,} members "
+          f"({stats['links_rewritten']:,} rows relinked) in {stats['seconds']}s")
+
+    if not args.dry_run and not args.no_compact and stats["members_changed"]:
+        print(f"🗜️  Compacted: {deduplication_service.compact(engine)}")
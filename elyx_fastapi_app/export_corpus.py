@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Corpus export job for the analytics team.
+
+Streams conversations, decisions, health events, member metrics and team
+metrics for every member into partitioned Parquet (or Arrow IPC) files. By
+default each run only exports rows created or updated since the previous
+run, plus tombstones (`deleted_rows`) of the rows deleted since then.
+
+Usage:
+    python export_corpus.py --out exports/
+    python export_corpus.py --out exports/ --tables conversations --columns conversations=id,member_id,occurred_at,role,tags
+    python export_corpus.py --out exports/ --format arrow --compression lz4 --full
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.export_service import EXPORT_TABLES, CorpusExporter
+
+def parse_columns(values):
+    """Turn repeated `table=col1,col2` arguments into a column selection per table"""
+    columns = {}
+    for value in values or []:
+        table, _, names = value.partition("=")
+        columns[table.strip()] = [name.strip() for name in names.split(",") if name.strip()]
+    return columns
+
+def parse_since(value):
+    if value is None:
+        return None
+    since = datetime.fromisoformat(value)
+    return since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the journey corpus to Parquet or Arrow IPC")
+    parser.add_argument("--out", default="exports", help="Output directory (holds the watermark state too)")
+    parser.add_argument("--tables", help=f"Comma separated subset of: {', '.join(EXPORT_TABLES)}")
+    parser.add_argument("--columns", action="append", help="Column pruning, e.g. conversations=id,member_id,text")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--compression", default="zstd", help="zstd, snappy, gzip, lz4 or none")
+    parser.add_argument("--since", help="Export rows written after this ISO timestamp instead of the stored watermark")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and export every row")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows fetched and written per batch")
+    parser.add_argument("--lag", type=int, default=30, help="Seconds to stay behind now for in-flight writes")
+    args = parser.parse_args()
+
+    exporter = CorpusExporter(batch_size=args.batch_size, safety_lag=timedelta(seconds=args.lag))
+    db = SessionLocal()
+    try:
+        result = exporter.export(
+            db, args.out,
+            tables=args.tables.split(",") if args.tables else None,
+            columns=parse_columns(args.columns),
+            fmt=args.format,
+            compression=None if args.compression == "none" else args.compression,
+            since=parse_since(args.since),
+            full=args.full
+        )
+        total = sum(table["rows"] for table in result["tables"].values())
+        print(f"🎯 Exported {total} rows up to {result['watermark']}")
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Generate journeys for many members at once on a worker pool.
+
+LLM calls from all workers share one token bucket, so set
+GROQ_REQUESTS_PER_MINUTE / GROQ_REQUEST_BURST to your API quota.
+
+Usage:
+    python generate_batch.py --only-missing --workers 4
+    python generate_batch.py --member-id 1 --member-id 2
+    python generate_batch.py --residence Singapore --limit 20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.batch_generation import batch_generation_service
+from app.services.local_ai_service import local_ai_service
+
+def print_progress(job, member_id):
+    progress = job.summary(include_members=False)
+    member = job.members[member_id]
+    if member["status"] == "succeeded":
+        detail = f"✅ {member['conversations_stored']} conversations in {member['seconds']}s"
+    else:
+        detail = f"❌ {member['error']}"
+    print(f"[{progress['completed']}/{progress['total']}] member {member_id}: {detail}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate journeys for a batch of members")
+    parser.add_argument("--member-id", type=int, action="append", help="Generate these members (repeatable)")
+    parser.add_argument("--residence", help="Only members living here")
+    parser.add_argument("--only-missing", action="store_true", help="Skip members that already have conversations")
+    parser.add_argument("--limit", type=int, help="Maximum number of members")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent generation workers")
+    args = parser.parse_args()
+
+    if not local_ai_service.groq_api_key:
+        print("❌ GROQ_API_KEY is not configured")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        member_ids = batch_generation_service.select_members(
+            db, args.member_id, args.residence, args.only_missing, args.limit
+        )
+    finally:
+        db.close()
+
+    if not member_ids:
+        print("❌ No members match the batch selection")
+        sys.exit(1)
+
+    print(f"🚀 Generating {len(member_ids)} journeys with {args.workers} workers")
+    job = batch_generation_service.create_job(member_ids, args.workers)
+    batch_generation_service.run(job, on_progress=print_progress)
+
+    summary = job.summary(include_members=False)
+    limiter = summary["llm_rate_limit"]
+    print(f"📊 {summary['succeeded']} succeeded, {summary['failed']} failed in {summary['elapsed_seconds']}s")
+    print(f"⏱️  {summary['members_per_minute']} members/min, {summary['conversations_per_second']} conversations/s")
+    print(f"🪣 {limiter['acquired']} LLM requests, {limiter['waited_seconds']}s spent waiting on the rate limit")
+    if summary["failed"]:
+        sys.exit(1)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Bulk load deterministic synthetic journeys for scale and load testing.
+
+No LLM calls are made: personas, team messages, decisions, health events and
+metrics are drawn from a seeded RNG, so the same seed always produces the
+same rows. New members are appended after the highest existing member id.
+
+Usage:
+    python generate_synthetic.py --members 1000
+    python generate_synthetic.py --members 5000 --months 12 --seed 7 --messages-per-week 30
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal, create_tables
+from app.services.synthetic_data import SyntheticDataGenerator
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic member journeys")
+    parser.add_argument("--members", type=int, required=True, help="Members to generate")
+    parser.add_argument("--months", type=int, default=8, help="Journey months per member")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; equal seeds give equal data")
+    parser.add_argument("--messages-per-week", type=int, default=20, help="Average conversations per member per week")
+    parser.add_argument("--first-id", type=int, help="First member id (default: after the highest existing id)")
+    parser.add_argument("--batch-members", type=int, default=200, help="Members inserted per transaction")
+    args = parser.parse_args()
+
+    create_tables()
+    generator = SyntheticDataGenerator(seed=args.seed, messages_per_week=args.messages_per_week)
+    db = SessionLocal()
+    try:
+        counts = generator.load(db, args.members, args.months, args.first_id, args.batch_members)
+        rows = sum(v for k, v in counts.items() if k not in ("first_id", "seconds"))
+        print(f"✅ Inserted {rows:,} rows for members {counts['first_id']}-{counts['first_id'] + counts['members'] - 1} "
+              f"in {counts['seconds']}s ({rows / max(counts['seconds'], 0.001):,.0f} rows/s)")
+        for name, value in counts.items():
+            if name not in ("first_id", "seconds"):
+                print(f"   {name}: {value:,}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Synthetic data generation failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
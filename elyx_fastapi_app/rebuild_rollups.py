@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Rebuild the member and cohort monthly rollup tables from the journey tables.
+
+Run once after `alembic upgrade head` to backfill existing data, and after
+any Core bulk write that bypassed the ORM session events.
+
+Usage:
+    python rebuild_rollups.py
+    python rebuild_rollups.py --member-id 1 --member-id 2
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.rollup_service import rollup_service
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild monthly rollups")
+    parser.add_argument("--member-id", type=int, action="append", help="Only rebuild these members (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rollup_service.rebuild(db, args.member_id)
+        db.commit()
+        print("✅ Rollups rebuilt")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rollup rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
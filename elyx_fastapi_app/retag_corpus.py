@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Recompute stored conversation tags with the current taxonomy.
+
+Run after adding or editing categories (PUT /journey/taxonomy/{kind}/{name})
+so existing conversations, and optionally decision types, match what new
+journeys get. Rows are walked in primary key order and each batch is
+committed, so an interrupted run can simply be restarted.
+
+Usage:
+    python retag_corpus.py
+    python retag_corpus.py --member-id 1 --member-id 2 --decisions
+    python retag_corpus.py --batch-size 20000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database import SessionLocal, create_tables
+from app.services.tagging import tagging_engine
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retag stored conversations with the current taxonomy")
+    parser.add_argument("--member-id", type=int, action="append", help="Only retag this member (repeatable)")
+    parser.add_argument("--decisions", action="store_true", help="Also reclassify stored decision types")
+    parser.add_argument("--batch-size", type=int, default=tagging_engine.RETAG_BATCH_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        stats = tagging_engine.retag(db, args.member_id, args.decisions, args.batch_size)
+        print(f"✅ Retagged {stats['conversations']:,} conversations ({stats['conversations_updated']:,} changed) "
+              f"in {stats['seconds']}s ({stats['conversations'] / max(stats['seconds'], 0.001):,.0f} rows/s)")
+        if args.decisions:
+            print(f"   decisions: {stats['decisions']:,} ({stats['decisions_updated']:,} changed)")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Retagging failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
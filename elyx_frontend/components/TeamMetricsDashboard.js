@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
-import { fetchTeamMetrics } from '../lib/api';
+import { fetchMemberRollups } from '../lib/api';
 
 const TeamMetricsDashboard = ({ memberId }) => {
   const [metricsData, setMetricsData] = useState(null);
@@ -15,8 +15,9 @@ const TeamMetricsDashboard = ({ memberId }) => {
     try {
       setLoading(true);
       setError(null);
-      const response = await fetchTeamMetrics(memberId);
-      setMetricsData(response.data.team_metrics || []);
+      // One pre-aggregated row per month, so nothing is summed over weekly rows here
+      const response = await fetchMemberRollups(memberId);
+      setMetricsData(response.data.rollups || []);
     } catch (err) {
       console.error('Failed to load team metrics:', err);
       setError(err.message || 'Failed to load team metrics');
@@ -34,9 +35,7 @@ const TeamMetricsDashboard = ({ memberId }) => {
   };
 
   const getTotalHours = (metrics) => {
-    return metrics.reduce((total, m) => {
-      return total + m.doctor_hours + m.coach_hours + m.nutritionist_hours + m.physio_hours + m.concierge_hours;
-    }, 0);
+    return metrics.reduce((total, m) => total + m.total_hours, 0);
   };
 
   const getRoleBreakdown = (metrics) => {
@@ -83,7 +82,8 @@ const TeamMetricsDashboard = ({ memberId }) => {
       nutritionist: m.nutritionist_hours,
       physio: m.physio_hours,
       concierge: m.concierge_hours,
-      total: m.doctor_hours + m.coach_hours + m.nutritionist_hours + m.physio_hours + m.concierge_hours
+      total: m.total_hours,
+      interventions: m.total_interventions
     }));
   };
 
@@ -258,7 +258,7 @@ const TeamMetricsDashboard = ({ memberId }) => {
                     {month.total.toFixed(1)}h
                   </td>
                   <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                    {metricsData.find(m => m.month === month.monthNum)?.total_interventions || 0}
+                    {month.interventions}
                   </td>
                 </tr>
               ))}
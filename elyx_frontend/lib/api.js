@@ -63,7 +63,9 @@ export async function fetchJourneyTimeline(memberId = 1) {
 export async function fetchTeamMetrics(memberId = 1) {
   try {
     console.log("Calling fetch team metrics API");
-    const response = await API.get(`/journey/journey/team-metrics/${memberId}`);
+    // The dashboard only charts hours per period, so skip the linked conversation lists
+    const fields = "date,month,week_number,doctor_hours,coach_hours,nutritionist_hours,physio_hours,concierge_hours,total_interventions";
+    const response = await API.get(`/journey/journey/team-metrics/${memberId}`, { params: { fields } });
     console.log("Fetch team metrics API response:", response.data);
     return response;
   } catch (error) {
@@ -72,6 +74,19 @@ export async function fetchTeamMetrics(memberId = 1) {
   }
 }
 
+// Fetch pre-aggregated monthly rollups (hours, message counts, adherence)
+export async function fetchMemberRollups(memberId = 1) {
+  try {
+    console.log("Calling fetch member rollups API");
+    const response = await API.get(`/journey/journey/rollups/${memberId}`);
+    console.log("Fetch member rollups API response:", response.data);
+    return response;
+  } catch (error) {
+    console.error("Fetch member rollups API error:", error);
+    throw error;
+  }
+}
+
 // Fetch conversations
 export async function fetchConversations(memberId = 1, month = null, week = null) {
   try {
@@ -1,7 +1,12 @@
 import { useEffect, useState } from "react";
 import Navbar from "@/components/Navbar";
 import MetricCard from "@/components/MetricCard";
-import { fetchTeamMetrics } from "@/lib/api";
+import { fetchMemberRollups } from "@/lib/api";
+
+const METRIC_KEYS = ["doctor_hours", "coach_hours", "nutritionist_hours", "physio_hours", "concierge_hours", "total_interventions"];
+
+// The charted measures of one monthly rollup row
+const monthMetrics = (row) => Object.fromEntries(METRIC_KEYS.map((key) => [key, row[key]]));
 
 export default function MetricsPage() {
   const [metrics, setMetrics] = useState(null);
@@ -16,8 +21,8 @@ export default function MetricsPage() {
     try {
       setLoading(true);
       setError("");
-      const res = await fetchTeamMetrics(1); // Default to member ID 1
-      setMetrics(res.data.team_metrics || []);
+      const res = await fetchMemberRollups(1); // Default to member ID 1
+      setMetrics(res.data.rollups || []);
     } catch (err) {
       console.error("Failed to load team metrics:", err);
       setError(`Failed to load team metrics: ${err.message || 'Unknown error'}`);
@@ -105,12 +110,10 @@ export default function MetricsPage() {
   // Aggregate metrics across all months
 // Aggregate metrics across all months safely
 const aggregatedMetrics = metrics.reduce((acc, monthData) => {
-  if (monthData.metrics) {   // ✅ guard against null
-    Object.entries(monthData.metrics).forEach(([key, value]) => {
-      if (!acc[key]) acc[key] = 0;
-      acc[key] += value;
-    });
-  }
+  Object.entries(monthMetrics(monthData)).forEach(([key, value]) => {
+    if (!acc[key]) acc[key] = 0;
+    acc[key] += value;
+  });
   return acc;
 }, {});
 
@@ -162,15 +165,12 @@ const entries = Object.entries(aggregatedMetrics);
   <div key={index} className="p-3 bg-gray-50 rounded">
     <h3 className="font-medium text-sm mb-2">Month {monthData.month}</h3>
     <div className="space-y-1 text-xs">
-      {monthData.metrics
-        ? Object.entries(monthData.metrics).map(([key, value]) => (
-            <div key={key} className="flex justify-between">
-              <span>{formatLabel(key)}:</span>
-              <span className="font-medium">{key.includes('hours') ? `${value}h` : value}</span>
-            </div>
-          ))
-        : <p className="text-gray-400 italic">No metrics for this month</p>
-      }
+      {Object.entries(monthMetrics(monthData)).map(([key, value]) => (
+        <div key={key} className="flex justify-between">
+          <span>{formatLabel(key)}:</span>
+          <span className="font-medium">{key.includes('hours') ? `${value}h` : value}</span>
+        </div>
+      ))}
     </div>
   </div>
 ))}